@@ -0,0 +1,43 @@
+"""
+Benchmark the FinancialAuditLog export formats (csv, csv.gz, ndjson, arrow): encoded size and rows/s.
+Seeds a throwaway test database with --orders audit logs (default 200k) and drains each encoder
+exactly as ExportView streams it.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.audit.management.commands.benchmark_reconcile import seed_completed_orders
+from apps.audit.services.export import ExportFormatUnavailable, EXPORT_FORMATS, get_export_format, iter_export_rows
+from apps.core.benchmark import benchmark_database, timed
+
+
+class Command(BaseCommand):
+    help = 'Benchmark size and throughput of each audit export format on a seeded dataset.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=200_000)
+        parser.add_argument('--keepdb', action='store_true')
+
+    def handle(self, *args, **options):
+        n_orders = options['orders']
+        with benchmark_database(keepdb=options['keepdb']):
+            results = {}
+            with timed(results, 'seed'):
+                seed_completed_orders(n_orders)
+            self.stdout.write(f'seeded {n_orders} audit logs in {results["seed"]:.1f}s')
+
+            baseline = None
+            for name in EXPORT_FORMATS:
+                try:
+                    encoder, _, _ = get_export_format(name)
+                except ExportFormatUnavailable as e:
+                    self.stdout.write(f'{name:>7}: skipped ({e})')
+                    continue
+                size = 0
+                with timed(results, name):
+                    for chunk in encoder(iter_export_rows()):
+                        size += len(chunk.encode() if isinstance(chunk, str) else chunk)
+                baseline = baseline or size
+                self.stdout.write(
+                    f'{name:>7}: {size / 1e6:8.2f} MB ({size / baseline:5.1%} of csv), '
+                    f'{results[name]:6.2f}s, {n_orders / results[name]:,.0f} rows/s'
+                )
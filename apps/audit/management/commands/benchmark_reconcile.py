@@ -0,0 +1,103 @@
+"""
+Benchmark set-based reconciliation (reconcile_orders) against the per-order reconcile_order loop.
+Seeds a throwaway test database with --orders consistent orders (default 100k) using bulk_create.
+The per-order loop is timed on --legacy-sample orders and extrapolated.
+"""
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from apps.audit.models import FinancialAuditLog
+from apps.audit.services.financial_audit import reconcile_order, reconcile_orders
+from apps.core.benchmark import benchmark_database, timed
+from apps.events.models import Event
+from apps.orders.models import Order, OrderStatus
+from apps.organizations.models import Organization
+from apps.stands.models import Stand
+from apps.users.models import User, UserRole
+from apps.wallet.models import Wallet, Transaction, TransactionType, get_platform_wallet_id
+
+BATCH_SIZE = 5000
+
+
+def seed_completed_orders(n_orders):
+    """Bulk-insert n_orders consistent COMPLETED orders with audit logs and wallet transactions."""
+    org = Organization.objects.create(name='Bench Org', commission_rate=Decimal('10.00'))
+    event = Event.objects.create(name='Bench Event', organization=org)
+    stands = [Stand.objects.create(name=f'Bench Stand {i}', event=event) for i in range(10)]
+    admin_wallets = {}
+    for stand in stands:
+        admin = User.objects.create_user(username=f'bench_admin_{stand.pk}', role=UserRole.STAND_ADMIN, stand=stand)
+        admin_wallets[stand.pk] = Wallet.objects.get(user=admin).pk
+    buyers = [User.objects.create_user(username=f'bench_buyer_{i}', role=UserRole.USER) for i in range(100)]
+    buyer_wallets = dict(Wallet.objects.filter(user__in=buyers).values_list('user_id', 'pk'))
+    platform_wallet_id = get_platform_wallet_id()
+
+    total = Decimal('10.00')
+    commission = Decimal('1.00')
+    net = total - commission
+    for start in range(0, n_orders, BATCH_SIZE):
+        size = min(BATCH_SIZE, n_orders - start)
+        orders = Order.objects.bulk_create([
+            Order(
+                user=buyers[(start + i) % len(buyers)],
+                stand=stands[(start + i) % len(stands)],
+                organization=org,
+                event=event,
+                status=OrderStatus.COMPLETED,
+                total_amount=total,
+            )
+            for i in range(size)
+        ], batch_size=BATCH_SIZE)
+        FinancialAuditLog.objects.bulk_create([
+            FinancialAuditLog(
+                order=o, total_amount=total, commission_amount=commission, net_amount=net,
+                organization=org, event=event, stand_id=o.stand_id, user_id=o.user_id,
+            )
+            for o in orders
+        ], batch_size=BATCH_SIZE)
+        txs = []
+        for o in orders:
+            txs.append(Transaction(wallet_id=buyer_wallets[o.user_id], amount=total,
+                                   transaction_type=TransactionType.DEBIT, order=o))
+            txs.append(Transaction(wallet_id=admin_wallets[o.stand_id], amount=net,
+                                   transaction_type=TransactionType.CREDIT, order=o))
+            txs.append(Transaction(wallet_id=platform_wallet_id, amount=commission,
+                                   transaction_type=TransactionType.CREDIT, order=o))
+        Transaction.objects.bulk_create(txs, batch_size=BATCH_SIZE)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark bulk reconciliation vs the per-order loop on a seeded dataset.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=100_000)
+        parser.add_argument('--legacy-sample', type=int, default=2000)
+        parser.add_argument('--keepdb', action='store_true')
+
+    def handle(self, *args, **options):
+        with benchmark_database(keepdb=options['keepdb']):
+            results = {}
+            with timed(results, 'seed'):
+                seed_completed_orders(options['orders'])
+            self.stdout.write(f'seeded {options["orders"]} orders in {results["seed"]:.1f}s')
+
+            with timed(results, 'bulk'):
+                report = reconcile_orders()
+            self.stdout.write(
+                f'reconcile_orders: {report["total_orders_checked"]} orders, '
+                f'{report["inconsistencies_found"]} inconsistent, {results["bulk"]:.2f}s'
+            )
+
+            sample = list(
+                Order.objects.filter(status=OrderStatus.COMPLETED).order_by('id')
+                .values_list('id', flat=True)[:options['legacy_sample']]
+            )
+            with timed(results, 'legacy'):
+                for oid in sample:
+                    reconcile_order(oid)
+            per_order = results['legacy'] / max(1, len(sample))
+            self.stdout.write(
+                f'reconcile_order loop: {len(sample)} orders in {results["legacy"]:.2f}s '
+                f'(~{per_order * options["orders"]:.1f}s extrapolated to {options["orders"]})'
+            )
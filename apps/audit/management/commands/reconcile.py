@@ -0,0 +1,28 @@
+"""
+Run financial reconciliation and advance the persisted checkpoint.
+--incremental only checks orders created or touched since the last run plus still-open inconsistencies;
+suitable for cron. A full run (default) re-checks every COMPLETED order.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.audit.services.financial_audit import RECONCILE_CHUNK_SIZE, run_reconciliation
+
+
+class Command(BaseCommand):
+    help = 'Reconcile COMPLETED orders against wallet transactions (full or --incremental).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--incremental', action='store_true')
+        parser.add_argument('--chunk-size', type=int, default=RECONCILE_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        report = run_reconciliation(incremental=options['incremental'], chunk_size=options['chunk_size'])
+        checkpoint = report['checkpoint']
+        self.stdout.write(
+            f'{"incremental" if report["incremental"] else "full"} run: '
+            f'{report["total_orders_checked"]} orders checked, '
+            f'{report["inconsistencies_found"]} inconsistencies '
+            f'(checkpoint order #{checkpoint["last_order_id"]}, transaction #{checkpoint["last_transaction_id"]})'
+        )
+        for detail in report['details']:
+            self.stdout.write(f'  order {detail["order_id"]}: {"; ".join(detail["errors"])}')
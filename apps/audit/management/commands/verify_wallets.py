@@ -0,0 +1,27 @@
+"""
+Report wallets whose balance disagrees with SUM(CREDIT) - SUM(DEBIT) of their transactions.
+Scans wallet-id ranges in parallel (--workers threads, --chunk-size ids per range).
+"""
+from django.core.management.base import BaseCommand
+
+from apps.audit.services.wallet_drift import WALLET_DRIFT_CHUNK_SIZE, WALLET_DRIFT_WORKERS, verify_wallets
+
+
+class Command(BaseCommand):
+    help = 'Find wallets whose balance drifts from their ledger.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=WALLET_DRIFT_CHUNK_SIZE)
+        parser.add_argument('--workers', type=int, default=WALLET_DRIFT_WORKERS)
+
+    def handle(self, *args, **options):
+        report = verify_wallets(chunk_size=options['chunk_size'], workers=options['workers'])
+        self.stdout.write(
+            f'{report["wallets_checked"]} wallets in {report["ranges_scanned"]} ranges, '
+            f'{report["drift_count"]} drifting'
+        )
+        for wallet in report['drifting_wallets']:
+            self.stdout.write(
+                f'  wallet {wallet["wallet_id"]} (user {wallet["user_id"]}): balance {wallet["balance"]:.2f}, '
+                f'ledger {wallet["ledger_balance"]:.2f}, difference {wallet["difference"]:.2f}'
+            )
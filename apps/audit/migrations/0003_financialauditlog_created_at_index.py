@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0002_reconciliation_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='financialauditlog',
+            index=models.Index(fields=['created_at'], name='audit_fal_created_idx'),
+        ),
+    ]
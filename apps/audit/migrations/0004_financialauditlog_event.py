@@ -0,0 +1,20 @@
+# Add FinancialAuditLog.event (denormalized from the stand; filled by orders 0004)
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0001_initial'),
+        ('audit', '0003_financialauditlog_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='financialauditlog',
+            name='event',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='financial_audit_logs', to='events.event'),
+        ),
+    ]
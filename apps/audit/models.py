@@ -25,6 +25,13 @@ class FinancialAuditLog(models.Model):
         blank=True,
         related_name='financial_audit_logs',
     )
+    event = models.ForeignKey(
+        'events.Event',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='financial_audit_logs',
+    )
     stand = models.ForeignKey(
         'stands.Stand',
         on_delete=models.SET_NULL,
@@ -46,9 +53,35 @@ class FinancialAuditLog(models.Model):
         verbose_name = 'Financial Audit Log'
         verbose_name_plural = 'Financial Audit Logs'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='audit_fal_created_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if self.pk is not None:
             from django.core.exceptions import ValidationError
             raise ValidationError('FinancialAuditLog records are immutable; updates are not allowed.')
         super().save(*args, **kwargs)
+
+
+class ReconciliationCheckpoint(models.Model):
+    """
+    High-water mark for incremental reconciliation (single row, pk=1).
+    Orders up to last_order_id and transactions up to last_transaction_id have been verified;
+    open_inconsistencies keeps the ids of orders still failing so later runs re-check them.
+    """
+    last_order_id = models.BigIntegerField(default=0)
+    last_transaction_id = models.BigIntegerField(default=0)
+    open_inconsistencies = models.JSONField(default=list, blank=True)
+    last_run_orders_checked = models.PositiveIntegerField(default=0)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'audit_reconciliationcheckpoint'
+        verbose_name = 'Reconciliation Checkpoint'
+        verbose_name_plural = 'Reconciliation Checkpoints'
+
+    @classmethod
+    def load(cls):
+        checkpoint, _ = cls.objects.get_or_create(pk=1)
+        return checkpoint
@@ -1,7 +1,23 @@
 from .financial_audit import (
     reconcile_order,
+    reconcile_orders,
+    iter_reconcile_results,
+    run_reconciliation,
+    reconcile_page,
+    checkpoint_state,
     verify_global_balance,
     reverse_order,
 )
+from .wallet_drift import verify_wallets
 
-__all__ = ['reconcile_order', 'verify_global_balance', 'reverse_order']
+__all__ = [
+    'reconcile_order',
+    'reconcile_orders',
+    'iter_reconcile_results',
+    'run_reconciliation',
+    'reconcile_page',
+    'checkpoint_state',
+    'verify_global_balance',
+    'reverse_order',
+    'verify_wallets',
+]
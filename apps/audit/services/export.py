@@ -0,0 +1,186 @@
+"""
+FinancialAuditLog export encoders. Every format consumes the same row iterator (tuples from a
+server-side cursor) and yields bytes/str chunks for StreamingHttpResponse, so memory is flat.
+csv keeps Decimal amounts; the analytics formats (csv.gz, ndjson, arrow) carry amounts as integer cents.
+arrow needs the optional pyarrow package (requirements-optional.txt) and is only offered when it imports.
+"""
+import csv
+import json
+import zlib
+from io import BytesIO
+
+try:
+    import pyarrow
+except ImportError:  # optional dependency
+    pyarrow = None
+
+from apps.audit.models import FinancialAuditLog
+
+EXPORT_CHUNK_SIZE = 2000
+# Rows per gzip flush / Arrow record batch.
+EXPORT_BATCH_ROWS = 5000
+
+EXPORT_FIELDS = (
+    'order_id', 'user__username', 'organization__name', 'stand__name',
+    'total_amount', 'commission_amount', 'net_amount', 'created_at',
+)
+EXPORT_HEADER = [
+    'order_id', 'user', 'organization', 'stand',
+    'total_amount', 'commission_amount', 'net_amount', 'created_at',
+]
+EXPORT_CENTS_HEADER = [
+    'order_id', 'user', 'organization', 'stand',
+    'total_amount_cents', 'commission_amount_cents', 'net_amount_cents', 'created_at',
+]
+
+
+class ExportFormatUnavailable(Exception):
+    """The requested export format needs an optional dependency that is not installed."""
+
+
+def iter_export_rows(start=None, end=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Tuples in EXPORT_FIELDS order for logs with start <= created_at < end, via a server-side cursor."""
+    qs = FinancialAuditLog.objects.order_by('created_at', 'id')
+    if start:
+        qs = qs.filter(created_at__gte=start)
+    if end:
+        qs = qs.filter(created_at__lt=end)
+    return qs.values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+
+
+def _cents(amount):
+    return int(amount.scaleb(2))
+
+
+def _iter_cents_rows(rows):
+    """Rows with amounts as integer cents, empty strings for missing names and ISO timestamps."""
+    for order_id, username, organization, stand, total, commission, net, created_at in rows:
+        yield (
+            order_id,
+            username or '',
+            organization or '',
+            stand or '',
+            _cents(total),
+            _cents(commission),
+            _cents(net),
+            created_at.isoformat() if created_at else '',
+        )
+
+
+class _Echo:
+    """File-like object for csv.writer: writerow returns the line instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def export_csv(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    for order_id, username, organization, stand, total, commission, net, created_at in rows:
+        yield writer.writerow([
+            order_id,
+            username or '',
+            organization or '',
+            stand or '',
+            total,
+            commission,
+            net,
+            created_at.isoformat() if created_at else '',
+        ])
+
+
+def export_csv_gzip(rows):
+    """CSV (cents) compressed on the fly; one gzip member, flushed every EXPORT_BATCH_ROWS rows."""
+    writer = csv.writer(_Echo())
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    lines = [writer.writerow(EXPORT_CENTS_HEADER)]
+    for row in _iter_cents_rows(rows):
+        lines.append(writer.writerow(row))
+        if len(lines) >= EXPORT_BATCH_ROWS:
+            chunk = compressor.compress(''.join(lines).encode())
+            lines = []
+            if chunk:
+                yield chunk
+    yield compressor.compress(''.join(lines).encode()) + compressor.flush()
+
+
+def export_ndjson(rows):
+    for row in _iter_cents_rows(rows):
+        yield json.dumps(dict(zip(EXPORT_CENTS_HEADER, row))) + '\n'
+
+
+def _arrow_schema():
+    return pyarrow.schema([
+        ('order_id', pyarrow.int64()),
+        ('user', pyarrow.string()),
+        ('organization', pyarrow.string()),
+        ('stand', pyarrow.string()),
+        ('total_amount_cents', pyarrow.int64()),
+        ('commission_amount_cents', pyarrow.int64()),
+        ('net_amount_cents', pyarrow.int64()),
+        ('created_at', pyarrow.timestamp('us', tz='UTC')),
+    ])
+
+
+def export_arrow(rows):
+    """Arrow IPC stream, one record batch per EXPORT_BATCH_ROWS rows (readable by pyarrow/polars/DuckDB)."""
+    schema = _arrow_schema()
+    sink = BytesIO()
+    writer = pyarrow.ipc.new_stream(sink, schema)
+
+    def drain():
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    columns = [[] for _ in schema]
+
+    def write_batch():
+        writer.write_batch(pyarrow.record_batch(columns, schema=schema))
+        for column in columns:
+            column.clear()
+
+    for order_id, username, organization, stand, total, commission, net, created_at in rows:
+        values = (
+            order_id, username, organization, stand,
+            _cents(total), _cents(commission), _cents(net), created_at,
+        )
+        for column, value in zip(columns, values):
+            column.append(value)
+        if len(columns[0]) >= EXPORT_BATCH_ROWS:
+            write_batch()
+            yield drain()
+    if columns[0]:
+        write_batch()
+    writer.close()
+    yield drain()
+
+
+# format -> (encoder, content type, file extension)
+EXPORT_FORMATS = {
+    'csv': (export_csv, 'text/csv', 'csv'),
+    'csv.gz': (export_csv_gzip, 'application/gzip', 'csv.gz'),
+    'ndjson': (export_ndjson, 'application/x-ndjson', 'ndjson'),
+    'arrow': (export_arrow, 'application/vnd.apache.arrow.stream', 'arrows'),
+}
+
+
+def available_export_formats():
+    """Format names this install can encode: arrow is left out when pyarrow is not installed."""
+    return [
+        name for name, (encoder, _, _) in EXPORT_FORMATS.items()
+        if encoder is not export_arrow or pyarrow is not None
+    ]
+
+
+def get_export_format(name):
+    """(encoder, content_type, extension) for a format name; KeyError if unknown,
+    ExportFormatUnavailable if its optional dependency is missing."""
+    encoder, content_type, extension = EXPORT_FORMATS[name]
+    if name not in available_export_formats():
+        raise ExportFormatUnavailable(
+            'The arrow export format requires the optional pyarrow package (pip install -r requirements-optional.txt).'
+        )
+    return encoder, content_type, extension
@@ -1,15 +1,31 @@
 """
 Financial audit services: reconciliation, global balance verification, order reversal.
 Do not raise exceptions from reconcile_order / verify_global_balance; return result dicts.
+reconcile_orders / iter_reconcile_results are the set-based engine for reconciling many orders.
 """
+from datetime import timedelta
 from decimal import Decimal
+from itertools import chain
+
 from django.db import transaction as db_transaction
 from django.db.models import Sum
+from django.utils import timezone
 
+from apps.dashboard.services.sales_rollup import record_order_sales
 from apps.orders.models import Order, OrderStatus
-from apps.wallet.models import Wallet, Transaction, TransactionType, get_platform_wallet
-from apps.users.models import UserRole
-from apps.audit.models import FinancialAuditLog
+from apps.wallet.models import (
+    PLATFORM_USERNAME_PREFIX,
+    Wallet,
+    Transaction,
+    TransactionType,
+    get_commission_wallet,
+    get_ledger_totals,
+    get_platform_balance,
+    get_platform_wallet_ids,
+    lock_wallets,
+)
+from apps.users.models import User, UserRole
+from apps.audit.models import FinancialAuditLog, ReconciliationCheckpoint
 
 
 def reconcile_order(order_id):
@@ -56,9 +72,8 @@ def reconcile_order(order_id):
                 f'USER debit ({user_debit}) != order total_amount ({total_amount})'
             )
 
-        platform_wallet = get_platform_wallet()
         platform_credit = order_txs.filter(
-            wallet_id=platform_wallet.id,
+            wallet_id__in=get_platform_wallet_ids(),
             transaction_type=TransactionType.CREDIT,
         ).aggregate(s=Sum('amount'))['s'] or Decimal('0.00')
         if platform_credit != commission_amount:
@@ -89,35 +104,314 @@ def reconcile_order(order_id):
     return result
 
 
-def verify_global_balance():
+RECONCILE_CHUNK_SIZE = 5000
+# Orders one reconcile_page call may scan, so a page on a healthy ledger stays a bounded request.
+RECONCILE_PAGE_MAX_SCAN = 20000
+
+
+def _reconcile_chunk(orders, platform_wallet_ids, stand_admins):
+    """
+    Reconcile a chunk of orders (list of dicts from the orders+audit query) set-based:
+    one grouped query sums transactions per (order, wallet, type); results use reconcile_order's error strings.
+    stand_admins is a {stand_id: first STAND_ADMIN id} cache filled as new stands are seen.
+    """
+    new_stand_ids = {o['stand_id'] for o in orders} - stand_admins.keys()
+    if new_stand_ids:
+        for stand_id in new_stand_ids:
+            stand_admins[stand_id] = None
+        # Descending ids so the lowest id (reconcile_order's .first()) is assigned last.
+        for stand_id, admin_id in User.objects.filter(
+            role=UserRole.STAND_ADMIN,
+            stand_id__in=new_stand_ids,
+        ).order_by('-id').values_list('stand_id', 'id'):
+            stand_admins[stand_id] = admin_id
+
+    sums = {}
+    # Exact ids, not an id range: chunks skip non-COMPLETED orders and explicit order_ids can be far apart.
+    tx_rows = Transaction.objects.filter(
+        order_id__in=[o['id'] for o in orders],
+    ).values('order_id', 'wallet_id', 'wallet__user_id', 'transaction_type').annotate(s=Sum('amount'))
+    for row in tx_rows:
+        sums.setdefault(row['order_id'], []).append(row)
+
+    for o in orders:
+        result = {'order_id': o['id'], 'is_valid': True, 'errors': []}
+        if o['financial_audit_log__id'] is None:
+            result['is_valid'] = False
+            result['errors'].append('No FinancialAuditLog for this order')
+            yield result
+            continue
+
+        total_amount = o['total_amount'] or Decimal('0.00')
+        commission_amount = o['financial_audit_log__commission_amount'] or Decimal('0.00')
+        net_amount = o['financial_audit_log__net_amount'] or Decimal('0.00')
+
+        if total_amount != commission_amount + net_amount:
+            result['is_valid'] = False
+            result['errors'].append(
+                f'total_amount ({total_amount}) != commission + net ({commission_amount + net_amount})'
+            )
+
+        stand_admin_id = stand_admins.get(o['stand_id'])
+        user_debit = platform_credit = stand_credit = Decimal('0.00')
+        for row in sums.get(o['id'], ()):
+            if row['transaction_type'] == TransactionType.DEBIT:
+                if row['wallet__user_id'] == o['user_id']:
+                    user_debit += row['s']
+            else:
+                if row['wallet_id'] in platform_wallet_ids:
+                    platform_credit += row['s']
+                if stand_admin_id is not None and row['wallet__user_id'] == stand_admin_id:
+                    stand_credit += row['s']
+
+        if user_debit != total_amount:
+            result['is_valid'] = False
+            result['errors'].append(
+                f'USER debit ({user_debit}) != order total_amount ({total_amount})'
+            )
+        if platform_credit != commission_amount:
+            result['is_valid'] = False
+            result['errors'].append(
+                f'PLATFORM credit ({platform_credit}) != commission_amount ({commission_amount})'
+            )
+        if stand_admin_id is not None:
+            if stand_credit != net_amount:
+                result['is_valid'] = False
+                result['errors'].append(
+                    f'STAND credit ({stand_credit}) != net_amount ({net_amount})'
+                )
+        elif net_amount > 0:
+            result['is_valid'] = False
+            result['errors'].append('Stand has no STAND_ADMIN but net_amount > 0')
+        yield result
+
+
+def iter_reconcile_results(order_ids=None, chunk_size=RECONCILE_CHUNK_SIZE, after_id=None, up_to_id=None):
+    """
+    Set-based reconciliation. Yields one reconcile_order-compatible result dict per order, in id order.
+    Works in keyset chunks of chunk_size orders: per chunk, one query for orders joined to their
+    FinancialAuditLog and one GROUP BY query for transaction sums, so memory stays bounded.
+    order_ids: optional iterable restricting the run; ids that are missing or not COMPLETED yield
+    'Order not found or not COMPLETED'. Default: every COMPLETED order with after_id < id <= up_to_id.
+    """
+    platform_wallet_ids = set(get_platform_wallet_ids())
+    stand_admins = {}
+    wanted = sorted(set(order_ids)) if order_ids is not None else None
+    base_qs = Order.objects.filter(status=OrderStatus.COMPLETED).order_by('id').values(
+        'id', 'user_id', 'stand_id', 'total_amount',
+        'financial_audit_log__id',
+        'financial_audit_log__commission_amount',
+        'financial_audit_log__net_amount',
+    )
+
+    if up_to_id is not None:
+        base_qs = base_qs.filter(id__lte=up_to_id)
+    last_id = after_id
+    position = 0
+    while True:
+        if wanted is not None:
+            batch_ids = wanted[position:position + chunk_size]
+            if not batch_ids:
+                return
+            position += chunk_size
+            orders = list(base_qs.filter(id__in=batch_ids))
+            found = {o['id'] for o in orders}
+            for oid in batch_ids:
+                if oid not in found:
+                    yield {'order_id': oid, 'is_valid': False, 'errors': ['Order not found or not COMPLETED']}
+        else:
+            qs = base_qs if last_id is None else base_qs.filter(id__gt=last_id)
+            orders = list(qs[:chunk_size])
+            if not orders:
+                return
+            last_id = orders[-1]['id']
+        if orders:
+            yield from _reconcile_chunk(orders, platform_wallet_ids, stand_admins)
+
+
+def reconcile_orders(order_ids=None, chunk_size=RECONCILE_CHUNK_SIZE):
+    """
+    Bulk reconciliation of all COMPLETED orders (or order_ids). Returns only the inconsistent orders:
+    {'total_orders_checked': int, 'inconsistencies_found': int, 'details': [invalid result dicts]}.
+    Error strings match reconcile_order.
+    """
+    checked = 0
+    details = []
+    for result in iter_reconcile_results(order_ids=order_ids, chunk_size=chunk_size):
+        checked += 1
+        if not result['is_valid']:
+            details.append(result)
+    return {
+        'total_orders_checked': checked,
+        'inconsistencies_found': len(details),
+        'details': details,
+    }
+
+
+# Rows newer than this are left for the next run: ids are allocated before commit, so a
+# still-open checkout may hold a lower id than the newest visible row.
+CHECKPOINT_SAFETY_LAG = timedelta(seconds=60)
+
+
+def _high_water_id(model, cutoff):
+    return model.objects.filter(created_at__lt=cutoff).order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def checkpoint_state(checkpoint=None):
+    """Serializable view of the reconciliation checkpoint."""
+    checkpoint = checkpoint or ReconciliationCheckpoint.load()
+    return {
+        'last_order_id': checkpoint.last_order_id,
+        'last_transaction_id': checkpoint.last_transaction_id,
+        'open_inconsistencies': len(checkpoint.open_inconsistencies),
+        'last_run_orders_checked': checkpoint.last_run_orders_checked,
+        'last_run_at': checkpoint.last_run_at.isoformat() if checkpoint.last_run_at else None,
+    }
+
+
+def run_reconciliation(incremental=False, chunk_size=RECONCILE_CHUNK_SIZE, include_details=True):
+    """
+    Reconcile and advance the persisted checkpoint (ReconciliationCheckpoint).
+    Full run: every COMPLETED order up to the new high-water mark.
+    Incremental run: orders created since the last mark, older COMPLETED orders that gained
+    transactions since the last mark (e.g. reversals), and orders still inconsistent last time.
+    Returns reconcile_orders' dict plus 'incremental' and 'checkpoint'; include_details=False keeps
+    only the inconsistent order ids in memory and omits 'details'.
+    """
+    checkpoint = ReconciliationCheckpoint.load()
+    cutoff = timezone.now() - CHECKPOINT_SAFETY_LAG
+    max_order_id = max(checkpoint.last_order_id, _high_water_id(Order, cutoff))
+    max_transaction_id = max(checkpoint.last_transaction_id, _high_water_id(Transaction, cutoff))
+
+    if incremental:
+        touched = set(
+            Transaction.objects.filter(
+                id__gt=checkpoint.last_transaction_id,
+                id__lte=max_transaction_id,
+                order_id__lte=checkpoint.last_order_id,
+            ).values_list('order_id', flat=True).distinct()
+        )
+        recheck = Order.objects.filter(
+            status=OrderStatus.COMPLETED,
+            id__in=touched.union(checkpoint.open_inconsistencies),
+        ).values_list('id', flat=True)
+        results = chain(
+            iter_reconcile_results(order_ids=list(recheck), chunk_size=chunk_size),
+            iter_reconcile_results(
+                chunk_size=chunk_size, after_id=checkpoint.last_order_id, up_to_id=max_order_id,
+            ),
+        )
+    else:
+        results = iter_reconcile_results(chunk_size=chunk_size, up_to_id=max_order_id)
+
+    checked = 0
+    details = []
+    open_ids = []
+    for result in results:
+        checked += 1
+        if not result['is_valid']:
+            open_ids.append(result['order_id'])
+            if include_details:
+                details.append(result)
+
+    checkpoint.last_order_id = max_order_id
+    checkpoint.last_transaction_id = max_transaction_id
+    checkpoint.open_inconsistencies = open_ids
+    checkpoint.last_run_orders_checked = checked
+    checkpoint.last_run_at = timezone.now()
+    checkpoint.save()
+
+    report = {
+        'total_orders_checked': checked,
+        'inconsistencies_found': len(open_ids),
+        'incremental': incremental,
+        'checkpoint': checkpoint_state(checkpoint),
+    }
+    if include_details:
+        report['details'] = details
+    return report
+
+
+def reconcile_page(after_id=0, limit=100, max_scan=RECONCILE_PAGE_MAX_SCAN, chunk_size=RECONCILE_CHUNK_SIZE):
+    """
+    One page of inconsistent COMPLETED orders with id > after_id, in id order.
+    The page ends when it holds limit orders or after max_scan orders were scanned (it may then hold
+    fewer, even none); next_cursor is the last order id scanned, None once the scan reached the end.
+    Read-only: the checkpoint is not touched.
+    """
+    checked = 0
+    details = []
+    for result in iter_reconcile_results(chunk_size=min(chunk_size, max_scan), after_id=after_id):
+        checked += 1
+        if not result['is_valid']:
+            details.append(result)
+        if len(details) >= limit or checked >= max_scan:
+            return {'orders_checked': checked, 'details': details, 'next_cursor': result['order_id']}
+    return {'orders_checked': checked, 'details': details, 'next_cursor': None}
+
+
+def verify_global_balance(full=False):
     """
     Verify SUM(wallet.balance) == SUM(CREDIT) - SUM(DEBIT).
-    Returns a dict with wallet_total, ledger_total, difference; does not raise.
+    Default: O(1) read of the maintained LedgerTotals. full=True recounts wallet_wallet and
+    wallet_transaction and also reports the maintained totals and their drift from the recount.
+    Returns a dict with wallet_total, ledger_total, difference, platform_total (rollup of all
+    platform commission sub-wallets) and mode; does not raise.
     """
-    result = {'wallet_total': 0, 'ledger_total': 0, 'difference': 0}
+    result = {
+        'wallet_total': 0, 'ledger_total': 0, 'difference': 0, 'platform_total': 0,
+        'mode': 'full' if full else 'maintained',
+    }
     try:
-        wallet_total = Wallet.objects.aggregate(s=Sum('balance'))['s'] or Decimal('0.00')
-        credit_sum = Transaction.objects.filter(
-            transaction_type=TransactionType.CREDIT,
-        ).aggregate(s=Sum('amount'))['s'] or Decimal('0.00')
-        debit_sum = Transaction.objects.filter(
-            transaction_type=TransactionType.DEBIT,
-        ).aggregate(s=Sum('amount'))['s'] or Decimal('0.00')
-        ledger_total = credit_sum - debit_sum
+        maintained = get_ledger_totals()
+        maintained_ledger = maintained['credits'] - maintained['debits']
+        if full:
+            wallet_total = Wallet.objects.aggregate(s=Sum('balance'))['s'] or Decimal('0.00')
+            credit_sum = Transaction.objects.filter(
+                transaction_type=TransactionType.CREDIT,
+            ).aggregate(s=Sum('amount'))['s'] or Decimal('0.00')
+            debit_sum = Transaction.objects.filter(
+                transaction_type=TransactionType.DEBIT,
+            ).aggregate(s=Sum('amount'))['s'] or Decimal('0.00')
+            ledger_total = credit_sum - debit_sum
+            result['maintained'] = {
+                'wallet_total': float(maintained['balance']),
+                'ledger_total': float(maintained_ledger),
+            }
+            result['drift'] = {
+                'wallet_total': float(wallet_total - maintained['balance']),
+                'ledger_total': float(ledger_total - maintained_ledger),
+            }
+        else:
+            wallet_total = maintained['balance']
+            ledger_total = maintained_ledger
         difference = wallet_total - ledger_total
         result['wallet_total'] = float(wallet_total)
         result['ledger_total'] = float(ledger_total)
         result['difference'] = float(difference)
+        result['platform_total'] = float(get_platform_balance()['balance'])
     except Exception as e:
         result['error'] = str(e)
     return result
 
 
+def _commission_wallet_for(order):
+    """Platform (sub-)wallet that received the order's commission; falls back to the order's shard."""
+    wallet_id = Transaction.objects.filter(
+        order=order,
+        wallet__user__username__startswith=PLATFORM_USERNAME_PREFIX,
+        transaction_type=TransactionType.CREDIT,
+    ).values_list('wallet_id', flat=True).first()
+    if wallet_id is not None:
+        return Wallet.objects.get(pk=wallet_id)
+    return get_commission_wallet(order.id)
+
+
 def reverse_order(order):
     """
     Create compensating transactions when an order is reversed (COMPLETED -> CANCELLED).
     Call only when order.status has been set to CANCELLED; uses FinancialAuditLog for amounts.
-    Uses transaction.atomic; locks all involved wallets with select_for_update.
+    Uses transaction.atomic; locks all involved wallets in one pk-ordered query (lock_wallets).
     Prevents double reversal via order.is_reversed. Does not delete any existing transactions.
     """
     with db_transaction.atomic():
@@ -137,38 +431,44 @@ def reverse_order(order):
         commission_amount = audit.commission_amount or Decimal('0.00')
         net_amount = audit.net_amount or Decimal('0.00')
 
+        # Resolve every wallet the reversal touches, then lock them in pk order (same order as checkout)
         user_wallet, _ = Wallet.objects.get_or_create(
             user=order.user,
             defaults={'balance': Decimal('0.00')},
         )
-        user_wallet = Wallet.objects.select_for_update().get(pk=user_wallet.pk)
-        user_wallet.credit(
-            total_amount,
-            order=order,
-            description=f'Order #{order.id} (reversal refund)',
-        )
-
+        admin_wallet = None
         stand_admin = order.stand.users.filter(role=UserRole.STAND_ADMIN).first()
         if stand_admin and net_amount > 0:
             admin_wallet, _ = Wallet.objects.get_or_create(
                 user=stand_admin,
                 defaults={'balance': Decimal('0.00')},
             )
-            admin_wallet = Wallet.objects.select_for_update().get(pk=admin_wallet.pk)
-            if admin_wallet.balance < net_amount:
-                raise ValueError('Stand admin wallet has insufficient balance for reversal')
-            admin_wallet.debit(
+        platform_wallet = _commission_wallet_for(order) if commission_amount > 0 else None
+
+        locked = lock_wallets([
+            user_wallet.pk,
+            admin_wallet.pk if admin_wallet else None,
+            platform_wallet.pk if platform_wallet else None,
+        ])
+
+        if admin_wallet and locked[admin_wallet.pk].balance < net_amount:
+            raise ValueError('Stand admin wallet has insufficient balance for reversal')
+        if platform_wallet and locked[platform_wallet.pk].balance < commission_amount:
+            raise ValueError('Platform wallet has insufficient balance for reversal')
+
+        locked[user_wallet.pk].credit_locked(
+            total_amount,
+            order=order,
+            description=f'Order #{order.id} (reversal refund)',
+        )
+        if admin_wallet:
+            locked[admin_wallet.pk].debit_locked(
                 net_amount,
                 order=order,
                 description=f'Order #{order.id} (reversal)',
             )
-
-        if commission_amount > 0:
-            platform_wallet = get_platform_wallet()
-            platform_wallet = Wallet.objects.select_for_update().get(pk=platform_wallet.pk)
-            if platform_wallet.balance < commission_amount:
-                raise ValueError('Platform wallet has insufficient balance for reversal')
-            platform_wallet.debit(
+        if platform_wallet:
+            locked[platform_wallet.pk].debit_locked(
                 commission_amount,
                 order=order,
                 description=f'Order #{order.id} (reversal)',
@@ -176,3 +476,4 @@ def reverse_order(order):
 
         order.is_reversed = True
         order.save(update_fields=['is_reversed'])
+        record_order_sales(order, audit, sign=-1)
@@ -0,0 +1,88 @@
+"""
+Per-wallet drift detection: Wallet.balance vs SUM(CREDIT) - SUM(DEBIT) of its transactions.
+Wallet-id ranges are checked with one grouped query each (only drifting wallets come back, via HAVING)
+and can run in parallel on a thread pool, one DB connection per worker. Wallets flagged by the scan are
+re-checked with their rows locked, so in-flight debits/credits are not reported as drift.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.db import connection, transaction as db_transaction
+from django.db.models import Case, DecimalField, F, Max, Min, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from apps.wallet.models import Wallet, TransactionType, lock_wallets
+
+WALLET_DRIFT_CHUNK_SIZE = 10_000
+WALLET_DRIFT_WORKERS = 4
+
+
+def _drifting_wallets(queryset):
+    """Rows (id, user_id, balance, ledger) for wallets of queryset whose balance != ledger sum."""
+    signed_amount = Case(
+        When(transactions__transaction_type=TransactionType.CREDIT, then=F('transactions__amount')),
+        When(transactions__transaction_type=TransactionType.DEBIT, then=-F('transactions__amount')),
+        output_field=DecimalField(max_digits=20, decimal_places=2),
+    )
+    return list(
+        queryset.annotate(
+            ledger=Coalesce(Sum(signed_amount), Value(Decimal('0.00')), output_field=DecimalField()),
+        ).exclude(balance=F('ledger')).order_by('id').values_list('id', 'user_id', 'balance', 'ledger')
+    )
+
+
+def _scan_range(low, high, close_connection):
+    try:
+        return _drifting_wallets(Wallet.objects.filter(id__gte=low, id__lt=high))
+    finally:
+        if close_connection:
+            connection.close()
+
+
+def _confirm(wallet_ids):
+    """Re-check candidates with their rows locked (every balance change locks the wallet row first)."""
+    if not wallet_ids:
+        return []
+    with db_transaction.atomic():
+        lock_wallets(wallet_ids)
+        return _drifting_wallets(Wallet.objects.filter(id__in=wallet_ids))
+
+
+def verify_wallets(chunk_size=WALLET_DRIFT_CHUNK_SIZE, workers=WALLET_DRIFT_WORKERS):
+    """
+    Compare every Wallet.balance with its ledger sum; report only drifting wallets.
+    Scans wallet-id ranges of chunk_size ids, with up to `workers` threads (1 = inline, on the
+    caller's connection). Returns wallets_checked, ranges_scanned, drift_count and drifting_wallets
+    (wallet_id, user_id, balance, ledger_balance, difference).
+    """
+    bounds = Wallet.objects.aggregate(low=Min('id'), high=Max('id'))
+    ranges = []
+    if bounds['low'] is not None:
+        ranges = [
+            (low, min(low + chunk_size, bounds['high'] + 1))
+            for low in range(bounds['low'], bounds['high'] + 1, chunk_size)
+        ]
+
+    if workers <= 1 or len(ranges) <= 1:
+        scanned = [_scan_range(low, high, close_connection=False) for low, high in ranges]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            scanned = list(pool.map(lambda r: _scan_range(*r, close_connection=True), ranges))
+
+    candidates = [row[0] for rows in scanned for row in rows]
+    drifting = [
+        {
+            'wallet_id': wallet_id,
+            'user_id': user_id,
+            'balance': float(balance),
+            'ledger_balance': float(ledger),
+            'difference': float(balance - ledger),
+        }
+        for wallet_id, user_id, balance, ledger in _confirm(candidates)
+    ]
+    return {
+        'wallets_checked': Wallet.objects.count(),
+        'ranges_scanned': len(ranges),
+        'drift_count': len(drifting),
+        'drifting_wallets': drifting,
+    }
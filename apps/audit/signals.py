@@ -1,10 +1,11 @@
 """
-Create FinancialAuditLog when an Order becomes COMPLETED.
+Create FinancialAuditLog when an Order becomes COMPLETED, and add the order to the daily sales rollup.
 """
 from decimal import Decimal
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from apps.dashboard.services.sales_rollup import record_order_sales
 from apps.orders.models import Order, OrderStatus
 from apps.stands.models import Stand
 from .models import FinancialAuditLog
@@ -22,12 +23,14 @@ def create_financial_audit_log_on_completed(sender, instance, created, **kwargs)
     total = instance.total_amount or Decimal('0.00')
     commission = (total * commission_rate / Decimal('100')).quantize(Decimal('0.01'))
     net = (total - commission).quantize(Decimal('0.01'))
-    FinancialAuditLog.objects.create(
+    audit_log = FinancialAuditLog.objects.create(
         order=instance,
         total_amount=total,
         commission_amount=commission,
         net_amount=net,
         organization=organization,
+        event_id=stand.event_id if stand else None,
         stand=stand,
         user=instance.user,
     )
+    record_order_sales(instance, audit_log, stand=stand)
@@ -1,19 +1,50 @@
 """
 Basic tests for financial audit: reconciliation and global balance verification.
 """
+import csv
+import gzip
+import json
+import threading
+from datetime import datetime, timedelta
 from decimal import Decimal
+from unittest import mock
 
-from django.test import TestCase
+from django.db import connection, transaction as db_transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+from rest_framework.test import APIClient
 
 from apps.users.models import User, UserRole
 from apps.organizations.models import Organization
 from apps.events.models import Event
-from apps.stands.models import Stand
+from apps.stands.models import Stand, Product
 from apps.orders.models import Order, OrderStatus
-from apps.wallet.models import Wallet, Transaction, TransactionType, get_platform_wallet
-from apps.audit.models import FinancialAuditLog
-from apps.audit.services.financial_audit import reconcile_order, verify_global_balance
+from apps.wallet.models import (
+    LedgerTotals,
+    Wallet,
+    Transaction,
+    TransactionType,
+    PLATFORM_USERNAME,
+    clear_platform_wallet_cache,
+    get_ledger_totals,
+    get_platform_balance,
+    get_platform_wallet,
+    get_platform_wallet_id,
+    lock_wallets,
+)
+from apps.orders.services.checkout import create_order_with_payment
+from apps.audit.models import FinancialAuditLog, ReconciliationCheckpoint
+from apps.audit.services.financial_audit import (
+    reconcile_order,
+    reconcile_orders,
+    reconcile_page,
+    reverse_order,
+    run_reconciliation,
+    verify_global_balance,
+)
+from apps.audit.services.wallet_drift import verify_wallets
 
 
 class ReconcileOrderTests(TestCase):
@@ -120,3 +151,506 @@ class TransactionImmutabilityTests(TestCase):
         with self.assertRaises(ValidationError) as ctx:
             tx.delete()
         self.assertIn('immutable', str(ctx.exception).lower())
+
+
+class LockedWalletOperationTests(TestCase):
+    """Test debit_locked/credit_locked apply the change in two statements for an already-locked wallet."""
+
+    def setUp(self):
+        user = User.objects.create_user(username='lockuser', password='test', role=UserRole.USER)
+        self.wallet = Wallet.objects.get(user=user)
+        self.wallet.credit(Decimal('50.00'), description='Seed')
+
+    def test_debit_locked_uses_three_statements(self):
+        with db_transaction.atomic():
+            wallet = lock_wallets([self.wallet.pk])[self.wallet.pk]
+            with CaptureQueriesContext(connection) as ctx:
+                wallet.debit_locked(Decimal('20.00'), description='Locked debit')
+        # Balance UPDATE ... RETURNING, Transaction INSERT, LedgerTotals UPDATE.
+        self.assertEqual(len(ctx.captured_queries), 3)
+        self.assertEqual(wallet.balance, Decimal('30.00'))
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('30.00'))
+        self.assertEqual(verify_global_balance()['difference'], 0.0)
+
+    def test_debit_locked_insufficient_balance_raises(self):
+        with db_transaction.atomic():
+            wallet = lock_wallets([self.wallet.pk])[self.wallet.pk]
+            with self.assertRaises(ValidationError):
+                wallet.debit_locked(Decimal('60.00'))
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('50.00'))
+
+    def test_credit_locked_updates_balance(self):
+        with db_transaction.atomic():
+            wallet = lock_wallets([self.wallet.pk])[self.wallet.pk]
+            wallet.credit_locked(Decimal('5.00'))
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('55.00'))
+        self.assertEqual(self.wallet.transactions.filter(transaction_type=TransactionType.CREDIT).count(), 2)
+
+
+@override_settings(PLATFORM_COMMISSION_SHARDS=3)
+class ShardedCommissionTests(TestCase):
+    """Test commission sharding: orders spread across sub-wallets; rollup, reconcile and reversal see all shards."""
+
+    def setUp(self):
+        org = Organization.objects.create(name='ShardOrg', commission_rate=Decimal('10.00'))
+        event = Event.objects.create(name='ShardEv', organization=org)
+        self.stand = Stand.objects.create(name='ShardSt', event=event)
+        self.product = Product.objects.create(
+            stand=self.stand, name='ShardP', price=Decimal('10.00'), stock_quantity=100,
+        )
+        User.objects.create_user(username='shard_admin', password='test', role=UserRole.STAND_ADMIN, stand=self.stand)
+        self.buyer = User.objects.create_user(username='shard_buyer', password='test', role=UserRole.USER)
+        Wallet.objects.get(user=self.buyer).credit(Decimal('100.00'), description='Seed')
+        self.orders = [
+            create_order_with_payment(
+                user=self.buyer,
+                stand=self.stand,
+                items=[{'product': self.product.pk, 'quantity': 1}],
+            )
+            for _ in range(6)
+        ]
+
+    def test_commission_spread_across_shards_and_rolled_up(self):
+        for order in self.orders:
+            commission_tx = Transaction.objects.get(order=order, description__endswith='(commission)')
+            self.assertEqual(commission_tx.wallet_id, get_platform_wallet(order.id % 3).pk)
+        rollup = get_platform_balance()
+        self.assertEqual(len(rollup['shards']), 3)
+        self.assertEqual(rollup['balance'], Decimal('6.00'))
+        self.assertEqual(verify_global_balance()['platform_total'], 6.0)
+
+    def test_reconcile_and_reverse_use_order_shard(self):
+        for order in self.orders:
+            result = reconcile_order(order.id)
+            self.assertTrue(result['is_valid'], result['errors'])
+
+        order = self.orders[1]
+        shard_wallet = get_platform_wallet(order.id % 3)
+        before = shard_wallet.balance
+        Order.objects.filter(pk=order.pk).update(status=OrderStatus.CANCELLED)
+        reverse_order(order)
+        shard_wallet.refresh_from_db()
+        self.assertEqual(shard_wallet.balance, before - Decimal('1.00'))
+        self.assertEqual(verify_global_balance()['difference'], 0.0)
+
+
+class PlatformWalletCacheTests(TestCase):
+    """Test the platform wallet id is resolved once per process and re-resolved after the clear hook."""
+
+    def setUp(self):
+        clear_platform_wallet_cache()
+
+    def test_platform_wallet_id_memoized(self):
+        wallet_id = get_platform_wallet_id()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_platform_wallet_id(), wallet_id)
+        self.assertEqual(get_platform_wallet().pk, wallet_id)
+
+    def test_deleting_platform_user_clears_memo(self):
+        wallet_id = get_platform_wallet_id()
+        User.objects.filter(username=PLATFORM_USERNAME).delete()
+        self.assertFalse(Wallet.objects.filter(pk=wallet_id).exists())
+        new_id = get_platform_wallet_id()
+        self.assertNotEqual(new_id, wallet_id)
+        self.assertTrue(Wallet.objects.filter(pk=new_id).exists())
+
+
+class BulkReconcileTests(TestCase):
+    """Test reconcile_orders reports the same inconsistencies and error strings as reconcile_order."""
+
+    def setUp(self):
+        org = Organization.objects.create(name='BulkOrg', commission_rate=Decimal('10.00'))
+        event = Event.objects.create(name='BulkEv', organization=org)
+        self.stand = Stand.objects.create(name='BulkSt', event=event)
+        product = Product.objects.create(stand=self.stand, name='BulkP', price=Decimal('10.00'), stock_quantity=100)
+        User.objects.create_user(username='bulk_admin', password='test', role=UserRole.STAND_ADMIN, stand=self.stand)
+        self.buyer = User.objects.create_user(username='bulk_buyer', password='test', role=UserRole.USER)
+        Wallet.objects.get(user=self.buyer).credit(Decimal('100.00'), description='Seed')
+        self.valid_orders = [
+            create_order_with_payment(user=self.buyer, stand=self.stand, items=[{'product': product.pk, 'quantity': 1}])
+            for _ in range(3)
+        ]
+        # Completed without any wallet movement, and completed with its audit log removed.
+        self.unpaid = Order.objects.create(
+            user=self.buyer, stand=self.stand, status=OrderStatus.COMPLETED, total_amount=Decimal('20.00'),
+        )
+        self.no_audit = Order.objects.create(
+            user=self.buyer, stand=self.stand, status=OrderStatus.COMPLETED, total_amount=Decimal('5.00'),
+        )
+        FinancialAuditLog.objects.filter(order=self.no_audit).delete()
+
+    def test_bulk_matches_per_order_reconcile(self):
+        order_ids = Order.objects.filter(status=OrderStatus.COMPLETED).values_list('id', flat=True)
+        expected = [r for r in (reconcile_order(oid) for oid in sorted(order_ids)) if not r['is_valid']]
+
+        result = reconcile_orders(chunk_size=2)
+        self.assertEqual(result['total_orders_checked'], 5)
+        self.assertEqual(result['inconsistencies_found'], 2)
+        self.assertEqual(result['details'], expected)
+        self.assertEqual([d['order_id'] for d in result['details']], [self.unpaid.id, self.no_audit.id])
+
+    def test_sparse_explicit_ids_only_sum_their_own_transactions(self):
+        first, last = self.valid_orders[0].id, self.valid_orders[-1].id
+        with CaptureQueriesContext(connection) as ctx:
+            result = reconcile_orders(order_ids=[first, last])
+        self.assertEqual(result['inconsistencies_found'], 0)
+        sums_sql = [q['sql'] for q in ctx.captured_queries if 'FROM "wallet_transaction"' in q['sql']]
+        self.assertEqual(len(sums_sql), 1)
+        self.assertIn(f'"wallet_transaction"."order_id" IN ({first}, {last})', sums_sql[0])
+
+    def test_bulk_explicit_ids_reports_missing_orders(self):
+        result = reconcile_orders(order_ids=[self.valid_orders[0].id, 99999])
+        self.assertEqual(result['total_orders_checked'], 2)
+        self.assertEqual(result['details'], [reconcile_order(99999)])
+
+
+@mock.patch('apps.audit.services.financial_audit.CHECKPOINT_SAFETY_LAG', timedelta(0))
+class IncrementalReconcileTests(TestCase):
+    """Test run_reconciliation advances the checkpoint and incremental runs only check what changed."""
+
+    def setUp(self):
+        org = Organization.objects.create(name='IncOrg', commission_rate=Decimal('10.00'))
+        event = Event.objects.create(name='IncEv', organization=org)
+        self.stand = Stand.objects.create(name='IncSt', event=event)
+        self.product = Product.objects.create(stand=self.stand, name='IncP', price=Decimal('10.00'), stock_quantity=100)
+        User.objects.create_user(username='inc_admin', role=UserRole.STAND_ADMIN, stand=self.stand)
+        self.buyer = User.objects.create_user(username='inc_buyer', role=UserRole.USER)
+        Wallet.objects.get(user=self.buyer).credit(Decimal('100.00'), description='Seed')
+        self.orders = [self._checkout() for _ in range(2)]
+
+    def _checkout(self):
+        return create_order_with_payment(
+            user=self.buyer, stand=self.stand, items=[{'product': self.product.pk, 'quantity': 1}],
+        )
+
+    def test_full_run_sets_checkpoint(self):
+        result = run_reconciliation()
+        self.assertEqual(result['total_orders_checked'], 2)
+        self.assertEqual(result['inconsistencies_found'], 0)
+        checkpoint = ReconciliationCheckpoint.load()
+        self.assertEqual(checkpoint.last_order_id, self.orders[-1].id)
+        self.assertEqual(checkpoint.last_transaction_id, Transaction.objects.latest('id').id)
+        self.assertEqual(result['checkpoint']['last_order_id'], self.orders[-1].id)
+
+    def test_incremental_checks_only_new_orders(self):
+        run_reconciliation()
+        self.assertEqual(run_reconciliation(incremental=True)['total_orders_checked'], 0)
+        new_order = self._checkout()
+        result = run_reconciliation(incremental=True)
+        self.assertEqual(result['total_orders_checked'], 1)
+        self.assertEqual(ReconciliationCheckpoint.load().last_order_id, new_order.id)
+
+    def test_incremental_rechecks_touched_and_open_orders(self):
+        run_reconciliation()
+        Transaction.objects.create(
+            wallet=Wallet.objects.get(user=self.buyer), amount=Decimal('1.00'),
+            transaction_type=TransactionType.DEBIT, order=self.orders[0], description='Stray',
+        )
+        result = run_reconciliation(incremental=True)
+        self.assertEqual(result['total_orders_checked'], 1)
+        self.assertEqual([d['order_id'] for d in result['details']], [self.orders[0].id])
+        self.assertEqual(ReconciliationCheckpoint.load().open_inconsistencies, [self.orders[0].id])
+        # Still inconsistent: re-checked on every run until fixed.
+        result = run_reconciliation(incremental=True)
+        self.assertEqual(result['total_orders_checked'], 1)
+        self.assertEqual(result['inconsistencies_found'], 1)
+
+    def test_safety_lag_defers_recent_orders(self):
+        with mock.patch('apps.audit.services.financial_audit.CHECKPOINT_SAFETY_LAG', timedelta(hours=1)):
+            result = run_reconciliation()
+        self.assertEqual(result['total_orders_checked'], 0)
+        self.assertEqual(run_reconciliation(incremental=True)['total_orders_checked'], 2)
+
+
+class ReconcileViewModeTests(TestCase):
+    """Test ReconcileView summary, stream (NDJSON) and page modes."""
+
+    def setUp(self):
+        org = Organization.objects.create(name='ModeOrg', commission_rate=Decimal('10.00'))
+        event = Event.objects.create(name='ModeEv', organization=org)
+        stand = Stand.objects.create(name='ModeSt', event=event)
+        product = Product.objects.create(stand=stand, name='ModeP', price=Decimal('10.00'), stock_quantity=100)
+        User.objects.create_user(username='mode_admin', role=UserRole.STAND_ADMIN, stand=stand)
+        buyer = User.objects.create_user(username='mode_buyer', role=UserRole.USER)
+        Wallet.objects.get(user=buyer).credit(Decimal('100.00'), description='Seed')
+        create_order_with_payment(user=buyer, stand=stand, items=[{'product': product.pk, 'quantity': 1}])
+        # Three completed orders without wallet movements: inconsistent.
+        self.unpaid_ids = [
+            Order.objects.create(
+                user=buyer, stand=stand, status=OrderStatus.COMPLETED, total_amount=Decimal('5.00'),
+            ).id
+            for _ in range(3)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username='mode_super', role=UserRole.SUPERADMIN)
+        )
+
+    @mock.patch('apps.audit.services.financial_audit.CHECKPOINT_SAFETY_LAG', timedelta(0))
+    def test_summary_omits_details(self):
+        response = self.client.get('/api/audit/reconcile/', {'mode': 'summary'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('details', response.data)
+        self.assertEqual(response.data['total_orders_checked'], 4)
+        self.assertEqual(response.data['inconsistencies_found'], 3)
+
+    def test_stream_emits_one_line_per_order_and_summary(self):
+        response = self.client.get('/api/audit/reconcile/', {'mode': 'stream'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(lines[-1]['summary'], {'total_orders_checked': 4, 'inconsistencies_found': 3})
+        self.assertEqual([r['order_id'] for r in lines[:-1] if not r['is_valid']], self.unpaid_ids)
+
+    def test_page_follows_cursor(self):
+        seen = []
+        cursor = ''
+        for _ in range(3):
+            response = self.client.get('/api/audit/reconcile/', {'mode': 'page', 'limit': 2, 'cursor': cursor})
+            self.assertEqual(response.status_code, 200)
+            seen += [d['order_id'] for d in response.data['details']]
+            cursor = response.data['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(seen, self.unpaid_ids)
+        self.assertIsNone(cursor)
+
+    def test_page_scan_budget_bounds_each_request(self):
+        order_ids = list(Order.objects.filter(status=OrderStatus.COMPLETED).order_by('id').values_list('id', flat=True))
+        page = reconcile_page(limit=100, max_scan=2)
+        self.assertEqual(page['orders_checked'], 2)
+        self.assertEqual(page['next_cursor'], order_ids[1])
+        self.assertEqual([d['order_id'] for d in page['details']], [i for i in self.unpaid_ids if i <= order_ids[1]])
+
+        seen, cursor = [], 0
+        while cursor is not None:
+            page = reconcile_page(after_id=cursor, limit=100, max_scan=1)
+            self.assertLessEqual(page['orders_checked'], 1)
+            seen += [d['order_id'] for d in page['details']]
+            cursor = page['next_cursor']
+        self.assertEqual(seen, self.unpaid_ids)
+
+    def test_invalid_mode_and_cursor_rejected(self):
+        self.assertEqual(self.client.get('/api/audit/reconcile/', {'mode': 'bogus'}).status_code, 400)
+        self.assertEqual(
+            self.client.get('/api/audit/reconcile/', {'mode': 'page', 'cursor': 'x'}).status_code, 400,
+        )
+
+
+class ExportViewTests(TestCase):
+    """Test the streamed export formats and their created_at day bounds."""
+
+    def setUp(self):
+        org = Organization.objects.create(name='ExpOrg', commission_rate=Decimal('10.00'))
+        event = Event.objects.create(name='ExpEv', organization=org)
+        stand = Stand.objects.create(name='ExpSt', event=event)
+        product = Product.objects.create(stand=stand, name='ExpP', price=Decimal('10.00'), stock_quantity=100)
+        User.objects.create_user(username='exp_admin', role=UserRole.STAND_ADMIN, stand=stand)
+        buyer = User.objects.create_user(username='exp_buyer', role=UserRole.USER)
+        Wallet.objects.get(user=buyer).credit(Decimal('100.00'), description='Seed')
+        self.orders = [
+            create_order_with_payment(user=buyer, stand=stand, items=[{'product': product.pk, 'quantity': 1}])
+            for _ in range(3)
+        ]
+        # Last instant of Jan 1, first instant of Jan 2, and Jan 3.
+        for order, ts in zip(self.orders, ['2026-01-01T23:59:59.999999', '2026-01-02T00:00:00', '2026-01-03T12:00:00']):
+            FinancialAuditLog.objects.filter(order=order).update(
+                created_at=timezone.make_aware(datetime.fromisoformat(ts)),
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='exp_super', role=UserRole.SUPERADMIN))
+
+    def _export_bytes(self, **params):
+        response = self.client.get('/api/audit/export/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def _export(self, **params):
+        response = self.client.get('/api/audit/export/', params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+
+    def test_export_streams_all_rows(self):
+        rows = self._export()
+        self.assertEqual(rows[0][0], 'order_id')
+        self.assertEqual([int(r[0]) for r in rows[1:]], [o.id for o in self.orders])
+        self.assertEqual(rows[1][1:5], ['exp_buyer', 'ExpOrg', 'ExpSt', '10.00'])
+
+    def test_export_date_range_is_inclusive_by_day(self):
+        rows = self._export(start_date='2026-01-01', end_date='2026-01-01')
+        self.assertEqual([int(r[0]) for r in rows[1:]], [self.orders[0].id])
+        rows = self._export(start_date='2026-01-02', end_date='2026-01-03')
+        self.assertEqual([int(r[0]) for r in rows[1:]], [self.orders[1].id, self.orders[2].id])
+
+    def test_export_gzip_csv_in_cents(self):
+        response, body = self._export_bytes(format='csv.gz')
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        rows = list(csv.reader(gzip.decompress(body).decode().splitlines()))
+        self.assertEqual(rows[0][4:7], ['total_amount_cents', 'commission_amount_cents', 'net_amount_cents'])
+        self.assertEqual(rows[1][4:7], ['1000', '100', '900'])
+        self.assertEqual(len(rows), 4)
+
+    def test_export_ndjson_in_cents(self):
+        _, body = self._export_bytes(format='ndjson', start_date='2026-01-03')
+        lines = [json.loads(line) for line in body.decode().splitlines()]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]['order_id'], self.orders[2].id)
+        self.assertEqual(lines[0]['total_amount_cents'], 1000)
+
+    def test_export_arrow_record_batches(self):
+        try:
+            import pyarrow
+        except ImportError:
+            self.skipTest('pyarrow not installed')
+        with mock.patch('apps.audit.services.export.EXPORT_BATCH_ROWS', 2):
+            _, body = self._export_bytes(format='arrow')
+        table = pyarrow.ipc.open_stream(body).read_all()
+        self.assertEqual(table.column('order_id').to_pylist(), [o.id for o in self.orders])
+        self.assertEqual(table.column('net_amount_cents').to_pylist(), [900, 900, 900])
+
+    def test_export_unknown_format_rejected(self):
+        self.assertEqual(self.client.get('/api/audit/export/', {'format': 'xml'}).status_code, 400)
+
+    @mock.patch('apps.audit.services.export.pyarrow', None)
+    def test_export_arrow_without_pyarrow_is_not_offered(self):
+        response = self.client.get('/api/audit/export/', {'format': 'arrow'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('pyarrow', response.json()['detail'])
+        response = self.client.get('/api/audit/export/', {'format': 'xml'})
+        self.assertEqual(response.json()['detail'], 'format must be one of: csv, csv.gz, ndjson.')
+
+
+class LedgerTotalsTests(TestCase):
+    """Test LedgerTotals is maintained by every balance change and verify_global_balance reads it."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='totals_user', role=UserRole.USER)
+        self.wallet = Wallet.objects.get(user=self.user)
+        self.before = verify_global_balance()
+
+    def test_credit_debit_and_locked_paths_update_totals(self):
+        self.wallet.credit(Decimal('50.00'))
+        self.wallet.debit(Decimal('5.00'))
+        with db_transaction.atomic():
+            wallet = lock_wallets([self.wallet.pk])[self.wallet.pk]
+            wallet.debit_locked(Decimal('10.00'))
+            wallet.credit_locked(Decimal('1.00'))
+        with CaptureQueriesContext(connection) as ctx:
+            result = verify_global_balance()
+        self.assertEqual(result['mode'], 'maintained')
+        self.assertFalse(any('wallet_transaction' in q['sql'] for q in ctx.captured_queries))
+        self.assertEqual(result['wallet_total'] - self.before['wallet_total'], 36.0)
+        self.assertEqual(result['ledger_total'] - self.before['ledger_total'], 36.0)
+        self.assertEqual(result['difference'], 0.0)
+
+        full = verify_global_balance(full=True)
+        self.assertEqual(full['mode'], 'full')
+        self.assertEqual(full['wallet_total'], result['wallet_total'])
+        self.assertEqual(full['drift'], {'wallet_total': 0.0, 'ledger_total': 0.0})
+
+    def test_full_mode_reports_drift_from_direct_updates(self):
+        self.wallet.credit(Decimal('20.00'))
+        Wallet.objects.filter(pk=self.wallet.pk).update(balance=Decimal('25.00'))
+        self.assertEqual(verify_global_balance()['difference'], 0.0)
+        full = verify_global_balance(full=True)
+        self.assertEqual(full['difference'], 5.0)
+        self.assertEqual(full['drift']['wallet_total'], 5.0)
+
+    def test_wallet_deletion_removes_its_totals(self):
+        self.wallet.credit(Decimal('30.00'))
+        self.user.delete()
+        result = verify_global_balance(full=True)
+        self.assertEqual(result['wallet_total'], self.before['wallet_total'])
+        self.assertEqual(result['drift'], {'wallet_total': 0.0, 'ledger_total': 0.0})
+
+
+class LedgerTotalsConcurrencyTests(TransactionTestCase):
+    """Test a writer never waits on a totals row held by another transaction."""
+
+    def test_busy_totals_rows_get_a_sibling(self):
+        wallet = Wallet.objects.get(user=User.objects.create_user(username='busy_user', role=UserRole.USER))
+        LedgerTotals.objects.create()
+        rows_before = LedgerTotals.objects.count()
+        balance_before = get_ledger_totals()['balance']
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_all_rows():
+            try:
+                with db_transaction.atomic():
+                    list(LedgerTotals.objects.select_for_update())
+                    locked.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        holder = threading.Thread(target=hold_all_rows)
+        holder.start()
+        try:
+            self.assertTrue(locked.wait(10))
+            with db_transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL lock_timeout = '2s'")
+                wallet.credit(Decimal('1.00'))
+        finally:
+            release.set()
+            holder.join()
+        self.assertEqual(LedgerTotals.objects.count(), rows_before + 1)
+        self.assertEqual(get_ledger_totals()['balance'] - balance_before, Decimal('1.00'))
+
+
+class WalletDriftTests(TestCase):
+    """Test verify_wallets reports exactly the wallets whose balance disagrees with their ledger."""
+
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'drift_{i}', role=UserRole.USER) for i in range(5)]
+        self.wallets = [Wallet.objects.get(user=u) for u in self.users]
+        for wallet in self.wallets:
+            wallet.credit(Decimal('10.00'))
+        self.wallets[0].debit(Decimal('4.00'))
+        # Drift: balance changed without a transaction, and a transaction without a balance change.
+        Wallet.objects.filter(pk=self.wallets[1].pk).update(balance=Decimal('12.50'))
+        Transaction.objects.create(
+            wallet=self.wallets[3], amount=Decimal('1.00'), transaction_type=TransactionType.DEBIT,
+        )
+
+    def test_reports_only_drifting_wallets(self):
+        for chunk_size in (1, 2, 10_000):
+            report = verify_wallets(chunk_size=chunk_size, workers=1)
+            self.assertEqual(report['drift_count'], 2)
+            self.assertEqual(
+                [(w['wallet_id'], w['difference']) for w in report['drifting_wallets']],
+                [(self.wallets[1].pk, 2.5), (self.wallets[3].pk, 1.0)],
+            )
+        self.assertEqual(report['drifting_wallets'][0]['ledger_balance'], 10.0)
+
+    def test_balance_view_includes_wallet_drift(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='drift_super', role=UserRole.SUPERADMIN))
+        response = client.get('/api/audit/balance/', {'wallets': 'true'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['wallet_drift']['drift_count'], 2)
+        self.assertNotIn('wallet_drift', client.get('/api/audit/balance/').data)
+
+
+class WalletDriftParallelTests(TransactionTestCase):
+    """Test the thread-pool scan finds the same drift as the inline scan."""
+
+    def test_parallel_scan_matches_inline(self):
+        wallets = [
+            Wallet.objects.get(user=User.objects.create_user(username=f'pdrift_{i}', role=UserRole.USER))
+            for i in range(9)
+        ]
+        for wallet in wallets:
+            wallet.credit(Decimal('3.00'))
+        Wallet.objects.filter(pk__in=[wallets[2].pk, wallets[7].pk]).update(balance=Decimal('0.00'))
+        parallel = verify_wallets(chunk_size=2, workers=3)
+        self.assertGreater(parallel['ranges_scanned'], 3)
+        self.assertEqual(parallel, verify_wallets(chunk_size=2, workers=1))
+        self.assertEqual([w['wallet_id'] for w in parallel['drifting_wallets']], [wallets[2].pk, wallets[7].pk])
@@ -1,98 +1,140 @@
 """
 Financial audit API: reconciliation, export, global balance. SUPERADMIN only.
 """
-import csv
-from io import StringIO
-from datetime import datetime
+import json
+from datetime import datetime, time, timedelta
 
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.negotiation import DefaultContentNegotiation
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.core.permissions import IsSuperAdmin
-from apps.orders.models import Order, OrderStatus
-from .models import FinancialAuditLog
-from .services.financial_audit import reconcile_order, verify_global_balance
+from .services.export import ExportFormatUnavailable, available_export_formats, get_export_format, iter_export_rows
+from .services.financial_audit import (
+    iter_reconcile_results,
+    reconcile_page,
+    run_reconciliation,
+    verify_global_balance,
+)
+from .services.wallet_drift import verify_wallets
+
+RECONCILE_PAGE_DEFAULT_LIMIT = 100
+RECONCILE_PAGE_MAX_LIMIT = 1000
+
+
+def _reconcile_ndjson():
+    """One JSON line per checked order, then a final summary line."""
+    checked = 0
+    invalid = 0
+    for result in iter_reconcile_results():
+        checked += 1
+        invalid += not result['is_valid']
+        yield json.dumps(result) + '\n'
+    yield json.dumps({'summary': {'total_orders_checked': checked, 'inconsistencies_found': invalid}}) + '\n'
+
+
+def _parse_day_start(value, days=0):
+    """Aware midnight (current timezone) of a YYYY-MM-DD string plus days; None if missing or malformed."""
+    if not value:
+        return None
+    try:
+        day = datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        return None
+    return timezone.make_aware(datetime.combine(day + timedelta(days=days), time.min))
 
 
 class ReconcileView(APIView):
-    """GET /api/audit/reconcile/ — Run reconciliation on all COMPLETED orders. SUPERADMIN only."""
+    """
+    GET /api/audit/reconcile/ — Run reconciliation. SUPERADMIN only.
+    Default: full (or ?incremental=true) run; details lists only the inconsistent orders and
+    checkpoint exposes the persisted high-water mark.
+    ?mode=summary — same run, counts and checkpoint only.
+    ?mode=stream — NDJSON, one line per COMPLETED order as it is checked, then a summary line.
+    ?mode=page&cursor=<order_id>&limit=N — inconsistent orders after cursor; follow next_cursor until null.
+        Each page scans at most RECONCILE_PAGE_MAX_SCAN orders, so a page may be short or empty.
+    stream and page are read-only and do not advance the checkpoint.
+    """
     permission_classes = [IsAuthenticated, IsSuperAdmin]
 
     def get(self, request):
-        order_ids = Order.objects.filter(
-            status=OrderStatus.COMPLETED,
-        ).values_list('id', flat=True)
-
-        details = []
-        inconsistencies_found = 0
-        for oid in order_ids:
-            result = reconcile_order(oid)
-            details.append(result)
-            if not result.get('is_valid', True):
-                inconsistencies_found += 1
-
-        return Response({
-            'total_orders_checked': len(details),
-            'inconsistencies_found': inconsistencies_found,
-            'details': details,
-        }, status=status.HTTP_200_OK)
+        mode = request.query_params.get('mode', '')
+        if mode == 'stream':
+            return StreamingHttpResponse(_reconcile_ndjson(), content_type='application/x-ndjson')
+        if mode == 'page':
+            try:
+                cursor = int(request.query_params.get('cursor') or 0)
+                limit = int(request.query_params.get('limit') or RECONCILE_PAGE_DEFAULT_LIMIT)
+            except ValueError:
+                return Response(
+                    {'detail': 'cursor and limit must be integers.'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            limit = max(1, min(limit, RECONCILE_PAGE_MAX_LIMIT))
+            return Response(reconcile_page(after_id=cursor, limit=limit), status=status.HTTP_200_OK)
+        if mode not in ('', 'summary'):
+            return Response(
+                {'detail': 'mode must be one of: summary, stream, page.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        incremental = request.query_params.get('incremental', '').lower() in ('true', '1', 'yes')
+        result = run_reconciliation(incremental=incremental, include_details=mode != 'summary')
+        return Response(result, status=status.HTTP_200_OK)
 
 
 class GlobalBalanceView(APIView):
-    """GET /api/audit/balance/ — Verify global wallet vs ledger. SUPERADMIN only."""
+    """
+    GET /api/audit/balance/?full=true&wallets=true — Verify global wallet vs ledger. SUPERADMIN only.
+    Default reads the maintained ledger totals (O(1)); full=true recounts and reports drift.
+    wallets=true adds wallet_drift: the individual wallets whose balance disagrees with their ledger.
+    """
     permission_classes = [IsAuthenticated, IsSuperAdmin]
 
     def get(self, request):
-        result = verify_global_balance()
+        full = request.query_params.get('full', '').lower() in ('true', '1', 'yes')
+        result = verify_global_balance(full=full)
+        if request.query_params.get('wallets', '').lower() in ('true', '1', 'yes'):
+            result['wallet_drift'] = verify_wallets()
         return Response(result, status=status.HTTP_200_OK)
 
 
+class _ExportNegotiation(DefaultContentNegotiation):
+    """?format= picks the export encoding, not a DRF renderer; error bodies use the first renderer."""
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
 class ExportView(APIView):
-    """GET /api/audit/export/?start_date=&end_date= — CSV export of FinancialAuditLog. SUPERADMIN only."""
+    """
+    GET /api/audit/export/?start_date=&end_date=&format= — Export FinancialAuditLog. SUPERADMIN only.
+    format: csv (default), csv.gz, ndjson or arrow (Arrow IPC stream; only offered when pyarrow is installed).
+    Streamed: rows come through a server-side cursor as tuples, so memory is flat for any date range.
+    """
     permission_classes = [IsAuthenticated, IsSuperAdmin]
+    content_negotiation_class = _ExportNegotiation
 
     def get(self, request):
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
-
-        qs = FinancialAuditLog.objects.select_related(
-            'order', 'user', 'organization', 'stand',
-        ).order_by('created_at')
-
-        if start_date:
-            try:
-                start = datetime.strptime(start_date, '%Y-%m-%d').date()
-                qs = qs.filter(created_at__date__gte=start)
-            except ValueError:
-                pass
-        if end_date:
-            try:
-                end = datetime.strptime(end_date, '%Y-%m-%d').date()
-                qs = qs.filter(created_at__date__lte=end)
-            except ValueError:
-                pass
-
-        buf = StringIO()
-        writer = csv.writer(buf)
-        writer.writerow([
-            'order_id', 'user', 'organization', 'stand',
-            'total_amount', 'commission_amount', 'net_amount', 'created_at',
-        ])
-        for log in qs:
-            writer.writerow([
-                log.order_id,
-                log.user.username if log.user else '',
-                log.organization.name if log.organization else '',
-                log.stand.name if log.stand else '',
-                log.total_amount,
-                log.commission_amount,
-                log.net_amount,
-                log.created_at.isoformat() if log.created_at else '',
-            ])
-
-        response = HttpResponse(buf.getvalue(), content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="financial_audit_export.csv"'
+        fmt = request.query_params.get('format', 'csv')
+        try:
+            encoder, content_type, extension = get_export_format(fmt)
+        except KeyError:
+            return Response(
+                {'detail': f'format must be one of: {", ".join(available_export_formats())}.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except ExportFormatUnavailable as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Range predicates on created_at (indexed) instead of created_at__date.
+        rows = iter_export_rows(
+            start=_parse_day_start(request.query_params.get('start_date')),
+            end=_parse_day_start(request.query_params.get('end_date'), days=1),
+        )
+        response = StreamingHttpResponse(encoder(rows), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="financial_audit_export.{extension}"'
         return response
@@ -0,0 +1,30 @@
+"""
+Helpers for benchmark management commands.
+Benchmarks run against a throwaway test database (same engine and settings as the configured one),
+so seeding millions of rows never touches real data.
+"""
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+
+
+@contextmanager
+def benchmark_database(keepdb=False, verbosity=0):
+    """Create the test database, point the default connection at it, and destroy it on exit."""
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, keepdb=keepdb)
+    try:
+        yield connection.settings_dict['NAME']
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity, keepdb=keepdb)
+
+
+@contextmanager
+def timed(results, label):
+    """Record wall-clock seconds of the block into results[label]."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        results[label] = time.perf_counter() - start
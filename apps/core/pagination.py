@@ -0,0 +1,115 @@
+"""
+Keyset (seek) pagination on (ordering field, id), newest first by default.
+Each page is one index range scan continuing from the last row of the previous page,
+(field, id) < (cursor) (or > when ascending), so latency does not grow with page depth and no COUNT(*)
+is issued. Cursors are opaque (url-safe base64). Needs an index ending in (field, id) after the
+queryset's equality filters. Works on model and values() querysets (the latter must include field and id).
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only pages of page_size rows: {'next': url or null, 'results': [...]}.
+    Sorted by `ordering`, or by ?ordering=[-]field when the view lists field in ordering_fields;
+    ties are broken by id in the same direction.
+    """
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    ordering_param = 'ordering'
+    ordering = '-created_at'
+
+    def get_ordering(self, request, view):
+        value = request.query_params.get(self.ordering_param)
+        allowed = getattr(view, 'ordering_fields', None) or []
+        if not value:
+            return self.ordering
+        if value.lstrip('-') not in allowed:
+            raise ParseError(f'{self.ordering_param} must be one of: {", ".join(allowed) or self.ordering}.')
+        return value
+
+    def encode_cursor(self, row):
+        field = self.field.attname
+        value, pk = (row[field], row['id']) if isinstance(row, dict) else (getattr(row, field), row.pk)
+        raw = json.dumps({
+            'o': self.key,
+            'v': value.isoformat() if hasattr(value, 'isoformat') else str(value),
+            'i': pk,
+        }).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, value):
+        try:
+            padded = value + '=' * (-len(value) % 4)
+            position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if position['o'] != self.key:
+                raise ValueError
+            field_value = self.field.to_python(position['v'])
+            pk = int(position['i'])
+        except (ValueError, TypeError, KeyError, ValidationError):
+            raise ParseError('Invalid cursor.')
+        if field_value is None:
+            raise ParseError('Invalid cursor.')
+        return field_value, pk
+
+    def get_page_size(self, request):
+        value = request.query_params.get(self.page_size_query_param)
+        if value is None:
+            return self.page_size
+        try:
+            size = int(value)
+        except ValueError:
+            raise ParseError(f'{self.page_size_query_param} must be an integer.')
+        if size < 1:
+            raise ParseError(f'{self.page_size_query_param} must be positive.')
+        return min(size, self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        self.key = self.get_ordering(request, view)
+        descending = self.key.startswith('-')
+        self.field = queryset.model._meta.get_field(self.key.lstrip('-'))
+        queryset = queryset.order_by(self.key, '-id' if descending else 'id')
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            field_value, pk = self.decode_cursor(cursor)
+            table = connection.ops.quote_name(queryset.model._meta.db_table)
+            column = connection.ops.quote_name(self.field.column)
+            # Row comparison, so Postgres uses it as the index range bound (an OR of columns is only a filter).
+            queryset = queryset.filter(RawSQL(
+                f'({table}.{column}, {table}."id") {"<" if descending else ">"} (%s, %s)', [field_value, pk],
+                output_field=BooleanField(),
+            ))
+        rows = list(queryset[:page_size + 1])
+        self.next_cursor = self.encode_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+        return rows[:page_size]
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,62 @@
+"""
+Pre-rendered JSON responses for rarely-changing endpoints.
+render_json renders a payload to bytes with DRF's JSONRenderer (same output as a Response) and derives a
+strong ETag from them; etag_response serves such bytes, answering a matching If-None-Match with a 304
+with no body. A PrerenderedJSON builds its payload once (typically from AppConfig.ready).
+"""
+import hashlib
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.renderers import JSONRenderer
+
+
+def _opaque(etag):
+    """Weak comparison (RFC 9110): W/"x" matches "x"."""
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def render_json(data):
+    """(body bytes, strong ETag) for data."""
+    body = JSONRenderer().render(data)
+    return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_response(request, body, etag, cache_control):
+    """200 with body, or 304 when If-None-Match matches etag; both carry ETag and Cache-Control."""
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        if '*' in etags or etag in {_opaque(tag) for tag in etags}:
+            response = HttpResponseNotModified()
+            _set_headers(response, etag, cache_control)
+            return response
+    response = HttpResponse(body, content_type='application/json')
+    _set_headers(response, etag, cache_control)
+    return response
+
+
+def _set_headers(response, etag, cache_control):
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+
+
+class PrerenderedJSON:
+    """JSON payload of build() rendered once; served with ETag / If-None-Match support."""
+
+    def __init__(self, build, cache_control='private, no-cache'):
+        self._build = build
+        self.cache_control = cache_control
+        self.body = None
+        self.etag = None
+
+    def prerender(self):
+        """(Re)build and render the payload. Call at startup; the first response does it otherwise."""
+        body, etag = render_json(self._build())
+        self.etag = etag
+        self.body = body
+
+    def response(self, request):
+        if self.body is None:
+            self.prerender()
+        return etag_response(request, self.body, self.etag, self.cache_control)
@@ -5,3 +5,8 @@ class DashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.dashboard'
     verbose_name = 'Dashboard'
+
+    def ready(self):
+        from .views import INVESTOR_READINESS_PAYLOAD, PROJECT_STATUS_PAYLOAD
+        PROJECT_STATUS_PAYLOAD.prerender()
+        INVESTOR_READINESS_PAYLOAD.prerender()
@@ -0,0 +1,115 @@
+"""
+Response cache for the dashboard endpoints, on Django's cache framework (locmem, file, redis...).
+Entries are keyed by (view, role, scope, timezone) plus version counters: a global generation and the
+scope's version. A sale completed or reversed in a stand bumps the 'all', its organization's and its
+stand's versions (after commit), so only the affected dashboards recompute.
+Within DASHBOARD_CACHE_TTL an entry is a HIT; for DASHBOARD_CACHE_STALE_TTL more seconds it is served
+as STALE and one request recomputes it after its response has been sent.
+Responses carry X-Dashboard-Cache: HIT | STALE | MISS.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction as db_transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.users.models import UserRole
+
+CACHE_HEADER = 'X-Dashboard-Cache'
+GENERATION_KEY = 'dashboard:generation'
+
+
+def _ttl():
+    return getattr(settings, 'DASHBOARD_CACHE_TTL', 30)
+
+
+def _stale_ttl():
+    return getattr(settings, 'DASHBOARD_CACHE_STALE_TTL', 300)
+
+
+def _version_key(scope):
+    return f'dashboard:version:{scope}'
+
+
+def _initial_version():
+    # Time-based so a lost version key never resurrects older entries.
+    return time.time_ns()
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), timeout=None)
+
+
+def dashboard_scope(user):
+    """Cache scope of a user's dashboards: 'all', 'org:<id>' or 'stand:<id>'."""
+    if user.role == UserRole.EVENT_ADMIN and user.organization_id:
+        return f'org:{user.organization_id}'
+    if user.role == UserRole.STAND_ADMIN and user.stand_id:
+        return f'stand:{user.stand_id}'
+    return 'all'
+
+
+def _versions(scope):
+    keys = [GENERATION_KEY, _version_key(scope)]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, _initial_version(), timeout=None)
+            found[key] = cache.get(key)
+    return found[GENERATION_KEY], found[keys[1]]
+
+
+def invalidate_dashboard_scope(organization_id, stand_id):
+    """Sales changed in this stand: drop cached dashboards for all/org/stand scopes once committed."""
+    def bump():
+        for scope in ('all', f'org:{organization_id}', f'stand:{stand_id}'):
+            _bump(_version_key(scope))
+    db_transaction.on_commit(bump)
+
+
+def invalidate_all_dashboards():
+    """Drop every cached dashboard (bulk rebuilds and deletes) once committed."""
+    db_transaction.on_commit(lambda: _bump(GENERATION_KEY))
+
+
+def cached_dashboard_response(request, view_name, build, scope=None):
+    """
+    Response with build()'s data for request.user, served from the cache when possible.
+    build must be deterministic for (view, role, scope, timezone); call after permission checks.
+    scope defaults to dashboard_scope(request.user).
+    """
+    user = request.user
+    scope = scope or dashboard_scope(user)
+    generation, version = _versions(scope)
+    key = (
+        f'dashboard:{view_name}:{user.role}:{scope}:{timezone.get_current_timezone_name()}'
+        f':{generation}.{version}'
+    )
+    entry = cache.get(key)
+    now = time.time()
+    if entry is not None and now < entry['fresh_until']:
+        state = 'HIT'
+    elif entry is not None:
+        state = 'STALE'
+    else:
+        state = 'MISS'
+        entry = _store(key, build())
+
+    response = Response(entry['data'], status=status.HTTP_200_OK)
+    response[CACHE_HEADER] = state
+    if state == 'STALE' and cache.add(f'{key}:revalidating', 1, timeout=_ttl() or 1):
+        # Recompute once the stale response has been sent (WSGI servers call close() after the body).
+        response._resource_closers.append(lambda: _store(key, build()))
+    return response
+
+
+def _store(key, data):
+    entry = {'data': data, 'fresh_until': time.time() + _ttl()}
+    cache.set(key, entry, _ttl() + _stale_ttl())
+    return entry
@@ -0,0 +1,121 @@
+"""
+Benchmark the financial overview: the original per-metric queries over orders_order (kept here for
+comparison), per-metric queries over the daily rollup, and the single grouped rollup pass used by
+FinancialOverviewView. Seeds a throwaway test database with --orders orders (default 1M) spread over a year.
+"""
+import statistics
+import time
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+from django.test.utils import CaptureQueriesContext
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.audit.management.commands.benchmark_reconcile import seed_completed_orders
+from apps.core.benchmark import benchmark_database, timed
+from apps.dashboard.models import DailySalesRollup
+from apps.dashboard.services.sales_rollup import rebuild_sales_rollup
+from apps.dashboard.views import _build_financial_overview_response
+from apps.orders.models import Order
+from apps.users.models import User
+
+
+def _legacy_orders_overview():
+    """The original FinancialOverviewView queries: every metric aggregates orders_order joined to the org."""
+    now = timezone.now()
+    commission = ExpressionWrapper(F('total_amount') * F('rate') / Value(100), output_field=DecimalField())
+    orders = Order.objects.annotate(rate=Coalesce(F('stand__event__organization__commission_rate'), Value(0)))
+    orders.aggregate(revenue=Sum('total_amount'), orders=Count('id'), commission=Sum(commission))
+    User.objects.filter(is_deleted=False).count()
+    orders.filter(created_at__gte=now - timedelta(days=30), created_at__lt=now).aggregate(
+        revenue=Sum('total_amount'), commission=Sum(commission),
+    )
+    orders.filter(created_at__gte=now - timedelta(days=60), created_at__lt=now - timedelta(days=30)).aggregate(
+        revenue=Sum('total_amount'),
+    )
+    list(
+        orders.values('stand__event__organization_id', 'stand__event__organization__name')
+        .annotate(revenue=Sum('total_amount'), commission=Sum(commission), orders=Count('id'))
+        .order_by('-revenue')[:5]
+    )
+    list(
+        Order.objects.values('stand_id', 'stand__name')
+        .annotate(revenue=Sum('total_amount'), orders=Count('id'))
+        .order_by('-revenue')[:5]
+    )
+    list(
+        orders.annotate(month=TruncMonth('created_at', tz=timezone.get_current_timezone()))
+        .values('month').annotate(revenue=Sum('total_amount'), commission=Sum(commission)).order_by('month')
+    )
+
+
+def _per_metric_rollup_overview():
+    """Same metrics as separate queries over DailySalesRollup."""
+    today = timezone.localdate()
+    rollup = DailySalesRollup.objects.all()
+    rollup.aggregate(Sum('revenue'), Sum('orders_count'), Sum('commission'))
+    User.objects.filter(is_deleted=False).count()
+    rollup.filter(date__gte=today - timedelta(days=29)).aggregate(Sum('revenue'), Sum('commission'))
+    rollup.filter(date__gte=today - timedelta(days=59), date__lt=today - timedelta(days=29)).aggregate(
+        Sum('revenue'),
+    )
+    list(
+        rollup.values('organization_id', 'organization__name')
+        .annotate(r=Sum('revenue'), c=Sum('commission'), o=Sum('orders_count')).order_by('-r')[:5]
+    )
+    list(rollup.values('stand_id', 'stand__name').annotate(r=Sum('revenue'), o=Sum('orders_count')).order_by('-r')[:5])
+    list(
+        rollup.filter(date__gte=today - timedelta(days=186)).annotate(month=TruncMonth('date'))
+        .values('month').annotate(r=Sum('revenue'), c=Sum('commission')).order_by('month')
+    )
+
+
+VARIANTS = [
+    ('orders table, per-metric queries', _legacy_orders_overview),
+    ('rollup, per-metric queries', _per_metric_rollup_overview),
+    ('rollup, single grouped pass', _build_financial_overview_response),
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark FinancialOverview query strategies on a seeded dataset.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=1_000_000)
+        parser.add_argument('--days', type=int, default=365, help='Spread orders over this many days.')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--keepdb', action='store_true')
+
+    def handle(self, *args, **options):
+        with benchmark_database(keepdb=options['keepdb']):
+            results = {}
+            with timed(results, 'seed'):
+                seed_completed_orders(options['orders'])
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f'UPDATE {Order._meta.db_table} '
+                        f"SET created_at = NOW() - (id %% %s) * INTERVAL '1 day'",
+                        [options['days']],
+                    )
+                    cursor.execute(f'ANALYZE {Order._meta.db_table}')
+                rows = rebuild_sales_rollup()
+            self.stdout.write(
+                f'seeded {options["orders"]} orders over {options["days"]} days '
+                f'({rows} rollup rows) in {results["seed"]:.1f}s'
+            )
+
+            for label, run in VARIANTS:
+                run()  # warm caches
+                timings = []
+                for _ in range(options['repeat']):
+                    with CaptureQueriesContext(connection) as ctx:
+                        start = time.perf_counter()
+                        run()
+                        timings.append(time.perf_counter() - start)
+                self.stdout.write(
+                    f'{label:>34}: {len(ctx.captured_queries)} queries, '
+                    f'median {statistics.median(timings) * 1000:8.1f} ms'
+                )
@@ -0,0 +1,30 @@
+"""
+Recompute the daily sales rollup from FinancialAuditLog, for backfills or after bulk loads.
+Without --start/--end every day is rebuilt.
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.dashboard.services.sales_rollup import rebuild_sales_rollup
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except ValueError:
+        raise CommandError(f'Invalid date {value!r}; expected YYYY-MM-DD.')
+
+
+class Command(BaseCommand):
+    help = 'Rebuild DailySalesRollup rows for a date range (default: all days).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First day to rebuild (YYYY-MM-DD).')
+        parser.add_argument('--end', help='Last day to rebuild (YYYY-MM-DD).')
+
+    def handle(self, *args, **options):
+        start = _parse_date(options['start'])
+        end = _parse_date(options['end'])
+        rows = rebuild_sales_rollup(start=start, end=end)
+        self.stdout.write(f'Rebuilt {rows} rollup rows ({start or "beginning"} .. {end or "today"}).')
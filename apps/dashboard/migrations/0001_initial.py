@@ -0,0 +1,82 @@
+# Daily sales rollup for the dashboards, backfilled from FinancialAuditLog
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+import django.db.models.deletion
+
+
+def backfill_daily_sales_rollup(apps, schema_editor):
+    FinancialAuditLog = apps.get_model('audit', 'FinancialAuditLog')
+    DailySalesRollup = apps.get_model('dashboard', 'DailySalesRollup')
+    grouped = (
+        FinancialAuditLog.objects.filter(order__is_reversed=False, order__status='COMPLETED')
+        .annotate(day=TruncDate('order__created_at', tz=timezone.get_current_timezone()))
+        .values('day', 'order__stand_id', 'order__stand__event_id', 'order__stand__event__organization_id')
+        .annotate(
+            revenue=Sum('total_amount'),
+            commission=Sum('commission_amount'),
+            net=Sum('net_amount'),
+            orders_count=Count('id'),
+        )
+        .order_by()
+    )
+    DailySalesRollup.objects.bulk_create(
+        [
+            DailySalesRollup(
+                date=r['day'],
+                organization_id=r['order__stand__event__organization_id'],
+                event_id=r['order__stand__event_id'],
+                stand_id=r['order__stand_id'],
+                revenue=r['revenue'],
+                commission=r['commission'],
+                net=r['net'],
+                orders_count=r['orders_count'],
+            )
+            for r in grouped.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('organizations', '0002_organization_owner'),
+        ('events', '0001_initial'),
+        ('stands', '0002_stand_owner'),
+        ('orders', '0002_idempotency_and_reversed'),
+        ('audit', '0003_financialauditlog_created_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=16)),
+                ('commission', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=16)),
+                ('net', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=16)),
+                ('orders_count', models.IntegerField(default=0)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='events.event')),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='organizations.organization')),
+                ('stand', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='stands.stand')),
+            ],
+            options={
+                'verbose_name': 'Daily Sales Rollup',
+                'verbose_name_plural': 'Daily Sales Rollups',
+                'db_table': 'dashboard_dailysalesrollup',
+                'indexes': [models.Index(fields=['date'], name='dash_rollup_date_idx'), models.Index(fields=['organization', 'date'], name='dash_rollup_org_date_idx'), models.Index(fields=['stand', 'date'], name='dash_rollup_stand_date_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailysalesrollup',
+            constraint=models.UniqueConstraint(fields=('date', 'organization', 'event', 'stand'), name='dashboard_rollup_day_scope_uniq'),
+        ),
+        migrations.RunPython(backfill_daily_sales_rollup, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+"""
+Daily sales rollup backing the dashboards.
+"""
+from decimal import Decimal
+from django.db import models
+
+
+class DailySalesRollup(models.Model):
+    """
+    Sales of COMPLETED, non-reversed orders per (day, organization, event, stand); day of
+    Order.created_at in the project timezone. Maintained incrementally by apps.dashboard.services.sales_rollup
+    (order completion adds, reversal subtracts); rebuild_sales_rollup recomputes it from FinancialAuditLog.
+    """
+    date = models.DateField()
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    event = models.ForeignKey(
+        'events.Event',
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    stand = models.ForeignKey(
+        'stands.Stand',
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    revenue = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal('0.00'))
+    commission = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal('0.00'))
+    net = models.DecimalField(max_digits=16, decimal_places=2, default=Decimal('0.00'))
+    orders_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'dashboard_dailysalesrollup'
+        verbose_name = 'Daily Sales Rollup'
+        verbose_name_plural = 'Daily Sales Rollups'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'organization', 'event', 'stand'],
+                name='dashboard_rollup_day_scope_uniq',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='dash_rollup_date_idx'),
+            models.Index(fields=['organization', 'date'], name='dash_rollup_org_date_idx'),
+            models.Index(fields=['stand', 'date'], name='dash_rollup_stand_date_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.date} stand {self.stand_id}: {self.revenue}'
@@ -0,0 +1,7 @@
+from .sales_rollup import (
+    record_sales,
+    record_order_sales,
+    rebuild_sales_rollup,
+)
+
+__all__ = ['record_sales', 'record_order_sales', 'rebuild_sales_rollup']
@@ -0,0 +1,161 @@
+"""
+Daily sales rollup (DailySalesRollup): one row per (day, organization, event, stand).
+record_order_sales adds a completed order (sign=1) or takes a reversed/removed one out (sign=-1) with a
+single upsert, in the caller's transaction. rebuild_sales_rollup recomputes a date range from
+FinancialAuditLog for backfills and bulk loads, one day per transaction. Both invalidate the cached
+dashboards they affect.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db import connection, transaction as db_transaction
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.audit.models import FinancialAuditLog
+from apps.dashboard.cache import invalidate_all_dashboards, invalidate_dashboard_scope
+from apps.dashboard.models import DailySalesRollup
+from apps.orders.models import Order, OrderStatus
+from apps.stands.models import Stand
+
+
+def order_sales_day(order):
+    """Rollup day of an order: Order.created_at in the current timezone."""
+    return timezone.localdate(order.created_at)
+
+
+def record_sales(day, organization_id, event_id, stand_id, revenue, commission, net, orders=1):
+    """Add amounts (negative to subtract) to the (day, organization, event, stand) row, creating it if missing."""
+    table = connection.ops.quote_name(DailySalesRollup._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} '
+            f'(date, organization_id, event_id, stand_id, revenue, commission, net, orders_count) '
+            f'VALUES (%s, %s, %s, %s, %s, %s, %s, %s) '
+            f'ON CONFLICT (date, organization_id, event_id, stand_id) DO UPDATE SET '
+            f'revenue = {table}.revenue + EXCLUDED.revenue, '
+            f'commission = {table}.commission + EXCLUDED.commission, '
+            f'net = {table}.net + EXCLUDED.net, '
+            f'orders_count = {table}.orders_count + EXCLUDED.orders_count',
+            [day, organization_id, event_id, stand_id, revenue, commission, net, orders],
+        )
+    invalidate_dashboard_scope(organization_id, stand_id)
+
+
+def record_order_sales(order, audit_log, sign=1, stand=None):
+    """
+    Add (sign=1) or remove (sign=-1) one order's FinancialAuditLog amounts.
+    stand: the order's Stand with event loaded, if the caller already has it (saves a query).
+    """
+    if order.event_id is not None:
+        event_id, organization_id = order.event_id, order.organization_id
+    elif stand is not None:
+        event_id, organization_id = stand.event_id, stand.event.organization_id
+    else:
+        event_id, organization_id = Stand.objects.values_list(
+            'event_id', 'event__organization_id',
+        ).get(pk=order.stand_id)
+    record_sales(
+        order_sales_day(order),
+        organization_id,
+        event_id,
+        order.stand_id,
+        sign * audit_log.total_amount,
+        sign * audit_log.commission_amount,
+        sign * audit_log.net_amount,
+        orders=sign,
+    )
+
+
+def order_scope_annotations():
+    """
+    (organization, event) of a FinancialAuditLog's order for grouping: the order's own columns, or its
+    stand's event for orders not yet filled by backfill_order_scope.
+    """
+    return {
+        'scope_organization_id': Coalesce('order__organization_id', 'order__stand__event__organization_id'),
+        'scope_event_id': Coalesce('order__event_id', 'order__stand__event_id'),
+    }
+
+
+def _day_bounds(start, end):
+    tz = timezone.get_current_timezone()
+    lower = timezone.make_aware(datetime.combine(start, time.min), tz) if start else None
+    upper = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz) if end else None
+    return lower, upper
+
+
+def _rebuild_range(start, end):
+    """(first, last) day to rebuild: start/end, or the span of completed orders and rollup rows when None."""
+    if start is not None and end is not None:
+        return start, end
+    orders = Order.objects.filter(status=OrderStatus.COMPLETED).aggregate(
+        first=Min('created_at'), last=Max('created_at'),
+    )
+    rows = DailySalesRollup.objects.aggregate(first=Min('date'), last=Max('date'))
+    firsts = [d for d in (orders['first'] and timezone.localdate(orders['first']), rows['first']) if d]
+    lasts = [d for d in (orders['last'] and timezone.localdate(orders['last']), rows['last']) if d]
+    return start or (min(firsts) if firsts else None), end or (max(lasts) if lasts else None)
+
+
+def _rebuild_day(day):
+    """Replace one day's rollup rows with a fresh aggregate, in one short transaction. Returns rows written."""
+    lower, upper = _day_bounds(day, day)
+    grouped = (
+        FinancialAuditLog.objects.filter(
+            order__is_reversed=False,
+            order__status=OrderStatus.COMPLETED,
+            order__created_at__gte=lower,
+            order__created_at__lt=upper,
+        )
+        .annotate(**order_scope_annotations())
+        .values('order__stand_id', 'scope_event_id', 'scope_organization_id')
+        .annotate(
+            revenue=Sum('total_amount'),
+            commission=Sum('commission_amount'),
+            net=Sum('net_amount'),
+            orders_count=Count('id'),
+        )
+        .order_by()
+    )
+    with db_transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'LOCK TABLE {connection.ops.quote_name(DailySalesRollup._meta.db_table)} IN EXCLUSIVE MODE'
+            )
+        DailySalesRollup.objects.filter(date=day).delete()
+        created = DailySalesRollup.objects.bulk_create(
+            [
+                DailySalesRollup(
+                    date=day,
+                    organization_id=r['scope_organization_id'],
+                    event_id=r['scope_event_id'],
+                    stand_id=r['order__stand_id'],
+                    revenue=r['revenue'],
+                    commission=r['commission'],
+                    net=r['net'],
+                    orders_count=r['orders_count'],
+                )
+                for r in grouped
+            ],
+            batch_size=1000,
+        )
+    return len(created)
+
+
+def rebuild_sales_rollup(start=None, end=None):
+    """
+    Recompute rollup rows for days start..end (inclusive dates; None = from the first / to the last day with
+    completed orders or rollup rows) from the FinancialAuditLog of COMPLETED, non-reversed orders.
+    Returns the number of rows written. One transaction per day: the rollup is locked against concurrent
+    writers while that day is deleted, aggregated (through orders_status_created_idx) and re-inserted, so
+    no increment is lost or double counted and a checkout waits at most for one day's aggregate.
+    """
+    first, last = _rebuild_range(start, end)
+    written = 0
+    day = first
+    while first is not None and last is not None and day <= last:
+        written += _rebuild_day(day)
+        day += timedelta(days=1)
+    invalidate_all_dashboards()
+    return written
@@ -0,0 +1,280 @@
+"""
+Dashboard tests: daily sales rollup maintenance and the views that read it.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.users.models import User, UserRole
+from apps.organizations.models import Organization
+from apps.events.models import Event
+from apps.stands.models import Stand, Product
+from apps.orders.models import Order, OrderStatus
+from apps.wallet.models import Wallet
+from apps.orders.services.checkout import create_order_with_payment
+from apps.audit.services.financial_audit import reverse_order
+from apps.dashboard.cache import CACHE_HEADER
+from apps.dashboard.models import DailySalesRollup
+from apps.dashboard.views import _build_investor_readiness_response, _build_project_status_response
+from apps.dashboard.services.sales_rollup import rebuild_sales_rollup
+
+
+def _rollup_rows():
+    return sorted(
+        DailySalesRollup.objects.values_list(
+            'date', 'organization_id', 'event_id', 'stand_id', 'revenue', 'commission', 'net', 'orders_count',
+        )
+    )
+
+
+class DashboardFixtureMixin:
+    """Two organizations, one stand each; orders placed through checkout."""
+
+    def setUp(self):
+        cache.clear()
+        self.org = Organization.objects.create(name='RollOrg', commission_rate=Decimal('10.00'))
+        self.other_org = Organization.objects.create(name='OtherOrg', commission_rate=Decimal('20.00'))
+        self.stand = Stand.objects.create(name='RollSt', event=Event.objects.create(name='RollEv', organization=self.org))
+        self.other_stand = Stand.objects.create(
+            name='OtherSt', event=Event.objects.create(name='OtherEv', organization=self.other_org),
+        )
+        self.product = Product.objects.create(stand=self.stand, name='P', price=Decimal('10.00'), stock_quantity=100)
+        self.other_product = Product.objects.create(
+            stand=self.other_stand, name='Q', price=Decimal('50.00'), stock_quantity=100,
+        )
+        self.stand_admin = User.objects.create_user(username='roll_admin', role=UserRole.STAND_ADMIN, stand=self.stand)
+        self.other_admin = User.objects.create_user(
+            username='other_admin', role=UserRole.STAND_ADMIN, stand=self.other_stand,
+        )
+        self.buyer = User.objects.create_user(username='roll_buyer', role=UserRole.USER)
+        Wallet.objects.get(user=self.buyer).credit(Decimal('500.00'), description='Seed')
+
+    def _buy(self, product, quantity=1):
+        return create_order_with_payment(
+            user=self.buyer, stand=product.stand, items=[{'product': product.pk, 'quantity': quantity}],
+        )
+
+
+class SalesRollupMaintenanceTests(DashboardFixtureMixin, TestCase):
+    """Test the rollup follows completions and reversals and matches a rebuild."""
+
+    def test_completion_and_reversal_update_rollup(self):
+        self._buy(self.product, 2)
+        order = self._buy(self.product)
+        self._buy(self.other_product)
+        today = timezone.localdate()
+        self.assertEqual(_rollup_rows(), sorted([
+            (today, self.org.id, self.stand.event_id, self.stand.id,
+             Decimal('30.00'), Decimal('3.00'), Decimal('27.00'), 2),
+            (today, self.other_org.id, self.other_stand.event_id, self.other_stand.id,
+             Decimal('50.00'), Decimal('10.00'), Decimal('40.00'), 1),
+        ]))
+
+        Order.objects.filter(pk=order.pk).update(status=OrderStatus.CANCELLED)
+        reverse_order(order)
+        row = DailySalesRollup.objects.get(stand=self.stand)
+        self.assertEqual((row.revenue, row.commission, row.net, row.orders_count),
+                         (Decimal('20.00'), Decimal('2.00'), Decimal('18.00'), 1))
+
+    def test_rebuild_matches_incremental_and_uses_order_day(self):
+        orders = [self._buy(self.product), self._buy(self.other_product), self._buy(self.product)]
+        Order.objects.filter(pk=orders[1].pk).update(created_at=timezone.now() - timedelta(days=3))
+        rebuild_sales_rollup(start=timezone.localdate() - timedelta(days=3))
+        dates = dict(DailySalesRollup.objects.values_list('stand_id', 'date'))
+        self.assertEqual(dates[self.other_stand.id], timezone.localdate() - timedelta(days=3))
+
+        incremental = _rollup_rows()
+        DailySalesRollup.objects.all().delete()
+        rebuild_sales_rollup()
+        self.assertEqual(_rollup_rows(), incremental)
+
+    def test_rebuild_limited_to_range_keeps_other_days(self):
+        self._buy(self.product)
+        DailySalesRollup.objects.create(
+            date=timezone.localdate() - timedelta(days=10), organization=self.org,
+            event=self.stand.event, stand=self.stand, revenue=Decimal('1.00'), orders_count=1,
+        )
+        rebuild_sales_rollup(start=timezone.localdate(), end=timezone.localdate())
+        self.assertEqual(DailySalesRollup.objects.count(), 2)
+
+    def test_rebuild_runs_one_short_transaction_per_day(self):
+        order = self._buy(self.product)
+        self._buy(self.other_product)
+        Order.objects.filter(pk=order.pk).update(created_at=timezone.now() - timedelta(days=4))
+        DailySalesRollup.objects.create(
+            date=timezone.localdate() - timedelta(days=2), organization=self.org,
+            event=self.stand.event, stand=self.stand, revenue=Decimal('9.00'), orders_count=1,
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            rebuild_sales_rollup()
+        locks = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('LOCK TABLE')]
+        self.assertEqual(len(locks), 5)
+        self.assertEqual(
+            sorted(DailySalesRollup.objects.values_list('date', 'stand_id')),
+            [(timezone.localdate() - timedelta(days=4), self.stand.id), (timezone.localdate(), self.other_stand.id)],
+        )
+
+
+class DashboardViewTests(DashboardFixtureMixin, TestCase):
+    """Test dashboard responses read from the rollup with the same shapes and scoping."""
+
+    def setUp(self):
+        super().setUp()
+        self._buy(self.product, 3)
+        self._buy(self.other_product)
+        self.client = APIClient()
+        self.superadmin = User.objects.create_user(username='roll_super', role=UserRole.SUPERADMIN)
+        self.event_admin = User.objects.create_user(
+            username='roll_event', role=UserRole.EVENT_ADMIN, organization=self.org,
+        )
+
+    def _get(self, user, path):
+        self.client.force_authenticate(user)
+        response = self.client.get(f'/api/dashboard/{path}/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_role_dashboards(self):
+        self.assertEqual(self._get(self.superadmin, 'superadmin'), {
+            'total_sales': '80.00', 'total_commission': '13.00', 'total_net_to_stands': '67.00', 'orders_today': 2,
+        })
+        self.assertEqual(self._get(self.event_admin, 'eventadmin'), {
+            'total_sales': '30.00', 'total_commission': '3.00', 'total_net_to_stands': '27.00', 'orders_today': 1,
+        })
+        self.assertEqual(self._get(self.stand_admin, 'standadmin'), {
+            'total_sales': '30.00', 'total_net_received': '27.00', 'orders_today': 1,
+        })
+
+    def test_sales_chart_scoped_last_7_days(self):
+        chart = self._get(self.event_admin, 'sales-chart')
+        self.assertEqual(len(chart), 7)
+        self.assertEqual(chart[-1], {
+            'date': timezone.localdate().isoformat(), 'total_sales': 30.0, 'commission': 3.0, 'net': 27.0,
+        })
+        self.assertEqual(sum(day['total_sales'] for day in chart[:-1]), 0.0)
+
+    def test_financial_overview(self):
+        data = self._get(self.superadmin, 'financial-overview')
+        self.assertEqual(data['total_revenue'], 80.0)
+        self.assertEqual(data['total_commission'], 13.0)
+        self.assertEqual(data['total_paid_to_stands'], 67.0)
+        self.assertEqual(data['total_orders'], 2)
+        self.assertEqual(data['avg_ticket'], 40.0)
+        self.assertEqual(data['revenue_last_30'], 80.0)
+        self.assertEqual([o['name'] for o in data['top_organizations']], ['OtherOrg', 'RollOrg'])
+        self.assertEqual(data['top_stands'][0], {'id': self.other_stand.id, 'name': 'OtherSt', 'revenue': 50.0, 'orders': 1})
+        self.assertEqual(data['monthly_revenue'][-1]['revenue'], 80.0)
+        self.assertEqual(len(data['monthly_revenue']), 6)
+
+    def test_financial_overview_windows_and_query_budget(self):
+        today = timezone.localdate()
+        for days_ago, revenue in ((10, '20.00'), (40, '50.00'), (400, '1000.00')):
+            DailySalesRollup.objects.create(
+                date=today - timedelta(days=days_ago), organization=self.org, event=self.stand.event,
+                stand=self.stand, revenue=Decimal(revenue), commission=Decimal('1.00'),
+                net=Decimal(revenue) - 1, orders_count=1,
+            )
+        self.client.force_authenticate(self.superadmin)
+        # ATOMIC_REQUESTS savepoint + release, one grouped rollup scan, the active-users count.
+        with self.assertNumQueries(4):
+            data = self.client.get('/api/dashboard/financial-overview/').data
+        self.assertEqual(data['total_revenue'], 1150.0)
+        self.assertEqual(data['total_orders'], 5)
+        self.assertEqual(data['revenue_last_30'], 100.0)
+        self.assertEqual(data['commission_last_30'], 14.0)
+        self.assertEqual(data['revenue_prev_30'], 50.0)
+        self.assertEqual(data['growth_percentage'], 100.0)
+        self.assertEqual(data['top_organizations'][0]['name'], 'RollOrg')
+        self.assertEqual(data['top_organizations'][0]['revenue'], 1100.0)
+        self.assertEqual(data['top_organizations'][0]['orders'], 4)
+
+
+class DashboardCacheTests(DashboardFixtureMixin, TestCase):
+    """Test dashboard responses are cached per scope, invalidated by sales, and revalidated when stale."""
+
+    def setUp(self):
+        super().setUp()
+        self._buy(self.product)
+        self.client = APIClient()
+        self.superadmin = User.objects.create_user(username='cache_super', role=UserRole.SUPERADMIN)
+
+    def _get(self, user, path):
+        self.client.force_authenticate(user)
+        response = self.client.get(f'/api/dashboard/{path}/')
+        self.assertEqual(response.status_code, 200)
+        return response[CACHE_HEADER], response.data
+
+    def test_hit_after_miss_and_sale_invalidates_only_its_scopes(self):
+        self.assertEqual(self._get(self.superadmin, 'superadmin')[0], 'MISS')
+        self.assertEqual(self._get(self.superadmin, 'superadmin'), ('HIT', {
+            'total_sales': '10.00', 'total_commission': '1.00', 'total_net_to_stands': '9.00', 'orders_today': 1,
+        }))
+        self.assertEqual(self._get(self.stand_admin, 'standadmin')[0], 'MISS')
+        self.assertEqual(self._get(self.other_admin, 'standadmin')[0], 'MISS')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._buy(self.product, 2)
+
+        state, data = self._get(self.superadmin, 'superadmin')
+        self.assertEqual((state, data['total_sales']), ('MISS', '30.00'))
+        state, data = self._get(self.stand_admin, 'standadmin')
+        self.assertEqual((state, data['total_sales']), ('MISS', '30.00'))
+        self.assertEqual(self._get(self.other_admin, 'standadmin'), ('HIT', {
+            'total_sales': '0.00', 'total_net_received': '0.00', 'orders_today': 0,
+        }))
+
+    def test_rebuild_invalidates_every_scope(self):
+        self._get(self.stand_admin, 'sales-chart')
+        self._get(self.other_admin, 'sales-chart')
+        with self.captureOnCommitCallbacks(execute=True):
+            rebuild_sales_rollup()
+        self.assertEqual(self._get(self.stand_admin, 'sales-chart')[0], 'MISS')
+        self.assertEqual(self._get(self.other_admin, 'sales-chart')[0], 'MISS')
+
+    @override_settings(DASHBOARD_CACHE_TTL=0)
+    def test_stale_entry_served_then_recomputed_after_response(self):
+        self.assertEqual(self._get(self.stand_admin, 'standadmin')[0], 'MISS')
+        DailySalesRollup.objects.filter(stand=self.stand).update(revenue=Decimal('99.00'))
+
+        state, data = self._get(self.stand_admin, 'standadmin')
+        self.assertEqual((state, data['total_sales']), ('STALE', '10.00'))
+        state, data = self._get(self.stand_admin, 'standadmin')
+        self.assertEqual((state, data['total_sales']), ('STALE', '99.00'))
+
+
+class PrerenderedStatusViewTests(TestCase):
+    """Test project status and investor readiness are served pre-rendered with ETag revalidation."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.superadmin = User.objects.create_user(username='status_super', role=UserRole.SUPERADMIN)
+
+    def test_payload_etag_and_not_modified(self):
+        self.client.force_authenticate(self.superadmin)
+        for path, build in (
+            ('project-status', _build_project_status_response),
+            ('investor-readiness', _build_investor_readiness_response),
+        ):
+            with self.assertNumQueries(0):
+                response = self.client.get(f'/api/dashboard/{path}/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), build())
+            etag = response['ETag']
+
+            response = self.client.get(f'/api/dashboard/{path}/', HTTP_IF_NONE_MATCH=f'"stale", W/{etag}')
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.content, b'')
+            self.assertEqual(response['ETag'], etag)
+            self.assertEqual(self.client.get(f'/api/dashboard/{path}/', HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_permissions_still_enforced(self):
+        self.client.force_authenticate(User.objects.create_user(username='status_user', role=UserRole.USER))
+        self.assertEqual(self.client.get('/api/dashboard/project-status/').status_code, 403)
+        anonymous = APIClient().get('/api/dashboard/investor-readiness/', HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(anonymous.status_code, 401)
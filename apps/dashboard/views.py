@@ -1,19 +1,25 @@
 """
-Dashboard metrics by role. Uses timezone-aware today and aggregations.
+Dashboard metrics by role. Sales figures come from the daily sales rollup (DailySalesRollup),
+so cost grows with the number of days and stands, not orders.
 """
-from datetime import datetime, timedelta
+from datetime import date, timedelta
 
+import os
 from decimal import Decimal
-from django.db.models import Sum, Count, F, Value, DecimalField, ExpressionWrapper
-from django.db.models.functions import TruncDate, TruncMonth, Coalesce
+from django.db import transaction as db_transaction
+from django.db.models import Q, Sum
+from django.db.models.functions import TruncMonth
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.utils.decorators import method_decorator
 from rest_framework.views import APIView
 
 from apps.core.permissions import IsSuperAdmin, IsEventAdminOrSuperAdmin
-from apps.orders.models import Order
+from apps.core.responses import PrerenderedJSON
+from .cache import cached_dashboard_response
+from .models import DailySalesRollup
 
 
 # Static project status (vision vs implemented). SuperAdmin-only internal overview.
@@ -63,7 +69,6 @@ def _build_project_status_response():
         'completion_percentage': completion,
         'maturity_level': _maturity_level(completion),
     }
-from apps.wallet.models import Transaction, TransactionType, get_platform_wallet
 from apps.users.models import User, UserRole
 
 
@@ -78,13 +83,43 @@ def _to_float(value):
     return round(float(value), 2)
 
 
-def _today_start_end():
-    """Timezone-aware today (start and end as datetimes for __range)."""
-    tz_now = timezone.now()
-    start = tz_now.replace(hour=0, minute=0, second=0, microsecond=0)
-    from datetime import timedelta
-    end = start + timedelta(days=1)
-    return start, end
+def _rollup_qs(user):
+    """DailySalesRollup rows visible to user: SUPERADMIN all, EVENT_ADMIN their organization, STAND_ADMIN their stand."""
+    qs = DailySalesRollup.objects.all()
+    if user.role == UserRole.SUPERADMIN:
+        return qs
+    if user.role == UserRole.EVENT_ADMIN and getattr(user, 'organization_id', None):
+        return qs.filter(organization_id=user.organization_id)
+    if user.role == UserRole.STAND_ADMIN and getattr(user, 'stand_id', None):
+        return qs.filter(stand_id=user.stand_id)
+    return qs.none()
+
+
+def _rollup_totals(rollup_qs):
+    """All-time revenue, commission and net plus today's order count of a rollup queryset (one query)."""
+    totals = rollup_qs.aggregate(
+        total_sales=Sum('revenue'),
+        total_commission=Sum('commission'),
+        total_net=Sum('net'),
+        orders_today=Sum('orders_count', filter=Q(date=timezone.localdate())),
+    )
+    return {
+        'total_sales': totals['total_sales'] or _zero(),
+        'total_commission': totals['total_commission'] or _zero(),
+        'total_net': totals['total_net'] or _zero(),
+        'orders_today': totals['orders_today'] or 0,
+    }
+
+
+def _sales_totals_response(rollup_qs):
+    """Payload shared by the superadmin and event-admin dashboards."""
+    totals = _rollup_totals(rollup_qs)
+    return {
+        'total_sales': str(totals['total_sales']),
+        'total_commission': str(totals['total_commission']),
+        'total_net_to_stands': str(totals['total_net']),
+        'orders_today': totals['orders_today'],
+    }
 
 
 class SuperAdminDashboardView(APIView):
@@ -92,29 +127,9 @@ class SuperAdminDashboardView(APIView):
     permission_classes = [IsAuthenticated, IsSuperAdmin]
 
     def get(self, request):
-        start, end = _today_start_end()
-        orders_qs = Order.objects.all()
-        orders_today = orders_qs.filter(created_at__gte=start, created_at__lt=end).count()
-        total_sales = orders_qs.aggregate(s=Sum('total_amount'))['s'] or _zero()
-
-        platform_wallet = get_platform_wallet()
-        total_commission = Transaction.objects.filter(
-            wallet=platform_wallet,
-            transaction_type=TransactionType.CREDIT,
-            order__isnull=False,
-        ).aggregate(s=Sum('amount'))['s'] or _zero()
-
-        total_net_to_stands = Transaction.objects.filter(
-            transaction_type=TransactionType.CREDIT,
-            order__isnull=False,
-        ).exclude(wallet=platform_wallet).aggregate(s=Sum('amount'))['s'] or _zero()
-
-        return Response({
-            'total_sales': str(total_sales),
-            'total_commission': str(total_commission),
-            'total_net_to_stands': str(total_net_to_stands),
-            'orders_today': orders_today,
-        }, status=status.HTTP_200_OK)
+        return cached_dashboard_response(
+            request, 'superadmin', lambda: _sales_totals_response(DailySalesRollup.objects.all()),
+        )
 
 
 class EventAdminDashboardView(APIView):
@@ -128,34 +143,10 @@ class EventAdminDashboardView(APIView):
                 {'detail': 'Event Admin with organization required.'},
                 status=status.HTTP_403_FORBIDDEN,
             )
-        org_id = user.organization_id
-
-        start, end = _today_start_end()
-        orders_qs = Order.objects.filter(stand__event__organization_id=org_id)
-        orders_today = orders_qs.filter(created_at__gte=start, created_at__lt=end).count()
-        total_sales = orders_qs.aggregate(s=Sum('total_amount'))['s'] or _zero()
-
-        platform_wallet = get_platform_wallet()
-        tx_commission_qs = Transaction.objects.filter(
-            wallet=platform_wallet,
-            transaction_type=TransactionType.CREDIT,
-            order__isnull=False,
-            order__stand__event__organization_id=org_id,
+        return cached_dashboard_response(
+            request, 'eventadmin',
+            lambda: _sales_totals_response(DailySalesRollup.objects.filter(organization_id=user.organization_id)),
         )
-        total_commission = tx_commission_qs.aggregate(s=Sum('amount'))['s'] or _zero()
-
-        total_net_to_stands = Transaction.objects.filter(
-            transaction_type=TransactionType.CREDIT,
-            order__isnull=False,
-            order__stand__event__organization_id=org_id,
-        ).exclude(wallet=platform_wallet).aggregate(s=Sum('amount'))['s'] or _zero()
-
-        return Response({
-            'total_sales': str(total_sales),
-            'total_commission': str(total_commission),
-            'total_net_to_stands': str(total_net_to_stands),
-            'orders_today': orders_today,
-        }, status=status.HTTP_200_OK)
 
 
 class StandAdminDashboardView(APIView):
@@ -181,27 +172,14 @@ class StandAdminDashboardView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        start, end = _today_start_end()
-        orders_qs = Order.objects.filter(stand_id=stand_id)
-        orders_today = orders_qs.filter(created_at__gte=start, created_at__lt=end).count()
-        total_sales = orders_qs.aggregate(s=Sum('total_amount'))['s'] or _zero()
-
-        from apps.wallet.models import Wallet
-        stand_admin_wallet = Wallet.objects.filter(user__stand_id=stand_id, user__role=UserRole.STAND_ADMIN).first()
-        if stand_admin_wallet:
-            total_net_received = Transaction.objects.filter(
-                wallet=stand_admin_wallet,
-                transaction_type=TransactionType.CREDIT,
-                order__isnull=False,
-            ).aggregate(s=Sum('amount'))['s'] or _zero()
-        else:
-            total_net_received = _zero()
-
-        return Response({
-            'total_sales': str(total_sales),
-            'total_net_received': str(total_net_received),
-            'orders_today': orders_today,
-        }, status=status.HTTP_200_OK)
+        def build():
+            totals = _rollup_totals(DailySalesRollup.objects.filter(stand_id=stand_id))
+            return {
+                'total_sales': str(totals['total_sales']),
+                'total_net_received': str(totals['total_net']),
+                'orders_today': totals['orders_today'],
+            }
+        return cached_dashboard_response(request, 'standadmin', build, scope=f'stand:{stand_id}')
 
 
 def _last_7_dates():
@@ -211,22 +189,10 @@ def _last_7_dates():
     return [today - timedelta(days=(6 - i)) for i in range(7)]
 
 
-def _sales_chart_orders_qs(user, start, end):
-    """Order queryset for sales chart scoped by role."""
-    qs = Order.objects.filter(created_at__gte=start, created_at__lt=end)
-    if user.role == UserRole.SUPERADMIN:
-        return qs
-    if user.role == UserRole.EVENT_ADMIN and getattr(user, 'organization_id', None):
-        return qs.filter(stand__event__organization_id=user.organization_id)
-    if user.role == UserRole.STAND_ADMIN and getattr(user, 'stand_id', None):
-        return qs.filter(stand_id=user.stand_id)
-    return qs.none()
-
-
 class SalesChartView(APIView):
     """
     GET /api/dashboard/sales-chart/
-    Returns last 7 days (timezone-aware) with TruncDate + Sum aggregation.
+    Returns last 7 days (timezone-aware) from the daily sales rollup.
     Response: [{ "date": "YYYY-MM-DD", "total_sales": float, "commission": float, "net": float }].
     Scope: SUPERADMIN → all orders; EVENT_ADMIN → their organization; STAND_ADMIN → their stand.
     Days with no sales are included with zero values. All numeric values are float.
@@ -251,243 +217,197 @@ class SalesChartView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        tz = timezone.get_current_timezone()
-        last_7 = _last_7_dates()
-        start_dt = timezone.make_aware(
-            datetime.combine(last_7[0], datetime.min.time()),
-            tz,
-        )
-        end_dt = start_dt + timedelta(days=7)
+        return cached_dashboard_response(request, 'sales-chart', lambda: _sales_chart_response(user))
 
-        orders_qs = _sales_chart_orders_qs(user, start_dt, end_dt)
 
-        # Daily total_sales (TruncDate in project timezone)
-        daily_sales = (
-            orders_qs.annotate(date=TruncDate('created_at', tz=tz))
-            .values('date')
-            .annotate(total_sales=Sum('total_amount'))
-            .order_by('date')
-        )
-        sales_by_date = {row['date']: (row['total_sales'] or _zero()) for row in daily_sales}
-
-        # Daily commission (platform wallet CREDIT with order)
-        platform_wallet = get_platform_wallet()
-        daily_commission_qs = (
-            Transaction.objects.filter(
-                wallet=platform_wallet,
-                transaction_type=TransactionType.CREDIT,
-                order__isnull=False,
-            )
-            .filter(order__in=orders_qs)
-            .annotate(date=TruncDate('order__created_at', tz=tz))
-            .values('date')
-            .annotate(commission=Sum('amount'))
-            .order_by('date')
+def _sales_chart_response(user):
+    """Last 7 days of the user's rollup scope, zero-filled."""
+    last_7 = _last_7_dates()
+    daily = (
+        _rollup_qs(user).filter(date__gte=last_7[0], date__lte=last_7[-1])
+        .values('date')
+        .annotate(total_sales=Sum('revenue'), commission=Sum('commission'))
+        .order_by('date')
+    )
+    by_date = {row['date']: row for row in daily}
+
+    # Build response: always 7 days, zero values when no data; decimals as float
+    result = []
+    for d in last_7:
+        row = by_date.get(d, {})
+        total_sales = row.get('total_sales') or _zero()
+        commission = row.get('commission') or _zero()
+        net = total_sales - commission
+        result.append({
+            'date': d.isoformat(),
+            'total_sales': _to_float(total_sales),
+            'commission': _to_float(commission),
+            'net': _to_float(net),
+        })
+    return result
+
+
+def _last_6_months(today):
+    """First day of the last 6 months (oldest first), current month included."""
+    months = []
+    year, month = today.year, today.month
+    for _ in range(6):
+        months.append(date(year, month, 1))
+        month -= 1
+        if month == 0:
+            month, year = 12, year - 1
+    months.reverse()
+    return months
+
+
+def _top(groups, key, name, limit=5):
+    """Fold (org/stand, month) groups into per-key totals; top `limit` by revenue."""
+    totals = {}
+    for g in groups:
+        entry = totals.setdefault(g[key], {'id': g[key], 'name': g[name] or '—', 'revenue': _zero(),
+                                           'commission': _zero(), 'orders': 0})
+        entry['revenue'] += g['revenue_total'] or _zero()
+        entry['commission'] += g['commission_total'] or _zero()
+        entry['orders'] += g['orders_total'] or 0
+    return sorted(totals.values(), key=lambda e: (-e['revenue'], e['id']))[:limit]
+
+
+def _build_financial_overview_response():
+    """
+    Financial overview from one grouped pass over the rollup: rows grouped by (organization, stand, month)
+    with conditional sums for the 30-day windows; totals, windows, top-N and the monthly series are folded
+    from that result set in Python. Plus one COUNT for active users.
+    """
+    today = timezone.localdate()
+    last_30_start = today - timedelta(days=29)
+    prev_30_start = today - timedelta(days=59)
+    last_30 = Q(date__gte=last_30_start, date__lte=today)
+    prev_30 = Q(date__gte=prev_30_start, date__lt=last_30_start)
+
+    groups = list(
+        DailySalesRollup.objects.annotate(month=TruncMonth('date'))
+        .values('organization_id', 'organization__name', 'stand_id', 'stand__name', 'month')
+        .annotate(
+            revenue_total=Sum('revenue'),
+            commission_total=Sum('commission'),
+            orders_total=Sum('orders_count'),
+            revenue_last_30=Sum('revenue', filter=last_30),
+            commission_last_30=Sum('commission', filter=last_30),
+            revenue_prev_30=Sum('revenue', filter=prev_30),
         )
-        commission_by_date = {row['date']: (row['commission'] or _zero()) for row in daily_commission_qs}
-
-        # Build response: always 7 days, zero values when no data; decimals as float
-        result = []
-        for d in last_7:
-            total_sales = sales_by_date.get(d, _zero())
-            commission = commission_by_date.get(d, _zero())
-            net = total_sales - commission
-            result.append({
-                'date': d.isoformat(),
-                'total_sales': _to_float(total_sales),
-                'commission': _to_float(commission),
-                'net': _to_float(net),
-            })
-        return Response(result, status=status.HTTP_200_OK)
-
-
-def _commission_expr():
-    """Expression: total_amount * commission_rate / 100 (use after annotating rate)."""
-    return ExpressionWrapper(
-        F('total_amount') * F('rate') / Value(100),
-        output_field=DecimalField(),
+        .order_by()
     )
 
+    def total(field):
+        return sum((g[field] or _zero() for g in groups), _zero())
+
+    total_revenue = total('revenue_total')
+    total_commission = total('commission_total')
+    total_orders = sum(g['orders_total'] or 0 for g in groups)
+    revenue_last_30 = total('revenue_last_30')
+    commission_last_30 = total('commission_last_30')
+    revenue_prev_30 = total('revenue_prev_30')
+
+    # total_paid_to_stands = total_revenue - total_commission
+    total_paid_to_stands = total_revenue - total_commission
+
+    # Active users: non-deleted
+    active_users = User.objects.filter(is_deleted=False).count()
+
+    # Avg ticket (division by zero handled)
+    avg_ticket = (total_revenue / total_orders) if total_orders else _zero()
+
+    # Growth projection: last 30 days (including today) vs previous 30 days
+    if revenue_prev_30 > 0:
+        growth_percentage = float(
+            (revenue_last_30 - revenue_prev_30) / revenue_prev_30 * Decimal('100')
+        )
+    else:
+        growth_percentage = 100.0 if revenue_last_30 > 0 else 0.0
+
+    projected_annual_revenue = float(revenue_last_30 * 12)
+    projected_annual_commission = float(commission_last_30 * 12)
+
+    top_organizations = [
+        {
+            'id': o['id'],
+            'name': o['name'],
+            'revenue': _to_float(o['revenue']),
+            'commission': _to_float(o['commission']),
+            'orders': o['orders'],
+        }
+        for o in _top(groups, 'organization_id', 'organization__name')
+    ]
+    top_stands = [
+        {
+            'id': st['id'],
+            'name': st['name'],
+            'revenue': _to_float(st['revenue']),
+            'orders': st['orders'],
+        }
+        for st in _top(groups, 'stand_id', 'stand__name')
+    ]
+
+    # Monthly revenue and commission (last 6 months)
+    monthly_map = {}
+    for g in groups:
+        entry = monthly_map.setdefault(g['month'], {'revenue': _zero(), 'commission': _zero()})
+        entry['revenue'] += g['revenue_total'] or _zero()
+        entry['commission'] += g['commission_total'] or _zero()
+    monthly_revenue = [
+        {
+            'month': d.isoformat()[:7],
+            'revenue': _to_float(monthly_map.get(d, {}).get('revenue', _zero())),
+            'commission': _to_float(monthly_map.get(d, {}).get('commission', _zero())),
+        }
+        for d in _last_6_months(today)
+    ]
+
+    return {
+        'total_revenue': _to_float(total_revenue),
+        'total_commission': _to_float(total_commission),
+        'total_paid_to_stands': _to_float(total_paid_to_stands),
+        'total_orders': total_orders,
+        'active_users': active_users,
+        'avg_ticket': _to_float(avg_ticket),
+        'revenue_last_30': round(float(revenue_last_30), 2),
+        'commission_last_30': round(float(commission_last_30), 2),
+        'revenue_prev_30': round(float(revenue_prev_30), 2),
+        'growth_percentage': round(growth_percentage, 2),
+        'projected_annual_revenue': round(projected_annual_revenue, 2),
+        'projected_annual_commission': round(projected_annual_commission, 2),
+        'top_organizations': top_organizations,
+        'top_stands': top_stands,
+        'monthly_revenue': monthly_revenue,
+    }
+
 
 class FinancialOverviewView(APIView):
     """
     GET /api/dashboard/financial-overview/
-    SUPERADMIN only. Aggregated financial and operational metrics.
-    Commission derived from Organization.commission_rate. total_paid_to_stands = total_revenue - total_commission.
+    SUPERADMIN only. Aggregated financial and operational metrics, read from the daily sales rollup
+    in two queries (see _build_financial_overview_response).
+    Commission is the amount recorded at completion. total_paid_to_stands = total_revenue - total_commission.
     """
     permission_classes = [IsAuthenticated, IsSuperAdmin]
 
     def get(self, request):
-        tz = timezone.get_current_timezone()
-
-        # Base queryset with org commission_rate for commission math
-        orders_with_rate = Order.objects.select_related(
-            'stand__event__organization',
-        ).annotate(
-            rate=Coalesce(F('stand__event__organization__commission_rate'), Value(0)),
-        )
-
-        # Totals: revenue, orders, commission (from Organization.commission_rate)
-        order_agg = orders_with_rate.aggregate(
-            total_revenue=Sum('total_amount'),
-            total_orders=Count('id'),
-            total_commission=Sum(_commission_expr()),
-        )
-        total_revenue = order_agg['total_revenue'] or _zero()
-        total_orders = order_agg['total_orders'] or 0
-        total_commission = order_agg['total_commission'] or _zero()
-
-        # total_paid_to_stands = total_revenue - total_commission
-        total_paid_to_stands = total_revenue - total_commission
-
-        # Active users: non-deleted
-        active_users = User.objects.filter(is_deleted=False).count()
-
-        # Avg ticket (division by zero handled)
-        avg_ticket = (total_revenue / total_orders) if total_orders else _zero()
-
-        # Growth projection: last 30 days vs previous 30 days (optimized: two filtered aggregates)
-        now = timezone.now()
-        last_30_end = now
-        last_30_start = now - timedelta(days=30)
-        prev_30_start = now - timedelta(days=60)
-
-        last_30_agg = orders_with_rate.filter(
-            created_at__gte=last_30_start,
-            created_at__lt=last_30_end,
-        ).aggregate(
-            revenue=Sum('total_amount'),
-            commission=Sum(_commission_expr()),
-        )
-        revenue_last_30 = last_30_agg['revenue'] or _zero()
-        commission_last_30 = last_30_agg['commission'] or _zero()
-
-        prev_30_agg = orders_with_rate.filter(
-            created_at__gte=prev_30_start,
-            created_at__lt=last_30_start,
-        ).aggregate(revenue=Sum('total_amount'))
-        revenue_prev_30 = prev_30_agg['revenue'] or _zero()
-
-        if revenue_prev_30 > 0:
-            growth_percentage = float(
-                (revenue_last_30 - revenue_prev_30) / revenue_prev_30 * Decimal('100')
-            )
-        else:
-            growth_percentage = 100.0 if revenue_last_30 > 0 else 0.0
-
-        projected_annual_revenue = float(revenue_last_30 * 12)
-        projected_annual_commission = float(commission_last_30 * 12)
-
-        # Top organizations: limit 5 by revenue; commission from commission_rate
-        top_orgs_qs = (
-            orders_with_rate.filter(stand__event__organization__isnull=False)
-            .values('stand__event__organization_id', 'stand__event__organization__name')
-            .annotate(
-                revenue=Sum('total_amount'),
-                commission=Sum(_commission_expr()),
-                orders=Count('id'),
-            )
-            .order_by('-revenue')[:5]
-        )
-        top_organizations = [
-            {
-                'id': r['stand__event__organization_id'],
-                'name': r['stand__event__organization__name'] or '—',
-                'revenue': _to_float(r['revenue']),
-                'commission': _to_float(r['commission'] or _zero()),
-                'orders': r['orders'],
-            }
-            for r in top_orgs_qs
-        ]
-
-        # Top stands: limit 5 by revenue
-        top_stands_qs = (
-            Order.objects.values('stand_id', 'stand__name')
-            .annotate(revenue=Sum('total_amount'), orders=Count('id'))
-            .order_by('-revenue')[:5]
-        )
-        top_stands = [
-            {
-                'id': r['stand_id'],
-                'name': r['stand__name'] or '—',
-                'revenue': _to_float(r['revenue']),
-                'orders': r['orders'],
-            }
-            for r in top_stands_qs
-        ]
-
-        # Monthly revenue and commission (last 6 months); commission from commission_rate
-        from datetime import date
-        start_month = timezone.now().astimezone(tz).date().replace(day=1)
-        months_data = []
-        for i in range(6):
-            year = start_month.year
-            month = start_month.month - i
-            if month <= 0:
-                month += 12
-                year -= 1
-            months_data.append(date(year, month, 1))
-        months_data.reverse()
-
-        def _month_key(d):
-            return d.date() if hasattr(d, 'date') else d
-
-        monthly_qs = (
-            orders_with_rate.annotate(month=TruncMonth('created_at', tz=tz))
-            .values('month')
-            .annotate(
-                revenue=Sum('total_amount'),
-                commission=Sum(_commission_expr()),
-            )
-            .order_by('month')
-        )
-        monthly_map = {
-            _month_key(r['month']): {
-                'revenue': r['revenue'] or _zero(),
-                'commission': r['commission'] or _zero(),
-            }
-            for r in monthly_qs
-        }
-
-        monthly_revenue = [
-            {
-                'month': d.isoformat()[:7],
-                'revenue': _to_float(monthly_map.get(d, {}).get('revenue', _zero())),
-                'commission': _to_float(monthly_map.get(d, {}).get('commission', _zero())),
-            }
-            for d in months_data
-        ]
-
-        return Response({
-            'total_revenue': _to_float(total_revenue),
-            'total_commission': _to_float(total_commission),
-            'total_paid_to_stands': _to_float(total_paid_to_stands),
-            'total_orders': total_orders,
-            'active_users': active_users,
-            'avg_ticket': _to_float(avg_ticket),
-            'revenue_last_30': round(float(revenue_last_30), 2),
-            'commission_last_30': round(float(commission_last_30), 2),
-            'revenue_prev_30': round(float(revenue_prev_30), 2),
-            'growth_percentage': round(growth_percentage, 2),
-            'projected_annual_revenue': round(projected_annual_revenue, 2),
-            'projected_annual_commission': round(projected_annual_commission, 2),
-            'top_organizations': top_organizations,
-            'top_stands': top_stands,
-            'monthly_revenue': monthly_revenue,
-        }, status=status.HTTP_200_OK)
+        return cached_dashboard_response(request, 'financial-overview', _build_financial_overview_response)
 
 
+@method_decorator(db_transaction.non_atomic_requests, name='dispatch')
 class ProjectStatusView(APIView):
     """
     GET /api/dashboard/project-status/
     SuperAdmin only. Static comparison: original vision vs implemented vs pending.
     Returns core_features plus computed: total_features, implemented_features, pending_features,
     completion_percentage, maturity_level. Internal strategic overview; not public.
+    Served pre-rendered (built at startup) with ETag / If-None-Match.
     """
     permission_classes = [IsAuthenticated, IsSuperAdmin]
 
     def get(self, request):
-        return Response(_build_project_status_response(), status=status.HTTP_200_OK)
+        return PROJECT_STATUS_PAYLOAD.response(request)
 
 
 def _readiness_level(score):
@@ -506,7 +426,6 @@ def _build_investor_readiness_response():
     Build investor readiness payload. Uses project status for maturity;
     financial/audit/concurrency are implemented; deployment from env or Local.
     """
-    import os
     status_data = _build_project_status_response()
     maturity_pct = status_data['completion_percentage']
     audit_active = True
@@ -570,13 +489,19 @@ def _build_investor_readiness_response():
     }
 
 
+# Static payloads: only change on deploy (code or DEPLOYMENT_STATUS), rendered by DashboardConfig.ready().
+PROJECT_STATUS_PAYLOAD = PrerenderedJSON(_build_project_status_response)
+INVESTOR_READINESS_PAYLOAD = PrerenderedJSON(_build_investor_readiness_response)
+
+
+@method_decorator(db_transaction.non_atomic_requests, name='dispatch')
 class InvestorReadinessView(APIView):
     """
     GET /api/dashboard/investor-readiness/
     SuperAdmin only. Investor readiness overview, business model, risk assessment, weighted score.
-    Pitch-ready internal dashboard.
+    Pitch-ready internal dashboard. Served pre-rendered (built at startup) with ETag / If-None-Match.
     """
     permission_classes = [IsAuthenticated, IsSuperAdmin]
 
     def get(self, request):
-        return Response(_build_investor_readiness_response(), status=status.HTTP_200_OK)
+        return INVESTOR_READINESS_PAYLOAD.response(request)
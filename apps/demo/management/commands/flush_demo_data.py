@@ -0,0 +1,29 @@
+"""
+Delete all demo-generated orders and reverse their wallet impact, in batches (see apps.demo.services.flush).
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.demo.services import flush_demo_orders
+from apps.demo.services.flush import FLUSH_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Flush demo orders with set-based wallet reversal, reporting progress per batch.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=FLUSH_BATCH_SIZE, help='Orders per transaction.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+
+        def progress(processed, total):
+            self.stdout.write(f'{processed}/{total} demo orders processed')
+
+        result = flush_demo_orders(batch_size=options['batch_size'], progress=progress)
+        for error in result['errors']:
+            self.stderr.write(error)
+        self.stdout.write(
+            f'Deleted {result["orders_deleted"]} demo orders, reversed {result["transactions_reversed"]} '
+            f'transactions across {result["wallets_updated"]} wallets.'
+        )
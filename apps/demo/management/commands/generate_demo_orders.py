@@ -0,0 +1,39 @@
+"""
+Bulk-generate COMPLETED demo orders (items, audit logs, wallet transactions and balances) for load
+testing. Deterministic for a given --seed over the same users, stands and products.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.demo.services import generate_demo_orders
+from apps.demo.services.bulk_generator import BULK_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Generate demo orders in bulk (one unnest INSERT per table and batch), ledger-consistent.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=100_000)
+        parser.add_argument('--seed', type=int, help='Random seed (default: random, printed).')
+        parser.add_argument('--days', type=int, default=30, help='Spread orders over the last N days.')
+        parser.add_argument(
+            '--batch-size', type=int, default=BULK_BATCH_SIZE,
+            help='Orders per transaction (also bounds how long a batch holds its locks).',
+        )
+
+    def handle(self, *args, **options):
+        if options['orders'] < 1 or options['batch_size'] < 1 or options['days'] < 0:
+            raise CommandError('--orders and --batch-size must be positive, --days not negative.')
+        start = time.perf_counter()
+        result = generate_demo_orders(
+            options['orders'], seed=options['seed'], days=options['days'], batch_size=options['batch_size'],
+        )
+        if not result['orders_created']:
+            raise CommandError('Need at least one USER and one Stand with products to generate demo orders.')
+        self.stdout.write(
+            f'Created {result["orders_created"]} orders, {result["items_created"]} items, '
+            f'{result["transactions_created"]} transactions (seed {result["seed"]}) '
+            f'in {time.perf_counter() - start:.1f}s; revenue {result["total_generated_revenue"]}, '
+            f'commission {result["total_commission_generated"]}.'
+        )
@@ -0,0 +1,4 @@
+from .bulk_generator import DEMO_ORDER_NOTES, generate_demo_orders
+from .flush import flush_demo_orders
+
+__all__ = ['DEMO_ORDER_NOTES', 'generate_demo_orders', 'flush_demo_orders']
@@ -0,0 +1,219 @@
+"""
+Bulk demo data generator for load testing (dashboards, reconciliation, exports).
+Orders, items, audit logs and wallet transactions are built in memory as row tuples and written with
+one array-parameter INSERT per table, batch_size orders per database transaction. Each batch also
+applies its wallet balance deltas (wallets locked in pk order, one UPDATE) and its LedgerTotals delta,
+so every committed batch is ledger-consistent. The daily sales rollup is rebuilt for the generated days at the end.
+Each batch first locks the products it sells and then every wallet it references (buyers included), each in pk
+order, the same order checkout uses. Its deferred FK checks at commit then need no lock it does not already hold,
+so it can run against live checkouts without deadlocking them; checkouts on those products and wallets wait for
+the batch instead (a smaller batch_size shortens the wait).
+Same data model as the per-order generator: buyer credit ('Demo seed') + debit of the order total,
+stand admin credited the net, platform commission sub-wallet credited the commission.
+Choices come from random.Random(seed): the same seed over the same users/stands/products
+generates the same orders.
+"""
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction as db_transaction
+from django.utils import timezone
+
+from apps.audit.models import FinancialAuditLog
+from apps.dashboard.services.sales_rollup import rebuild_sales_rollup
+from apps.orders.models import Order, OrderItem, OrderStatus
+from apps.stands.models import Product, Stand
+from apps.users.models import User, UserRole
+from apps.wallet.models import (
+    Transaction,
+    TransactionType,
+    Wallet,
+    get_commission_wallet_id,
+    get_platform_shard_count,
+    get_platform_wallet_id,
+    lock_wallets,
+    record_ledger_delta,
+)
+from .bulk_writes import apply_wallet_deltas, insert_rows
+
+DEMO_ORDER_NOTES = 'Demo generated'
+BULK_BATCH_SIZE = 5000
+
+
+class _Catalog:
+    """Users, stands, products, stand admins and wallet ids the generator draws from (read once)."""
+
+    def __init__(self):
+        self.user_ids = list(
+            User.objects.filter(role=UserRole.USER, is_deleted=False).order_by('id').values_list('id', flat=True)
+        )
+        products = {}
+        for stand_id, product_id, price in (
+            Product.objects.filter(stand__event__isnull=False, price__isnull=False)
+            .order_by('stand_id', 'id').values_list('stand_id', 'id', 'price')
+        ):
+            products.setdefault(stand_id, []).append((product_id, price))
+        self.stands = []
+        for stand_id, event_id, organization_id, rate in (
+            Stand.objects.filter(pk__in=products).order_by('id')
+            .values_list('id', 'event_id', 'event__organization_id', 'event__organization__commission_rate')
+        ):
+            self.stands.append((stand_id, event_id, organization_id, rate or Decimal('0'), products[stand_id]))
+
+        # First STAND_ADMIN by pk, as reconcile_order picks it.
+        self.stand_admin = {}
+        for stand_id, admin_id in (
+            User.objects.filter(role=UserRole.STAND_ADMIN, stand_id__in=products)
+            .order_by('stand_id', 'id').values_list('stand_id', 'id')
+        ):
+            self.stand_admin.setdefault(stand_id, admin_id)
+
+        wallet_users = set(self.user_ids) | set(self.stand_admin.values())
+        existing = set(Wallet.objects.filter(user_id__in=wallet_users).values_list('user_id', flat=True))
+        Wallet.objects.bulk_create(
+            [Wallet(user_id=user_id, balance=Decimal('0.00')) for user_id in sorted(wallet_users - existing)],
+            ignore_conflicts=True,
+        )
+        self.wallet_of = dict(Wallet.objects.filter(user_id__in=wallet_users).values_list('user_id', 'id'))
+
+
+def _draw_order(rng, catalog, now, days):
+    """One random order: (user_id, stand, [(product_id, unit_price, qty)], total, created_at)."""
+    user_id = rng.choice(catalog.user_ids)
+    stand = rng.choice(catalog.stands)
+    products = stand[4]
+    chosen = rng.sample(products, rng.randint(1, min(3, len(products))))
+    items = [(product_id, price, rng.randint(1, 3)) for product_id, price in chosen]
+    total = sum((price * qty for _, price, qty in items), Decimal('0.00')).quantize(Decimal('0.01'))
+    created_at = now - timedelta(days=rng.randint(0, days), seconds=rng.randint(0, 86400))
+    return user_id, stand, items, total, created_at
+
+
+def _lock_batch_rows(drawn, catalog):
+    """Lock the batch's products, then every wallet it may touch, each in pk order (as checkout does)."""
+    product_ids = {product_id for _, _, items, _, _ in drawn for product_id, _, _ in items}
+    list(Product.objects.filter(pk__in=product_ids).order_by('pk').select_for_update().values_list('pk', flat=True))
+    wallet_ids = {catalog.wallet_of[user_id] for user_id, _, _, _, _ in drawn}
+    for _, stand, _, _, _ in drawn:
+        admin_id = catalog.stand_admin.get(stand[0])
+        if admin_id:
+            wallet_ids.add(catalog.wallet_of[admin_id])
+    if any(stand[3] > 0 for _, stand, _, _, _ in drawn):
+        wallet_ids.update(get_platform_wallet_id(shard) for shard in range(get_platform_shard_count()))
+    lock_wallets(wallet_ids)
+
+
+def _write_batch(drawn, catalog):
+    """Insert one batch of drawn orders with everything that depends on them; returns counters."""
+    now = timezone.now()
+    credit, debit = TransactionType.CREDIT, TransactionType.DEBIT
+    with db_transaction.atomic():
+        _lock_batch_rows(drawn, catalog)
+        order_ids = insert_rows(
+            Order,
+            ['user_id', 'stand_id', 'event_id', 'organization_id', 'status', 'total_amount', 'notes', 'is_reversed',
+             'created_at', 'updated_at'],
+            [
+                (user_id, stand[0], stand[1], stand[2], OrderStatus.COMPLETED, total, DEMO_ORDER_NOTES, False,
+                 created_at, created_at)
+                for user_id, stand, _, total, created_at in drawn
+            ],
+            returning_id=True,
+        )
+
+        items, logs, txs = [], [], []
+        deltas = {}
+        credits = debits = commission_total = Decimal('0.00')
+        for order_id, (user_id, stand, order_items, total, _) in zip(order_ids, drawn):
+            stand_id, event_id, organization_id, rate, _ = stand
+            commission = (total * rate / Decimal('100')).quantize(Decimal('0.01'))
+            net = (total - commission).quantize(Decimal('0.01'))
+            commission_total += commission
+            items.extend(
+                (order_id, product_id, qty, price, now, now) for product_id, price, qty in order_items
+            )
+            logs.append((order_id, total, commission, net, organization_id, event_id, stand_id, user_id, now))
+
+            buyer_wallet = catalog.wallet_of[user_id]
+            txs.append((buyer_wallet, total, credit, order_id, 'Demo seed', now, now))
+            txs.append((buyer_wallet, total, debit, order_id, f'Order #{order_id}', now, now))
+            credits += total
+            debits += total
+            admin_id = catalog.stand_admin.get(stand_id)
+            if admin_id and admin_id != user_id and net > 0:
+                admin_wallet = catalog.wallet_of[admin_id]
+                txs.append((admin_wallet, net, credit, order_id, f'Order #{order_id} (net)', now, now))
+                deltas[admin_wallet] = deltas.get(admin_wallet, Decimal('0.00')) + net
+                credits += net
+            if commission > 0:
+                platform_wallet = get_commission_wallet_id(order_id)
+                txs.append((platform_wallet, commission, credit, order_id, f'Order #{order_id} (commission)', now, now))
+                deltas[platform_wallet] = deltas.get(platform_wallet, Decimal('0.00')) + commission
+                credits += commission
+
+        insert_rows(
+            OrderItem, ['order_id', 'product_id', 'quantity', 'unit_price', 'created_at', 'updated_at'], items,
+        )
+        insert_rows(
+            FinancialAuditLog,
+            ['order_id', 'total_amount', 'commission_amount', 'net_amount', 'organization_id', 'event_id',
+             'stand_id', 'user_id', 'created_at'],
+            logs,
+        )
+        insert_rows(
+            Transaction,
+            ['wallet_id', 'amount', 'transaction_type', 'order_id', 'description', 'created_at', 'updated_at'],
+            txs,
+        )
+        apply_wallet_deltas(deltas, lock=False)
+        record_ledger_delta(credit=credits, debit=debits)
+
+    return {
+        'items': len(items),
+        'transactions': len(txs),
+        'revenue': sum((total for _, _, _, total, _ in drawn), Decimal('0.00')),
+        'commission': commission_total,
+    }
+
+
+def generate_demo_orders(n_orders, seed=None, days=30, batch_size=BULK_BATCH_SIZE):
+    """
+    Generate n_orders COMPLETED demo orders spread over the last `days` days.
+    Returns orders_created, items_created, transactions_created, total_generated_revenue,
+    total_commission_generated (Decimals) and seed. Nothing is created when there is no USER
+    or no stand with products.
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    result = {
+        'orders_created': 0,
+        'items_created': 0,
+        'transactions_created': 0,
+        'total_generated_revenue': Decimal('0.00'),
+        'total_commission_generated': Decimal('0.00'),
+        'seed': seed,
+    }
+    catalog = _Catalog()
+    if not catalog.user_ids or not catalog.stands:
+        return result
+
+    rng = random.Random(seed)
+    now = timezone.now()
+    for start in range(0, n_orders, batch_size):
+        drawn = [_draw_order(rng, catalog, now, days) for _ in range(min(batch_size, n_orders - start))]
+        drawn = [order for order in drawn if order[3] > 0]
+        if not drawn:
+            continue
+        written = _write_batch(drawn, catalog)
+        result['orders_created'] += len(drawn)
+        result['items_created'] += written['items']
+        result['transactions_created'] += written['transactions']
+        result['total_generated_revenue'] += written['revenue']
+        result['total_commission_generated'] += written['commission']
+
+    if result['orders_created']:
+        rebuild_sales_rollup(
+            start=timezone.localdate(now - timedelta(days=days + 1)), end=timezone.localdate(now),
+        )
+    return result
@@ -0,0 +1,49 @@
+"""
+Set-based writes shared by the bulk demo generator and the demo flush.
+"""
+from django.db import connection
+from django.utils import timezone
+
+from apps.wallet.models import Wallet, lock_wallets
+
+
+def insert_rows(model, columns, rows, returning_id=False):
+    """
+    INSERT rows (tuples in `columns` order) as one statement with one array parameter per column:
+    INSERT ... SELECT FROM unnest(...). Skips bulk_create's per-row SQL compilation, which dominates
+    at millions of rows. Returns the new ids in row order when returning_id.
+    """
+    if not rows:
+        return []
+    quote = connection.ops.quote_name
+    fields = [model._meta.get_field(name) for name in columns]
+    names = ', '.join(quote(field.column) for field in fields)
+    arrays = ', '.join(f'%s::{field.db_type(connection)}[]' for field in fields)
+    sql = (
+        f'INSERT INTO {quote(model._meta.db_table)} ({names}) '
+        f'SELECT {names} FROM unnest({arrays}) WITH ORDINALITY AS v({names}, n) ORDER BY n'
+    )
+    if returning_id:
+        sql += f' RETURNING {quote(model._meta.pk.column)}'
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [list(column) for column in zip(*rows)])
+        return [row[0] for row in cursor.fetchall()] if returning_id else []
+
+
+def apply_wallet_deltas(deltas, lock=True):
+    """
+    Add {wallet_id: delta} to balances in one UPDATE, wallets locked in pk order first
+    (lock=False when the caller already holds them).
+    """
+    if not deltas:
+        return
+    if lock:
+        lock_wallets(deltas)
+    ids = sorted(deltas)
+    table = connection.ops.quote_name(Wallet._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'UPDATE {table} AS w SET balance = w.balance + v.delta, updated_at = %s '
+            f'FROM unnest(%s::bigint[], %s::numeric[]) AS v(id, delta) WHERE w.id = v.id',
+            [timezone.now(), ids, [deltas[wallet_id] for wallet_id in ids]],
+        )
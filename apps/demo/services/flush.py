@@ -0,0 +1,133 @@
+"""
+Set-based flush of demo-generated orders (notes='Demo generated').
+Orders are processed in id batches, one transaction each: the batch's orders are locked, per-wallet net
+deltas come from one grouped query over their transactions, the wallets are locked once in pk order and
+updated with one UPDATE, and the compensating transactions are written with one INSERT ... SELECT
+(transactions are immutable, so the ledger keeps both sides). LedgerTotals and the daily sales rollup
+are adjusted, then the orders are deleted (items and audit logs cascade).
+A batch that would leave a wallet negative is skipped as a whole and reported in errors.
+"""
+from decimal import Decimal
+
+from django.db import connection, transaction as db_transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from apps.audit.models import FinancialAuditLog
+from apps.dashboard.services.sales_rollup import order_scope_annotations, record_sales
+from apps.orders.models import Order
+from apps.wallet.models import Transaction, TransactionType, lock_wallets, record_ledger_delta
+from .bulk_generator import DEMO_ORDER_NOTES
+from .bulk_writes import apply_wallet_deltas
+
+FLUSH_BATCH_SIZE = 5000
+
+
+def _insert_compensating_transactions(order_ids):
+    """One opposite-type transaction per transaction of order_ids; returns how many were written."""
+    table = connection.ops.quote_name(Transaction._meta.db_table)
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} '
+            f'(wallet_id, amount, transaction_type, order_id, description, created_at, updated_at) '
+            f'SELECT wallet_id, amount, CASE WHEN transaction_type = %s THEN %s ELSE %s END, NULL, '
+            f"'Reversal demo order #' || order_id, %s, %s "
+            f'FROM {table} WHERE order_id = ANY(%s) ORDER BY id',
+            [TransactionType.CREDIT, TransactionType.DEBIT, TransactionType.CREDIT, now, now, list(order_ids)],
+        )
+        return cursor.rowcount
+
+
+def _remove_from_rollup(order_ids):
+    """Subtract the (not reversed) orders from the daily sales rollup, one upsert per (day, stand)."""
+    groups = (
+        FinancialAuditLog.objects.filter(order_id__in=order_ids, order__is_reversed=False)
+        .annotate(day=TruncDate('order__created_at', tz=timezone.get_current_timezone()), **order_scope_annotations())
+        .values('day', 'order__stand_id', 'scope_event_id', 'scope_organization_id')
+        .annotate(
+            revenue=Sum('total_amount'),
+            commission=Sum('commission_amount'),
+            net=Sum('net_amount'),
+            orders=Count('id'),
+        )
+        .order_by()
+    )
+    for g in groups:
+        record_sales(
+            g['day'],
+            g['scope_organization_id'],
+            g['scope_event_id'],
+            g['order__stand_id'],
+            -g['revenue'],
+            -g['commission'],
+            -g['net'],
+            orders=-g['orders'],
+        )
+
+
+def _flush_batch(order_ids):
+    """Reverse and delete one batch of (locked) orders. Returns (transactions_reversed, wallets_updated)."""
+    zero = Decimal('0.00')
+    per_wallet = (
+        Transaction.objects.filter(order_id__in=order_ids)
+        .values('wallet_id')
+        .annotate(
+            credits=Sum('amount', filter=Q(transaction_type=TransactionType.CREDIT)),
+            debits=Sum('amount', filter=Q(transaction_type=TransactionType.DEBIT)),
+        )
+        .order_by()
+    )
+    # Reversal: credits come back out of the wallet, debits are refunded.
+    deltas = {row['wallet_id']: (row['debits'] or zero) - (row['credits'] or zero) for row in per_wallet}
+    wallets = lock_wallets(deltas)
+    for wallet_id in sorted(deltas):
+        balance = wallets[wallet_id].balance
+        if balance + deltas[wallet_id] < 0:
+            raise ValueError(f'Wallet {wallet_id} balance {balance} < {-deltas[wallet_id]} for reversal')
+
+    changed = {wallet_id: delta for wallet_id, delta in deltas.items() if delta}
+    apply_wallet_deltas(changed, lock=False)
+    reversed_count = _insert_compensating_transactions(order_ids)
+    credits = sum((row['credits'] or zero for row in per_wallet), zero)
+    debits = sum((row['debits'] or zero for row in per_wallet), zero)
+    record_ledger_delta(credit=debits, debit=credits)
+    _remove_from_rollup(order_ids)
+    Order.objects.filter(id__in=order_ids).delete()
+    return reversed_count, len(changed)
+
+
+def flush_demo_orders(batch_size=FLUSH_BATCH_SIZE, progress=None):
+    """
+    Delete every demo-generated order and reverse its wallet impact, batch_size orders per transaction.
+    progress(processed, total) is called after each batch. Returns orders_deleted,
+    transactions_reversed, wallets_updated and errors (one message per skipped batch).
+    """
+    total = Order.objects.filter(notes=DEMO_ORDER_NOTES).count()
+    result = {'orders_deleted': 0, 'transactions_reversed': 0, 'wallets_updated': 0, 'errors': []}
+    processed = 0
+    after_id = 0
+    while True:
+        with db_transaction.atomic():
+            order_ids = list(
+                Order.objects.select_for_update()
+                .filter(notes=DEMO_ORDER_NOTES, id__gt=after_id)
+                .order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not order_ids:
+                break
+            after_id = order_ids[-1]
+            try:
+                with db_transaction.atomic():
+                    reversed_count, wallets_updated = _flush_batch(order_ids)
+            except ValueError as e:
+                result['errors'].append(f'Orders #{order_ids[0]}-#{order_ids[-1]}: {e}')
+            else:
+                result['orders_deleted'] += len(order_ids)
+                result['transactions_reversed'] += reversed_count
+                result['wallets_updated'] += wallets_updated
+        processed += len(order_ids)
+        if progress:
+            progress(processed, total)
+    return result
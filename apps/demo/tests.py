@@ -0,0 +1,184 @@
+"""
+Demo data tests: bulk generator consistency and determinism, and the bulk API option.
+"""
+import re
+from decimal import Decimal
+
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from rest_framework.test import APIClient
+
+from apps.users.models import User, UserRole
+from apps.organizations.models import Organization
+from apps.events.models import Event
+from apps.stands.models import Stand, Product
+from apps.orders.models import Order, OrderItem
+from apps.orders.services.checkout import create_order_with_payment
+from apps.audit.models import FinancialAuditLog
+from apps.audit.services.financial_audit import reconcile_orders, verify_global_balance
+from apps.dashboard.models import DailySalesRollup
+from apps.demo.services import DEMO_ORDER_NOTES, flush_demo_orders, generate_demo_orders
+from apps.wallet.models import Transaction, Wallet, clear_platform_wallet_cache
+
+
+class DemoFixtureMixin:
+    """Two stands with admins, three buyers, a superadmin."""
+
+    def setUp(self):
+        clear_platform_wallet_cache()
+        org = Organization.objects.create(name='DemoOrg', commission_rate=Decimal('12.50'))
+        event = Event.objects.create(name='DemoEv', organization=org)
+        self.stand = Stand.objects.create(name='DemoSt', event=event)
+        self.lone_stand = Stand.objects.create(name='LoneSt', event=event)
+        for i, price in enumerate(('3.30', '7.15', '12.00')):
+            Product.objects.create(stand=self.stand, name=f'P{i}', price=Decimal(price), stock_quantity=100)
+        Product.objects.create(stand=self.lone_stand, name='L', price=Decimal('4.99'), stock_quantity=100)
+        User.objects.create_user(username='demo_admin', role=UserRole.STAND_ADMIN, stand=self.stand)
+        User.objects.create_user(username='lone_admin', role=UserRole.STAND_ADMIN, stand=self.lone_stand)
+        for i in range(3):
+            User.objects.create_user(username=f'demo_buyer_{i}', role=UserRole.USER)
+        self.superadmin = User.objects.create_user(username='demo_super', role=UserRole.SUPERADMIN)
+
+
+def _order_shapes(orders):
+    return [
+        (o.user_id, o.stand_id, o.total_amount, sorted(o.items.values_list('product_id', 'quantity', 'unit_price')))
+        for o in orders.order_by('id')
+    ]
+
+
+class BulkGeneratorTests(DemoFixtureMixin, TestCase):
+    """Test generated data is ledger-consistent, reconciles, feeds the rollup and is reproducible."""
+
+    def test_generated_orders_are_consistent(self):
+        result = generate_demo_orders(250, seed=42, batch_size=100)
+        self.assertEqual(result['orders_created'], 250)
+        orders = Order.objects.filter(notes=DEMO_ORDER_NOTES)
+        self.assertEqual(orders.count(), 250)
+        self.assertEqual(OrderItem.objects.filter(order__in=orders).count(), result['items_created'])
+        self.assertEqual(FinancialAuditLog.objects.filter(order__in=orders).count(), 250)
+        self.assertGreater(orders.values('created_at__date').distinct().count(), 1)
+
+        balance = verify_global_balance(full=True)
+        self.assertEqual(balance['difference'], 0)
+        self.assertEqual(balance['drift'], {'wallet_total': 0.0, 'ledger_total': 0.0})
+        self.assertEqual(reconcile_orders()['inconsistencies_found'], 0)
+
+        revenue = DailySalesRollup.objects.aggregate(s=Sum('revenue'))['s']
+        self.assertEqual(revenue, result['total_generated_revenue'])
+        self.assertEqual(orders.aggregate(s=Sum('total_amount'))['s'], revenue)
+        admin_wallet = Wallet.objects.get(user__username='demo_admin')
+        self.assertGreater(admin_wallet.balance, 0)
+
+    def test_same_seed_same_orders(self):
+        generate_demo_orders(40, seed=7, batch_size=15)
+        first = _order_shapes(Order.objects.all())
+        last_id = Order.objects.order_by('-id').values_list('id', flat=True).first()
+        generate_demo_orders(40, seed=7, batch_size=25)
+        self.assertEqual(_order_shapes(Order.objects.filter(id__gt=last_id)), first)
+
+    def test_batch_locks_products_and_every_wallet_before_inserting(self):
+        with CaptureQueriesContext(connection) as ctx:
+            generate_demo_orders(30, seed=4, batch_size=30)
+        statements = [q['sql'] for q in ctx.captured_queries]
+        first_insert = next(i for i, sql in enumerate(statements) if sql.startswith('INSERT INTO "orders_order"'))
+        locks = [sql for sql in statements[:first_insert] if sql.endswith('FOR UPDATE')]
+        self.assertEqual(len(locks), 2)
+        self.assertIn('"stands_product"', locks[0])
+        self.assertIn('"wallet_wallet"', locks[1])
+        locked = {int(pk) for pk in re.search(r'IN \(([^)]*)\)', locks[1]).group(1).split(', ')}
+        buyer_wallets = Wallet.objects.filter(user__orders__notes=DEMO_ORDER_NOTES).values_list('id', flat=True)
+        self.assertLessEqual(set(buyer_wallets), locked)
+        self.assertIn(Wallet.objects.get(user__username='demo_admin').id, locked)
+
+    def test_nothing_to_generate_without_buyers(self):
+        User.objects.filter(role=UserRole.USER).delete()
+        result = generate_demo_orders(10, seed=1)
+        self.assertEqual(result['orders_created'], 0)
+        self.assertFalse(Order.objects.exists())
+
+
+class DemoGenerateBulkViewTests(DemoFixtureMixin, TestCase):
+    """Test the bulk option of POST /api/demo/generate/."""
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.superadmin)
+
+    def test_bulk_generate(self):
+        # Batches must commit on their own, not as savepoints of one request transaction.
+        self.assertIn('default', getattr(resolve('/api/demo/generate/').func, '_non_atomic_requests', set()))
+        response = self.client.post('/api/demo/generate/', {'bulk': True, 'orders': 30, 'seed': 3}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['orders_created'], 30)
+        self.assertEqual(response.data['seed'], 3)
+        self.assertEqual(Order.objects.count(), 30)
+        self.assertEqual(verify_global_balance()['difference'], 0)
+
+    def test_bulk_generate_validates_input(self):
+        for payload in ({'bulk': True, 'orders': 'many'}, {'bulk': True, 'orders': 0}, {'bulk': True, 'days': -1}):
+            response = self.client.post('/api/demo/generate/', payload, format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('detail', response.data)
+        self.assertFalse(Order.objects.exists())
+
+
+class FlushDemoOrdersTests(DemoFixtureMixin, TestCase):
+    """Test the set-based flush restores balances, keeps the ledger and rollup consistent, and skips unsafe batches."""
+
+    def setUp(self):
+        super().setUp()
+        self.buyer = User.objects.get(username='demo_buyer_0')
+        Wallet.objects.get(user=self.buyer).credit(Decimal('100.00'), description='Seed')
+        product = Product.objects.filter(stand=self.stand).first()
+        self.real_order = create_order_with_payment(
+            user=self.buyer, stand=self.stand, items=[{'product': product.pk, 'quantity': 1}],
+        )
+        self.balances = dict(Wallet.objects.values_list('id', 'balance'))
+        self.revenue = DailySalesRollup.objects.aggregate(s=Sum('revenue'))['s']
+
+    def test_flush_restores_state(self):
+        generate_demo_orders(120, seed=5, batch_size=50)
+        tx_count = Transaction.objects.filter(order__notes=DEMO_ORDER_NOTES).count()
+        seen = []
+        result = flush_demo_orders(batch_size=50, progress=lambda done, total: seen.append((done, total)))
+
+        self.assertEqual(result['orders_deleted'], 120)
+        self.assertEqual(result['transactions_reversed'], tx_count)
+        self.assertEqual(result['errors'], [])
+        self.assertEqual(seen, [(50, 120), (100, 120), (120, 120)])
+        self.assertEqual(list(Order.objects.values_list('id', flat=True)), [self.real_order.id])
+        self.assertEqual(dict(Wallet.objects.values_list('id', 'balance')), self.balances)
+        self.assertEqual(Transaction.objects.filter(description__startswith='Reversal demo order #').count(), tx_count)
+        balance = verify_global_balance(full=True)
+        self.assertEqual(balance['difference'], 0)
+        self.assertEqual(balance['drift'], {'wallet_total': 0.0, 'ledger_total': 0.0})
+        self.assertEqual(DailySalesRollup.objects.aggregate(s=Sum('revenue'))['s'], self.revenue)
+
+    def test_batch_that_would_overdraw_is_skipped(self):
+        generate_demo_orders(20, seed=9, batch_size=20)
+        admin_wallet = Wallet.objects.get(user__username='demo_admin')
+        admin_wallet.debit(admin_wallet.balance, description='Payout')
+
+        result = flush_demo_orders(batch_size=20)
+        self.assertEqual(result['orders_deleted'], 0)
+        self.assertEqual(len(result['errors']), 1)
+        self.assertIn(f'Wallet {admin_wallet.id}', result['errors'][0])
+        self.assertEqual(Order.objects.filter(notes=DEMO_ORDER_NOTES).count(), 20)
+        self.assertEqual(verify_global_balance(full=True)['difference'], 0)
+
+    def test_flush_view(self):
+        # Batches must commit on their own, not as savepoints of one request transaction.
+        self.assertIn('default', getattr(resolve('/api/demo/flush/').func, '_non_atomic_requests', set()))
+        generate_demo_orders(10, seed=2)
+        client = APIClient()
+        client.force_authenticate(self.superadmin)
+        response = client.post('/api/demo/flush/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['orders_deleted'], 10)
+        self.assertIsNone(response.data['errors'])
+        self.assertFalse(Order.objects.filter(notes=DEMO_ORDER_NOTES).exists())
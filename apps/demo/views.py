@@ -1,6 +1,7 @@
 """
 Demo data generation. SUPERADMIN only.
 POST /api/demo/generate/ — create random orders with products, wallet logic, spread over last 30 days.
+    With {"bulk": true, "orders": N, "seed": S, "days": D} uses the bulk generator (apps.demo.services).
 POST /api/demo/flush/ — delete all demo-generated orders and reverse their wallet impact (SUPERADMIN only).
 """
 import random
@@ -9,18 +10,31 @@ from datetime import timedelta
 
 from django.db import transaction as db_transaction, connection
 from django.utils import timezone
+from django.utils.decorators import method_decorator
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.core.permissions import IsSuperAdmin
+from apps.dashboard.cache import invalidate_all_dashboards
+from apps.dashboard.models import DailySalesRollup
+from apps.dashboard.services.sales_rollup import rebuild_sales_rollup
+from apps.demo.services import DEMO_ORDER_NOTES, flush_demo_orders, generate_demo_orders
 from apps.orders.models import Order, OrderItem, OrderStatus
 from apps.stands.models import Stand
 from apps.users.models import User, UserRole
-from apps.wallet.models import Wallet, Transaction, TransactionType, get_platform_wallet
+from apps.wallet.models import (
+    Wallet,
+    Transaction,
+    TransactionType,
+    get_commission_wallet,
+    reset_ledger_totals,
+)
 
-DEMO_ORDER_NOTES = 'Demo generated'
+DEMO_BULK_DEFAULT_ORDERS = 10_000
+# Larger datasets: manage.py generate_demo_orders (no request timeout).
+DEMO_BULK_MAX_ORDERS = 200_000
 
 
 def _get_stands_with_products():
@@ -39,11 +53,33 @@ def _get_stands_with_products():
     return result
 
 
+def _optional_int(data, key, default, minimum, maximum):
+    value = data.get(key, default)
+    if value is None:
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{key} must be an integer.')
+    if not minimum <= value <= maximum:
+        raise ValueError(f'{key} must be between {minimum} and {maximum}.')
+    return value
+
+
+@method_decorator(db_transaction.non_atomic_requests, name='dispatch')
 class DemoGenerateView(APIView):
-    """POST /api/demo/generate/ — generate random demo orders (SUPERADMIN only)."""
+    """
+    POST /api/demo/generate/ — generate random demo orders (SUPERADMIN only).
+    Default: 50-200 orders, one at a time. bulk=true: `orders` (default 10000) written in bulk batches,
+    deterministic for a given `seed`. Not wrapped in the request transaction: each order (or batch)
+    commits and releases its wallet locks on its own.
+    """
     permission_classes = [IsAuthenticated, IsSuperAdmin]
 
     def post(self, request):
+        if str(request.data.get('bulk', '')).lower() in ('true', '1', 'yes'):
+            return self._bulk(request)
+
         users = list(
             User.objects.filter(role=UserRole.USER, is_deleted=False).values_list('id', flat=True)
         )
@@ -92,6 +128,8 @@ class DemoGenerateView(APIView):
                     order = Order.objects.create(
                         user_id=user_id,
                         stand=stand,
+                        organization_id=stand.event.organization_id,
+                        event_id=stand.event_id,
                         status=OrderStatus.COMPLETED,
                         total_amount=total_amount,
                         notes=DEMO_ORDER_NOTES,
@@ -146,7 +184,7 @@ class DemoGenerateView(APIView):
                             description=f'Order #{order.id} (net)',
                         )
                     if commission > 0:
-                        platform_wallet = get_platform_wallet()
+                        platform_wallet = get_commission_wallet(order.id)
                         platform_wallet.add_balance(
                             commission,
                             TransactionType.CREDIT,
@@ -160,6 +198,10 @@ class DemoGenerateView(APIView):
             except Exception:
                 continue
 
+        if orders_created:
+            # Orders were added to the rollup under today, then backdated: recompute the affected days.
+            rebuild_sales_rollup(start=timezone.localdate(now) - timedelta(days=31), end=timezone.localdate(now))
+
         return Response(
             {
                 'orders_created': orders_created,
@@ -169,62 +211,47 @@ class DemoGenerateView(APIView):
             status=status.HTTP_200_OK,
         )
 
+    def _bulk(self, request):
+        try:
+            n_orders = _optional_int(request.data, 'orders', DEMO_BULK_DEFAULT_ORDERS, 1, DEMO_BULK_MAX_ORDERS)
+            seed = _optional_int(request.data, 'seed', None, 0, 2 ** 63 - 1)
+            days = _optional_int(request.data, 'days', 30, 0, 3650)
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = generate_demo_orders(n_orders, seed=seed, days=days)
+        body = {
+            'orders_created': result['orders_created'],
+            'items_created': result['items_created'],
+            'transactions_created': result['transactions_created'],
+            'total_generated_revenue': round(float(result['total_generated_revenue']), 2),
+            'total_commission_generated': round(float(result['total_commission_generated']), 2),
+            'seed': result['seed'],
+        }
+        if not result['orders_created']:
+            body['detail'] = 'Need at least one USER and one Stand with products to generate demo orders.'
+        return Response(body, status=status.HTTP_200_OK)
 
+
+@method_decorator(db_transaction.non_atomic_requests, name='dispatch')
 class DemoFlushView(APIView):
     """
     POST /api/demo/flush/ — delete all demo-generated orders and reverse their wallet impact.
     SUPERADMIN only. Orders with notes='Demo generated' are removed; compensating transactions
-    are created so wallet balances stay correct (transactions are immutable).
+    are created so wallet balances stay correct (transactions are immutable). Set-based, in batches
+    (apps.demo.services.flush; manage.py flush_demo_data for very large sets). Not wrapped in the request
+    transaction, so each batch commits and releases its locks on its own.
     """
     permission_classes = [IsAuthenticated, IsSuperAdmin]
 
     def post(self, request):
-        demo_orders = Order.objects.filter(notes=DEMO_ORDER_NOTES).select_related('stand').order_by('id')
-        count = 0
-        errors = []
-
-        for order in demo_orders:
-            try:
-                with db_transaction.atomic():
-                    # Get all transactions linked to this order, ordered by wallet_id to avoid deadlocks
-                    txs = list(
-                        Transaction.objects.filter(order=order).select_related('wallet').order_by('wallet_id')
-                    )
-                    for tx in txs:
-                        wallet = Wallet.objects.select_for_update().get(pk=tx.wallet_id)
-                        rev_desc = f'Reversal demo order #{order.id}'
-                        if tx.transaction_type == TransactionType.CREDIT:
-                            if wallet.balance < tx.amount:
-                                raise ValueError(
-                                    f'Wallet {wallet.id} balance {wallet.balance} < {tx.amount} for reversal'
-                                )
-                            wallet.balance -= tx.amount
-                            wallet.save(update_fields=['balance'])
-                            Transaction.objects.create(
-                                wallet=wallet,
-                                amount=tx.amount,
-                                transaction_type=TransactionType.DEBIT,
-                                order=None,
-                                description=rev_desc,
-                            )
-                        else:
-                            wallet.balance += tx.amount
-                            wallet.save(update_fields=['balance'])
-                            Transaction.objects.create(
-                                wallet=wallet,
-                                amount=tx.amount,
-                                transaction_type=TransactionType.CREDIT,
-                                order=None,
-                                description=rev_desc,
-                            )
-                    order.delete()
-                    count += 1
-            except Exception as e:
-                errors.append(f'Order #{order.id}: {e}')
-
+        result = flush_demo_orders()
+        count = result['orders_deleted']
+        errors = result['errors']
         return Response(
             {
                 'orders_deleted': count,
+                'transactions_reversed': result['transactions_reversed'],
                 'detail': f'Deleted {count} demo orders.' + (f' Errors: {errors}' if errors else ''),
                 'errors': errors if errors else None,
             },
@@ -246,6 +273,9 @@ class DemoFlushAllView(APIView):
                 cursor.execute(f'DELETE FROM {Transaction._meta.db_table}')
                 transactions_count = cursor.rowcount
             Wallet.objects.all().update(balance=Decimal('0.00'))
+            reset_ledger_totals()
+            DailySalesRollup.objects.all().delete()
+            invalidate_all_dashboards()
 
         return Response(
             {
@@ -0,0 +1,25 @@
+"""
+Fill the denormalized organization/event columns of orders and audit logs (see apps.orders.services.order_scope).
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.orders.services.order_scope import BACKFILL_BATCH_SIZE, backfill_order_scope
+
+
+class Command(BaseCommand):
+    help = 'Backfill Order.organization/event and FinancialAuditLog.event in id batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BACKFILL_BATCH_SIZE, help='Ids per transaction.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+
+        def progress(label, up_to_id, last_id):
+            self.stdout.write(f'{label}: id {up_to_id}/{last_id}')
+
+        result = backfill_order_scope(batch_size=options['batch_size'], progress=progress)
+        self.stdout.write(
+            f'Updated {result["orders_updated"]} orders and {result["audit_logs_updated"]} audit logs.'
+        )
@@ -0,0 +1,95 @@
+"""
+Benchmark order-list serialization per page: the original plan (items prefetched, products fetched per item,
+nested OrderSerializer), the same serializer over Prefetch('items', select_related('product')), and the
+values()-based serialize_order_rows used by OrderViewSet.list. Reports queries, median process CPU time and
+median wall time per page, JSON rendering included. Seeds a throwaway test database with --orders demo orders.
+"""
+import statistics
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Prefetch
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.benchmark import benchmark_database, timed
+from apps.demo.services import generate_demo_orders
+from apps.events.models import Event
+from apps.orders.models import Order, OrderItem
+from apps.orders.serializers import OrderSerializer, order_list_values, serialize_order_rows
+from apps.organizations.models import Organization
+from apps.stands.models import Product, Stand
+from apps.users.models import User, UserRole
+
+
+def _seed(n_orders):
+    org = Organization.objects.create(name='Bench Org', commission_rate=Decimal('10.00'))
+    event = Event.objects.create(name='Bench Event', organization=org)
+    for i in range(10):
+        stand = Stand.objects.create(name=f'Bench Stand {i}', event=event)
+        User.objects.create_user(username=f'bench_admin_{stand.pk}', role=UserRole.STAND_ADMIN, stand=stand)
+        Product.objects.bulk_create([
+            Product(stand=stand, name=f'Product {i}.{j}', price=Decimal('1.50') * (j + 1), stock_quantity=1000)
+            for j in range(8)
+        ])
+    for i in range(100):
+        User.objects.create_user(username=f'bench_buyer_{i}', role=UserRole.USER)
+    generate_demo_orders(n_orders, seed=1)
+
+
+def _original(page_size):
+    orders = Order.objects.select_related('user', 'stand').prefetch_related('items')[:page_size]
+    return OrderSerializer(orders, many=True).data
+
+
+def _prefetch_products(page_size):
+    orders = Order.objects.select_related('user', 'stand').prefetch_related(
+        Prefetch('items', queryset=OrderItem.objects.select_related('product').order_by('id')),
+    )[:page_size]
+    return OrderSerializer(orders, many=True).data
+
+
+def _values_rows(page_size):
+    return serialize_order_rows(list(order_list_values(Order.objects.all())[:page_size]))
+
+
+VARIANTS = [
+    ('OrderSerializer, items prefetched', _original),
+    ('OrderSerializer, Prefetch + product', _prefetch_products),
+    ('serialize_order_rows (values)', _values_rows),
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-page CPU time of order-list serialization strategies on a seeded dataset.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=20_000)
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--keepdb', action='store_true')
+
+    def handle(self, *args, **options):
+        with benchmark_database(keepdb=options['keepdb']):
+            results = {}
+            with timed(results, 'seed'):
+                _seed(options['orders'])
+            self.stdout.write(f'seeded {options["orders"]} orders in {results["seed"]:.1f}s')
+
+            renderer = JSONRenderer()
+            for label, run in VARIANTS:
+                renderer.render(run(options['page_size']))  # warm caches
+                cpu, wall = [], []
+                for _ in range(options['repeat']):
+                    with CaptureQueriesContext(connection) as ctx:
+                        start_cpu, start_wall = time.process_time(), time.perf_counter()
+                        renderer.render(run(options['page_size']))
+                        cpu.append(time.process_time() - start_cpu)
+                        wall.append(time.perf_counter() - start_wall)
+                self.stdout.write(
+                    f'{label:>36}: {len(ctx.captured_queries):3} queries, '
+                    f'CPU median {statistics.median(cpu) * 1000:7.2f} ms, '
+                    f'wall median {statistics.median(wall) * 1000:7.2f} ms'
+                )
@@ -0,0 +1,28 @@
+# Add (scope, created_at, id) indexes for role-scoped order listings and keyset pagination
+# without blocking writes (CREATE INDEX CONCURRENTLY)
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('orders', '0002_idempotency_and_reversed'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='orders_user_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['stand', 'created_at', 'id'], name='orders_stand_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['status', 'created_at', 'id'], name='orders_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Add denormalized Order.organization/event (nullable, so adding them rewrites nothing).
+# Existing rows are filled afterwards, outside the migration, in id batches: run
+#   python manage.py backfill_order_scope
+# once 0005 is applied and every worker runs the new code (re-running it is safe).
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('organizations', '0002_organization_owner'),
+        ('events', '0001_initial'),
+        ('orders', '0003_order_scope_created_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='event',
+            field=models.ForeignKey(blank=True, db_index=False, help_text="Stand's event when the order was created.", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='orders', to='events.event'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='organization',
+            field=models.ForeignKey(blank=True, db_index=False, help_text="Stand's event organization when the order was created.", null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='orders', to='organizations.organization'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Add (organization|event, created_at, id) indexes on orders without blocking writes (CREATE INDEX CONCURRENTLY)
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('orders', '0004_order_organization_event'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['organization', 'created_at', 'id'], name='orders_org_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='order',
+            index=models.Index(fields=['event', 'created_at', 'id'], name='orders_event_created_idx'),
+        ),
+    ]
@@ -1,9 +1,12 @@
 """
 Order model linked to User and Stand.
+organization/event are denormalized from the stand at creation so organization and event scope
+filters need no join through stands and events (backfill_order_scope fills rows created without them).
 """
 from decimal import Decimal
 from django.db import models
 from apps.core.models import TimeStampedModel
+from apps.stands.models import Stand
 
 
 class OrderStatus(models.TextChoices):
@@ -24,6 +27,24 @@ class Order(TimeStampedModel):
         on_delete=models.CASCADE,
         related_name='orders',
     )
+    organization = models.ForeignKey(
+        'organizations.Organization',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_index=False,
+        related_name='orders',
+        help_text="Stand's event organization when the order was created.",
+    )
+    event = models.ForeignKey(
+        'events.Event',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_index=False,
+        related_name='orders',
+        help_text="Stand's event when the order was created.",
+    )
     status = models.CharField(
         max_length=20,
         choices=OrderStatus.choices,
@@ -49,6 +70,22 @@ class Order(TimeStampedModel):
         verbose_name = 'Order'
         verbose_name_plural = 'Orders'
         ordering = ['-created_at']
+        # Role scope filter + keyset pagination key (created_at, id).
+        indexes = [
+            models.Index(fields=['user', 'created_at', 'id'], name='orders_user_created_idx'),
+            models.Index(fields=['stand', 'created_at', 'id'], name='orders_stand_created_idx'),
+            models.Index(fields=['status', 'created_at', 'id'], name='orders_status_created_idx'),
+            models.Index(fields=['organization', 'created_at', 'id'], name='orders_org_created_idx'),
+            models.Index(fields=['event', 'created_at', 'id'], name='orders_event_created_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Callers that already hold the stand's event pass organization/event; others pay one lookup here.
+        if self._state.adding and self.event_id is None and self.stand_id is not None:
+            scope = Stand.objects.filter(pk=self.stand_id).values_list('event_id', 'event__organization_id').first()
+            if scope:
+                self.event_id, self.organization_id = scope
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f'Order #{self.id} - {self.user.username}'
@@ -1,6 +1,8 @@
 """
 Order and OrderItem serializers.
 Checkout/payment logic lives in apps.orders.services.checkout (create_order_with_payment).
+Order lists use serialize_order_rows: the same JSON as OrderSerializer built from values() rows
+(one query for the page, one for its items) without per-field serializer overhead.
 """
 from decimal import Decimal
 from rest_framework import serializers
@@ -11,7 +13,7 @@ from .services.checkout import create_order_with_payment
 from apps.users.serializers import UserMinimalSerializer
 from apps.users.models import UserRole
 from apps.stands.serializers import StandMinimalSerializer, ProductMinimalSerializer
-from apps.stands.models import Stand
+from apps.stands.models import Stand, Product
 
 
 class OrderItemSerializer(serializers.ModelSerializer):
@@ -42,8 +44,74 @@ class OrderSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at', 'idempotency_key', 'is_reversed']
 
 
+ORDER_LIST_FIELDS = (
+    'id', 'user_id', 'user__username', 'user__email', 'user__first_name', 'user__last_name',
+    'stand_id', 'stand__name', 'stand__event_id', 'status', 'total_amount', 'notes',
+    'idempotency_key', 'is_reversed', 'created_at', 'updated_at',
+)
+ORDER_ITEM_LIST_FIELDS = (
+    'id', 'order_id', 'product_id', 'product__name', 'product__price', 'product__is_available',
+    'quantity', 'unit_price', 'created_at',
+)
+
+_datetime = serializers.DateTimeField().to_representation
+_decimal = serializers.DecimalField(max_digits=12, decimal_places=2).to_representation
+
+
+def order_list_values(queryset):
+    """Order queryset -> values() rows with everything serialize_order_rows needs (user and stand joined)."""
+    return queryset.values(*ORDER_LIST_FIELDS)
+
+
+def serialize_order_rows(rows):
+    """OrderSerializer(many=True).data for order_list_values() rows; items are read in one values() query."""
+    items = {row['id']: [] for row in rows}
+    for item in OrderItem.objects.filter(order_id__in=items).order_by('id').values(*ORDER_ITEM_LIST_FIELDS):
+        items[item['order_id']].append({
+            'id': item['id'],
+            'order': item['order_id'],
+            'product': item['product_id'],
+            'product_detail': {
+                'id': item['product_id'],
+                'name': item['product__name'],
+                'price': _decimal(item['product__price']),
+                'is_available': item['product__is_available'],
+            },
+            'quantity': item['quantity'],
+            'unit_price': _decimal(item['unit_price']),
+            'created_at': _datetime(item['created_at']),
+        })
+    return [
+        {
+            'id': row['id'],
+            'user': row['user_id'],
+            'user_detail': {
+                'id': row['user_id'],
+                'username': row['user__username'],
+                'email': row['user__email'],
+                'first_name': row['user__first_name'],
+                'last_name': row['user__last_name'],
+            },
+            'stand': row['stand_id'],
+            'stand_detail': {'id': row['stand_id'], 'name': row['stand__name'], 'event': row['stand__event_id']},
+            'status': row['status'],
+            'total_amount': _decimal(row['total_amount']),
+            'notes': row['notes'],
+            'items': items[row['id']],
+            'idempotency_key': row['idempotency_key'],
+            'is_reversed': row['is_reversed'],
+            'created_at': _datetime(row['created_at']),
+            'updated_at': _datetime(row['updated_at']),
+        }
+        for row in rows
+    ]
+
+
 class OrderItemCreateSerializer(serializers.ModelSerializer):
-    """For nested write: product, quantity, unit_price only."""
+    """For nested write: product, quantity, unit_price only. Checkout prices lines server-side; unit_price is checked.
+    product is a bare pk (no per-line Product lookup): checkout validates the whole cart in one batched read."""
+    product = serializers.IntegerField(source='product_id', min_value=1)
+
     class Meta:
         model = OrderItem
         fields = ['product', 'quantity', 'unit_price']
@@ -84,11 +152,18 @@ class OrderCreateSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({'detail': msg})
             return order
 
+        product_ids = {item['product_id'] for item in items_data}
+        missing = product_ids - set(Product.objects.filter(pk__in=product_ids).values_list('pk', flat=True))
+        if missing:
+            raise serializers.ValidationError({'detail': f'Product {min(missing)} not found.'})
+
         from django.db import transaction as db_transaction
         with db_transaction.atomic():
             order = Order.objects.create(
                 user=user,
                 stand=stand,
+                organization_id=stand.event.organization_id,
+                event_id=stand.event_id,
                 status=validated_data.get('status', OrderStatus.PENDING),
                 total_amount=total_amount,
                 notes=notes,
@@ -4,12 +4,102 @@ Prevents double charges, race conditions, and duplicate orders.
 """
 from decimal import Decimal
 from django.db import transaction as db_transaction, IntegrityError
+from django.db.models import F, Case, When, Value, IntegerField
 from django.core.exceptions import ValidationError
 
 from apps.orders.models import Order, OrderItem, OrderStatus
-from apps.wallet.models import Wallet, TransactionType, get_platform_wallet
+from apps.wallet.models import (
+    Wallet,
+    clear_platform_wallet_cache,
+    get_commission_wallet,
+    get_commission_wallet_id,
+    lock_wallets,
+)
 from apps.users.models import UserRole
 from apps.stands.models import Stand, Product
+from apps.stands.services.price_snapshot import build_price_snapshot, get_price_snapshot, snapshot_cache_is_shared
+
+
+def _resolve_cart(stand, items):
+    """
+    Resolve, validate and price cart lines against the stand's price snapshot.
+    The snapshot ({product_id: (price, stock, is_available)}) comes from Django's cache when warm and the
+    cache is shared by all workers, so no product query is made; otherwise it is built with a single query. Prices are
+    server-authoritative: a client-sent unit_price is only compared against the snapshot and a
+    stale or mismatched price is rejected. Quantities of repeated products are summed for the stock check.
+
+    Returns: (resolved_items, total_amount) where resolved_items is a list of dicts with
+    keys product_id, quantity, unit_price.
+    Raises: ValidationError on unknown product, unavailable product, insufficient stock or price mismatch.
+    """
+    if snapshot_cache_is_shared():
+        snapshot = get_price_snapshot(stand.pk)
+    else:
+        # A per-process cache may hold a map another worker already invalidated: never price from it.
+        snapshot = build_price_snapshot(stand.pk)
+
+    resolved_items = []
+    requested = {}
+    total_amount = Decimal('0.00')
+    for it in items:
+        product_id = it['product_id'] if 'product_id' in it else it.get('product')
+        if hasattr(product_id, 'pk'):
+            product_id = product_id.pk
+        entry = snapshot.get(product_id)
+        if entry is None:
+            raise ValidationError(f'Product {product_id} not found or does not belong to this stand.')
+        price, stock_quantity, is_available = entry
+        qty = max(0, int(it.get('quantity') or 0))
+        if qty <= 0:
+            continue
+        if not is_available:
+            raise ValidationError(f'Product {product_id} is not available.')
+        client_price = it.get('unit_price')
+        if client_price is not None and Decimal(str(client_price)) != price:
+            raise ValidationError(f'Price for product {product_id} has changed; please refresh and try again.')
+        requested[product_id] = requested.get(product_id, 0) + qty
+        if requested[product_id] > stock_quantity:
+            raise ValidationError(f'Insufficient stock for product {product_id}.')
+        resolved_items.append({'product_id': product_id, 'quantity': qty, 'unit_price': price})
+        total_amount += price * qty
+
+    return resolved_items, total_amount
+
+
+def _reserve_stock(resolved_items):
+    """
+    Decrement Product.stock_quantity for the whole cart in one conditional UPDATE:
+    stock_quantity = stock_quantity - n WHERE stock_quantity >= n, for every product in the cart.
+    Rows are locked through an ordered FOR UPDATE subquery so concurrent carts always lock
+    products in the same (pk) order. Must run inside the checkout's atomic block so a later
+    failure (e.g. insufficient balance) also releases the reservation.
+
+    Raises: ValidationError if any product does not have enough stock left.
+    """
+    quantities = {}
+    for it in resolved_items:
+        quantities[it['product_id']] = quantities.get(it['product_id'], 0) + it['quantity']
+    product_ids = sorted(quantities)
+    requested = Case(
+        *[When(pk=product_id, then=Value(quantities[product_id])) for product_id in product_ids],
+        output_field=IntegerField(),
+    )
+    locked_ids = Product.objects.filter(pk__in=product_ids).order_by('pk').select_for_update().values('pk')
+    updated = Product.objects.filter(
+        pk__in=locked_ids,
+        stock_quantity__gte=requested,
+    ).update(stock_quantity=F('stock_quantity') - requested)
+    if updated != len(product_ids):
+        sold_out = [
+            product_id
+            for product_id, stock_quantity in Product.objects.filter(
+                pk__in=product_ids,
+            ).order_by('pk').values_list('pk', 'stock_quantity')
+            if stock_quantity < quantities[product_id]
+        ]
+        if sold_out:
+            raise ValidationError(f'Insufficient stock for product {", ".join(map(str, sold_out))}.')
+        raise ValidationError('Insufficient stock for one or more products.')
 
 
 def create_order_with_payment(user, stand, items, idempotency_key=None, notes=''):
@@ -18,7 +108,8 @@ def create_order_with_payment(user, stand, items, idempotency_key=None, notes=''
 
     - user: buyer (must be USER role for payment).
     - stand: Stand instance (will be re-fetched with select_related for organization).
-    - items: list of dicts with keys product (id or Product), quantity, unit_price.
+    - items: list of dicts with keys product (id or Product) or product_id, quantity and optional unit_price.
+      Lines are priced from the stand's price snapshot; a client unit_price that differs is rejected.
     - idempotency_key: optional unique key (e.g. UUID). If provided and an order already exists
       with this key, returns that order without charging again.
     - notes: optional order notes.
@@ -33,24 +124,7 @@ def create_order_with_payment(user, stand, items, idempotency_key=None, notes=''
     organization = stand.event.organization if stand.event else None
     commission_rate = (organization.commission_rate or Decimal('0')) if organization else Decimal('0')
 
-    # Resolve items: product id -> Product, validate belong to stand
-    resolved_items = []
-    total_amount = Decimal('0.00')
-    for it in items:
-        product_id = it.get('product')
-        if hasattr(product_id, 'pk'):
-            product_id = product_id.pk
-        product = Product.objects.filter(pk=product_id, stand=stand).first()
-        if not product:
-            raise ValidationError(f'Product {product_id} not found or does not belong to this stand.')
-        qty = max(0, int(it.get('quantity') or 0))
-        if qty <= 0:
-            continue
-        unit_price = Decimal(str(it.get('unit_price') or 0))
-        if unit_price < 0:
-            raise ValidationError('Unit price cannot be negative.')
-        resolved_items.append({'product': product, 'quantity': qty, 'unit_price': unit_price})
-        total_amount += unit_price * qty
+    resolved_items, total_amount = _resolve_cart(stand, items)
 
     total_amount = total_amount.quantize(Decimal('0.01'))
     if total_amount <= 0:
@@ -63,15 +137,8 @@ def create_order_with_payment(user, stand, items, idempotency_key=None, notes=''
             if existing:
                 return existing
 
-        # Lock buyer wallet (create if missing, then lock)
-        buyer_wallet, _ = Wallet.objects.get_or_create(
-            user=user,
-            defaults={'balance': Decimal('0.00')},
-        )
-        buyer_wallet = Wallet.objects.select_for_update().get(pk=buyer_wallet.pk)
-
-        if buyer_wallet.balance < total_amount:
-            raise ValidationError('Insufficient wallet balance.')
+        # Reserve stock first (products before wallets, always in pk order)
+        _reserve_stock(resolved_items)
 
         commission = (total_amount * commission_rate / Decimal('100')).quantize(Decimal('0.01'))
         net_to_stand = (total_amount - commission).quantize(Decimal('0.01'))
@@ -80,6 +147,8 @@ def create_order_with_payment(user, stand, items, idempotency_key=None, notes=''
             order = Order.objects.create(
                 user=user,
                 stand=stand,
+                organization=organization,
+                event_id=stand.event_id,
                 status=OrderStatus.PENDING,
                 total_amount=total_amount,
                 notes=notes or '',
@@ -92,36 +161,61 @@ def create_order_with_payment(user, stand, items, idempotency_key=None, notes=''
                     return existing
             raise
 
-        for it in resolved_items:
-            OrderItem.objects.create(
+        OrderItem.objects.bulk_create([
+            OrderItem(
                 order=order,
-                product=it['product'],
+                product_id=it['product_id'],
                 quantity=it['quantity'],
                 unit_price=it['unit_price'],
             )
+            for it in resolved_items
+        ])
+
+        # Resolve every wallet this order touches (create if missing), then lock them in pk order.
+        # Commission goes to the platform sub-wallet chosen by order id (see PLATFORM_COMMISSION_SHARDS).
+        buyer_wallet, _ = Wallet.objects.get_or_create(
+            user=user,
+            defaults={'balance': Decimal('0.00')},
+        )
+        admin_wallet = None
+        stand_admin = stand.users.filter(role=UserRole.STAND_ADMIN).first()
+        if stand_admin and stand_admin.id != user.id and net_to_stand > 0:
+            admin_wallet, _ = Wallet.objects.get_or_create(
+                user=stand_admin,
+                defaults={'balance': Decimal('0.00')},
+            )
+        platform_wallet_id = get_commission_wallet_id(order.id) if commission > 0 else None
+
+        locked = lock_wallets([
+            buyer_wallet.pk,
+            admin_wallet.pk if admin_wallet else None,
+            platform_wallet_id,
+        ])
+        if platform_wallet_id is not None and platform_wallet_id not in locked:
+            # Memoized platform wallet id went stale (e.g. database reset); resolve and lock it again.
+            clear_platform_wallet_cache()
+            platform_wallet_id = get_commission_wallet(order.id).pk
+            locked.update(lock_wallets([platform_wallet_id]))
+        buyer_wallet = locked[buyer_wallet.pk]
+
+        if buyer_wallet.balance < total_amount:
+            raise ValidationError('Insufficient wallet balance.')
 
-        buyer_wallet.debit(
+        buyer_wallet.debit_locked(
             total_amount,
             order=order,
             description=f'Order #{order.id}',
         )
 
-        stand_admin = stand.users.filter(role=UserRole.STAND_ADMIN).first()
-        if stand_admin and stand_admin.id != user.id and net_to_stand > 0:
-            admin_wallet = Wallet.objects.select_for_update().filter(user=stand_admin).first()
-            if not admin_wallet:
-                admin_wallet = Wallet.objects.create(user=stand_admin, balance=Decimal('0.00'))
-                admin_wallet = Wallet.objects.select_for_update().get(pk=admin_wallet.pk)
-            admin_wallet.credit(
+        if admin_wallet:
+            locked[admin_wallet.pk].credit_locked(
                 net_to_stand,
                 order=order,
                 description=f'Order #{order.id} (net)',
             )
 
-        if commission > 0:
-            platform_wallet = get_platform_wallet()
-            platform_wallet = Wallet.objects.select_for_update().get(pk=platform_wallet.pk)
-            platform_wallet.credit(
+        if platform_wallet_id is not None:
+            locked[platform_wallet_id].credit_locked(
                 commission,
                 order=order,
                 description=f'Order #{order.id} (commission)',
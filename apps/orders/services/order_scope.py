@@ -0,0 +1,51 @@
+"""
+Backfill of the denormalized scope columns: Order.organization/event and FinancialAuditLog.event.
+Rows are updated by id range, batch_size ids per transaction, with one UPDATE ... FROM stands/events per
+table, so a large backfill never holds long locks. Migration orders 0004 adds the columns empty; run the
+backfill_order_scope command once the new code is deployed. Only rows whose event is still NULL are touched,
+so it can be re-run (e.g. for orders written by old workers during a rolling deploy).
+"""
+from django.db import connection, transaction as db_transaction
+
+from apps.audit.models import FinancialAuditLog
+from apps.events.models import Event
+from apps.orders.models import Order
+from apps.stands.models import Stand
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def _backfill_table(model, set_clause, batch_size, progress, label):
+    table = connection.ops.quote_name(model._meta.db_table)
+    stands = connection.ops.quote_name(Stand._meta.db_table)
+    events = connection.ops.quote_name(Event._meta.db_table)
+    last_id = model.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    updated = 0
+    for start in range(0, last_id, batch_size):
+        with db_transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {table} AS t SET {set_clause} '
+                f'FROM {stands} AS s JOIN {events} AS e ON e.id = s.event_id '
+                f'WHERE s.id = t.stand_id AND t.event_id IS NULL AND t.id > %s AND t.id <= %s',
+                [start, start + batch_size],
+            )
+            updated += cursor.rowcount
+        if progress:
+            progress(label, min(start + batch_size, last_id), last_id)
+    return updated
+
+
+def backfill_order_scope(batch_size=BACKFILL_BATCH_SIZE, progress=None):
+    """
+    Fill organization/event on orders and event on audit logs from their stand's current event.
+    progress(label, up_to_id, last_id) is called after each batch. Returns orders_updated and
+    audit_logs_updated.
+    """
+    return {
+        'orders_updated': _backfill_table(
+            Order, 'event_id = s.event_id, organization_id = e.organization_id', batch_size, progress, 'orders',
+        ),
+        'audit_logs_updated': _backfill_table(
+            FinancialAuditLog, 'event_id = s.event_id', batch_size, progress, 'audit logs',
+        ),
+    }
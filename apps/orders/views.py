@@ -2,15 +2,19 @@
 Order CRUD. Users see own orders; admins see filtered by scope.
 Only SUPERADMIN and STAND_ADMIN can update (change status); USER and EVENT_ADMIN are read-only.
 When status changes COMPLETED -> CANCELLED, compensating transactions are created (reverse_order).
+List is page-number paginated (with a count); ?pagination=cursor switches to count-free keyset pages.
+List pages are serialized from values() rows (serialize_order_rows); single orders prefetch items with products.
 """
+from django.db.models import Prefetch, Q
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework import serializers
 from rest_framework.permissions import IsAuthenticated
+from apps.core.pagination import KeysetPagination
 from apps.core.permissions import IsActiveUser
 from apps.users.models import UserRole
-from .models import Order, OrderStatus
-from .serializers import OrderSerializer, OrderCreateSerializer
+from .models import Order, OrderItem, OrderStatus
+from .serializers import OrderSerializer, OrderCreateSerializer, order_list_values, serialize_order_rows
 
 
 class OrderViewSet(viewsets.ModelViewSet):
@@ -19,22 +23,44 @@ class OrderViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'total_amount', 'status']
     filterset_fields = ['stand', 'status', 'user']
 
+    @property
+    def paginator(self):
+        # Opt-in: ?pagination=cursor pages by (ordering field, id) without COUNT(*).
+        if self.request is not None and self.request.query_params.get('pagination') == 'cursor':
+            self.pagination_class = KeysetPagination
+        return super().paginator
+
     def get_serializer_class(self):
         if self.action == 'create':
             return OrderCreateSerializer
         return OrderSerializer
 
     def get_queryset(self):
-        qs = Order.objects.select_related('user', 'stand').prefetch_related('items').all()
+        qs = Order.objects.all()
+        if self.action != 'list':
+            qs = qs.select_related('user', 'stand').prefetch_related(
+                Prefetch('items', queryset=OrderItem.objects.select_related('product').order_by('id')),
+            )
         user = self.request.user
         if user.role == 'USER':
             qs = qs.filter(user=user)
         elif user.role == 'STAND_ADMIN' and user.stand_id:
             qs = qs.filter(stand_id=user.stand_id)
         elif user.role == 'EVENT_ADMIN' and user.organization_id:
-            qs = qs.filter(stand__event__organization_id=user.organization_id)
+            # Orders not yet reached by backfill_order_scope fall back to the stand's event organization.
+            qs = qs.filter(
+                Q(organization_id=user.organization_id)
+                | Q(organization_id__isnull=True, stand__event__organization_id=user.organization_id)
+            )
         return qs
 
+    def list(self, request, *args, **kwargs):
+        rows = order_list_values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serialize_order_rows(page))
+        return Response(serialize_order_rows(list(rows)))
+
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
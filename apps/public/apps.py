@@ -5,3 +5,6 @@ class PublicConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.public'
     verbose_name = 'Public API'
+
+    def ready(self):
+        import apps.public.signals  # noqa: F401
@@ -0,0 +1,75 @@
+"""
+Read-through cache for the public catalog: active events, stands of an event, available products of a stand.
+Rendered JSON bytes and their ETag are kept in Django's cache under a per-scope version ('events',
+'event:<id>', 'stand:<id>'); Event, Stand and Product signals bump the affected versions after commit.
+Stock decremented by checkout (a queryset update, no signals) is refreshed within PUBLIC_CATALOG_CACHE_TTL;
+checkout reserves stock against the database, so a stale count never oversells.
+Responses carry ETag, Cache-Control and X-Catalog-Cache: HIT | MISS; a matching If-None-Match gets a 304.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction as db_transaction
+from django.utils import timezone
+
+from apps.core.responses import etag_response, render_json
+
+CACHE_HEADER = 'X-Catalog-Cache'
+CACHE_CONTROL = 'private, no-cache'
+
+
+def _ttl():
+    return getattr(settings, 'PUBLIC_CATALOG_CACHE_TTL', 30)
+
+
+def _version_key(scope):
+    return f'public:catalog:version:{scope}'
+
+
+def _initial_version():
+    # Time-based so a lost version key never resurrects older entries.
+    return time.time_ns()
+
+
+def _version(scope):
+    key = _version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(scope):
+    try:
+        cache.incr(_version_key(scope))
+    except ValueError:
+        cache.set(_version_key(scope), _initial_version(), timeout=None)
+
+
+def invalidate_catalog(*scopes):
+    """Drop cached catalog responses of these scopes once the current transaction commits."""
+    for scope in set(scopes):
+        db_transaction.on_commit(lambda scope=scope: _bump(scope))
+
+
+def cached_catalog_response(request, scope, build):
+    """
+    JSON response of build()'s data, read through the cache. Call after permission checks; build may raise
+    (e.g. Http404), in which case nothing is cached. Host and query string are part of the key (page links).
+    """
+    url = f'{request.get_host()}?{request.META.get("QUERY_STRING", "")}'
+    query = hashlib.sha256(url.encode()).hexdigest()[:16]
+    key = f'public:catalog:{scope}:v{_version(scope)}:{timezone.get_current_timezone_name()}:{query}'
+    entry = cache.get(key)
+    state = 'HIT'
+    if entry is None:
+        state = 'MISS'
+        entry = render_json(build())
+        cache.set(key, entry, _ttl())
+    body, etag = entry
+    response = etag_response(request, body, etag, CACHE_CONTROL)
+    response[CACHE_HEADER] = state
+    return response
@@ -0,0 +1,44 @@
+"""
+Invalidate cached public catalog responses when an Event, Stand or Product changes (see apps.public.cache).
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from apps.events.models import Event
+from apps.stands.models import Product, Stand
+from .cache import invalidate_catalog
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_catalog_on_event_change(sender, instance, **kwargs):
+    invalidate_catalog('events', f'event:{instance.pk}')
+
+
+@receiver(pre_save, sender=Stand)
+def remember_previous_event(sender, instance, **kwargs):
+    if instance.pk is None or kwargs.get('raw', False):
+        instance._previous_event_id = None
+        return
+    instance._previous_event_id = Stand.objects.filter(pk=instance.pk).values_list('event_id', flat=True).first()
+
+
+@receiver(post_save, sender=Stand)
+@receiver(post_delete, sender=Stand)
+def invalidate_catalog_on_stand_change(sender, instance, **kwargs):
+    scopes = [f'stand:{instance.pk}', f'event:{instance.event_id}']
+    previous = getattr(instance, '_previous_event_id', None)
+    if previous is not None:
+        scopes.append(f'event:{previous}')
+    invalidate_catalog(*scopes)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_catalog_on_product_change(sender, instance, **kwargs):
+    # _previous_stand_id is recorded by apps.stands.signals (pre_save) when a product moves between stands.
+    scopes = [f'stand:{instance.stand_id}']
+    previous = getattr(instance, '_previous_stand_id', None)
+    if previous is not None:
+        scopes.append(f'stand:{previous}')
+    invalidate_catalog(*scopes)
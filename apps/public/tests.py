@@ -0,0 +1,106 @@
+"""
+Public catalog tests: read-through cache, signal invalidation and ETag revalidation.
+"""
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.users.models import User, UserRole
+from apps.organizations.models import Organization
+from apps.events.models import Event
+from apps.stands.models import Stand, Product
+from apps.public.cache import CACHE_HEADER
+
+
+class PublicCatalogCacheTests(TestCase):
+    """Test catalog endpoints are served from cache, invalidated by admin edits and revalidated by ETag."""
+
+    def setUp(self):
+        cache.clear()
+        org = Organization.objects.create(name='CatOrg')
+        self.event = Event.objects.create(name='CatEv', organization=org)
+        self.stand = Stand.objects.create(name='CatSt', event=self.event)
+        self.other_stand = Stand.objects.create(name='OtherSt', event=self.event)
+        self.product = Product.objects.create(stand=self.stand, name='Agua', price=Decimal('1.50'), stock_quantity=5)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='cat_buyer', role=UserRole.USER))
+
+    def _get(self, path, **headers):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.get(path, **headers)
+
+    def test_second_read_is_a_cache_hit_without_queries(self):
+        for path in ('/api/public/events/', f'/api/public/events/{self.event.pk}/stands/',
+                     f'/api/public/stands/{self.stand.pk}/products/'):
+            first = self._get(path)
+            self.assertEqual(first.status_code, 200)
+            self.assertEqual(first[CACHE_HEADER], 'MISS')
+            self.assertEqual(first['Cache-Control'], 'private, no-cache')
+            with self.assertNumQueries(0):
+                second = self._get(path)
+            self.assertEqual(second[CACHE_HEADER], 'HIT')
+            self.assertEqual(second.content, first.content)
+            self.assertEqual(second['ETag'], first['ETag'])
+
+        names = [row['name'] for row in self._get(f'/api/public/stands/{self.stand.pk}/products/').json()]
+        self.assertEqual(names, ['Agua'])
+
+    def test_if_none_match_returns_not_modified(self):
+        path = f'/api/public/stands/{self.stand.pk}/products/'
+        etag = self._get(path)['ETag']
+        response = self._get(path, HTTP_IF_NONE_MATCH=f'W/{etag}')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_admin_edits_invalidate_affected_scopes(self):
+        products = f'/api/public/stands/{self.stand.pk}/products/'
+        other_products = f'/api/public/stands/{self.other_stand.pk}/products/'
+        stands = f'/api/public/events/{self.event.pk}/stands/'
+        for path in (products, other_products, stands, '/api/public/events/'):
+            self._get(path)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.price = Decimal('2.00')
+            self.product.save()
+        response = self._get(products)
+        self.assertEqual(response[CACHE_HEADER], 'MISS')
+        self.assertEqual(response.json()[0]['price'], '2.00')
+        self.assertEqual(self._get(other_products)[CACHE_HEADER], 'HIT')
+        self.assertEqual(self._get(stands)[CACHE_HEADER], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product.stand = self.other_stand
+            self.product.save()
+        self.assertEqual(self._get(products).json(), [])
+        self.assertEqual([row['name'] for row in self._get(other_products).json()], ['Agua'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other_stand.is_active = False
+            self.other_stand.save()
+        self.assertEqual([row['name'] for row in self._get(stands).json()], ['CatSt'])
+        self.assertEqual(self._get('/api/public/events/')[CACHE_HEADER], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.is_active = False
+            self.event.save()
+        self.assertEqual(self._get('/api/public/events/').json()['results'], [])
+        # Last: DRF marks the test transaction for rollback when it handles the 404.
+        self.assertEqual(self._get(stands).status_code, 404)
+
+    def test_deactivated_stand_is_no_longer_served(self):
+        path = f'/api/public/stands/{self.stand.pk}/products/'
+        self.assertEqual(self._get(path).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.stand.is_active = False
+            self.stand.save()
+        self.assertEqual(self._get(path).status_code, 404)
+
+    def test_permissions_checked_before_cache(self):
+        path = f'/api/public/stands/{self.stand.pk}/products/'
+        self._get(path)
+        self.client.force_authenticate(User.objects.create_user(username='cat_admin', role=UserRole.SUPERADMIN))
+        self.assertEqual(self._get(path).status_code, 403)
+        self.assertEqual(APIClient().get(path).status_code, 401)
@@ -3,12 +3,15 @@ Read-only public API for USER purchase flow.
 - GET /api/public/events/           -> active events
 - GET /api/public/events/{id}/stands/ -> active stands for event
 - GET /api/public/stands/{id}/products/ -> available products (stock > 0)
+These three are read through the catalog cache (apps.public.cache) and support If-None-Match.
 """
+from django.db import transaction as db_transaction
+from django.utils.decorators import method_decorator
 from rest_framework import viewsets
 from rest_framework.decorators import action
-from rest_framework.response import Response
 from apps.events.models import Event
 from apps.stands.models import Stand, Product
+from .cache import cached_catalog_response
 from .permissions import IsAuthenticatedUserRole
 from .serializers import (
     PublicEventSerializer,
@@ -17,6 +20,7 @@ from .serializers import (
 )
 
 
+@method_decorator(db_transaction.non_atomic_requests, name='dispatch')
 class PublicEventViewSet(viewsets.ReadOnlyModelViewSet):
     """
     List and retrieve active events only.
@@ -25,15 +29,23 @@ class PublicEventViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = PublicEventSerializer
     permission_classes = [IsAuthenticatedUserRole]
     queryset = Event.objects.filter(is_active=True).order_by('-start_date')
+    lookup_value_regex = '[0-9]+'
+
+    def list(self, request, *args, **kwargs):
+        return cached_catalog_response(
+            request, 'events', lambda: super(PublicEventViewSet, self).list(request, *args, **kwargs).data,
+        )
 
     @action(detail=True, url_path='stands', url_name='stands')
     def stands(self, request, pk=None):
-        event = self.get_object()
-        stands_qs = Stand.objects.filter(event=event, is_active=True).order_by('name')
-        serializer = PublicStandSerializer(stands_qs, many=True)
-        return Response(serializer.data)
+        def build():
+            event = self.get_object()
+            stands_qs = Stand.objects.filter(event=event, is_active=True).order_by('name')
+            return PublicStandSerializer(stands_qs, many=True).data
+        return cached_catalog_response(request, f'event:{int(pk)}', build)
 
 
+@method_decorator(db_transaction.non_atomic_requests, name='dispatch')
 class PublicStandViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Retrieve a stand; list not used by frontend but allowed (active stands).
@@ -42,14 +54,16 @@ class PublicStandViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = PublicStandSerializer
     permission_classes = [IsAuthenticatedUserRole]
     queryset = Stand.objects.filter(is_active=True).order_by('name')
+    lookup_value_regex = '[0-9]+'
 
     @action(detail=True, url_path='products', url_name='products')
     def products(self, request, pk=None):
-        stand = self.get_object()
-        products_qs = Product.objects.filter(
-            stand=stand,
-            is_available=True,
-            stock_quantity__gt=0,
-        ).order_by('name')
-        serializer = PublicProductSerializer(products_qs, many=True)
-        return Response(serializer.data)
+        def build():
+            stand = self.get_object()
+            products_qs = Product.objects.filter(
+                stand=stand,
+                is_available=True,
+                stock_quantity__gt=0,
+            ).order_by('name')
+            return PublicProductSerializer(products_qs, many=True).data
+        return cached_catalog_response(request, f'stand:{int(pk)}', build)
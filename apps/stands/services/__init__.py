@@ -0,0 +1,8 @@
+from .price_snapshot import (
+    get_price_snapshot,
+    build_price_snapshot,
+    invalidate_price_snapshot,
+    snapshot_cache_is_shared,
+)
+
+__all__ = ['get_price_snapshot', 'build_price_snapshot', 'invalidate_price_snapshot', 'snapshot_cache_is_shared']
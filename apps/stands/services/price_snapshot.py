@@ -0,0 +1,73 @@
+"""
+Per-stand price snapshot: {product_id: (price, stock_quantity, is_available)} kept in Django's cache.
+Snapshots are versioned per stand; invalidation bumps the version so readers never see an old map.
+Stock in the snapshot is advisory (checkout reserves stock against the database).
+Invalidation is only seen by every worker when the cache backend is shared (database, file, redis);
+with the process-local default (locmem) checkout prices from a freshly built snapshot instead.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+from apps.stands.models import Product
+
+SNAPSHOT_TIMEOUT = getattr(settings, 'PRICE_SNAPSHOT_TIMEOUT', 300)
+
+
+def _version_key(stand_id):
+    return f'stands:price_snapshot:version:{stand_id}'
+
+
+def _snapshot_key(stand_id, version):
+    return f'stands:price_snapshot:{stand_id}:v{version}'
+
+
+def _initial_version():
+    # Time-based so a lost version key never resurrects an older snapshot.
+    return time.time_ns()
+
+
+def get_snapshot_version(stand_id):
+    """Current snapshot version for a stand (initialized on first use)."""
+    key = _version_key(stand_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def build_price_snapshot(stand_id):
+    """Build the snapshot for a stand from the database (one query)."""
+    return {
+        product_id: (price, stock_quantity, is_available)
+        for product_id, price, stock_quantity, is_available in Product.objects.filter(
+            stand_id=stand_id,
+        ).values_list('id', 'price', 'stock_quantity', 'is_available')
+    }
+
+
+def snapshot_cache_is_shared():
+    """False when the default cache lives in this process, so other workers' version bumps are not seen."""
+    return not isinstance(caches['default'], LocMemCache)
+
+
+def get_price_snapshot(stand_id):
+    """Return the stand's price snapshot; served from cache when warm, built and cached otherwise."""
+    key = _snapshot_key(stand_id, get_snapshot_version(stand_id))
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_price_snapshot(stand_id)
+        cache.set(key, snapshot, SNAPSHOT_TIMEOUT)
+    return snapshot
+
+
+def invalidate_price_snapshot(stand_id):
+    """Bump the stand's snapshot version; the next read rebuilds from the database."""
+    key = _version_key(stand_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), timeout=None)
@@ -0,0 +1,35 @@
+"""
+Invalidate per-stand price snapshots when a Product changes.
+Invalidation runs on commit so a concurrent reader cannot cache pre-commit data under the new version.
+"""
+from django.db import transaction as db_transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Product
+from .services.price_snapshot import invalidate_price_snapshot
+
+
+def _invalidate_on_commit(*stand_ids):
+    for stand_id in {s for s in stand_ids if s is not None}:
+        db_transaction.on_commit(lambda stand_id=stand_id: invalidate_price_snapshot(stand_id))
+
+
+@receiver(pre_save, sender=Product)
+def remember_previous_stand(sender, instance, **kwargs):
+    if instance.pk is None or kwargs.get('raw', False):
+        instance._previous_stand_id = None
+        return
+    instance._previous_stand_id = (
+        Product.objects.filter(pk=instance.pk).values_list('stand_id', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Product)
+def invalidate_snapshot_on_product_save(sender, instance, **kwargs):
+    _invalidate_on_commit(instance.stand_id, getattr(instance, '_previous_stand_id', None))
+
+
+@receiver(post_delete, sender=Product)
+def invalidate_snapshot_on_product_delete(sender, instance, **kwargs):
+    _invalidate_on_commit(instance.stand_id)
@@ -0,0 +1,81 @@
+"""
+Benchmark checkout throughput against the number of platform commission sub-wallets.
+Every worker buys from its own stand, so the only shared row is the platform commission wallet.
+Runs in a throwaway test database: python manage.py benchmark_commission_shards --shards 1 2 4 8
+"""
+import threading
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import override_settings
+
+from apps.core.benchmark import benchmark_database, timed
+from apps.events.models import Event
+from apps.orders.services.checkout import create_order_with_payment
+from apps.organizations.models import Organization
+from apps.stands.models import Stand, Product
+from apps.users.models import User, UserRole
+from apps.wallet.models import Wallet, get_platform_wallet
+
+
+class Command(BaseCommand):
+    help = 'Measure checkout throughput for different PLATFORM_COMMISSION_SHARDS values.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4, 8])
+        parser.add_argument('--workers', type=int, default=16)
+        parser.add_argument('--orders-per-worker', type=int, default=50)
+        parser.add_argument('--keepdb', action='store_true')
+
+    def handle(self, *args, **options):
+        with benchmark_database(keepdb=options['keepdb']):
+            fixtures = self._seed(options['workers'], options['orders_per_worker'])
+            for shards in options['shards']:
+                results = {}
+                with override_settings(PLATFORM_COMMISSION_SHARDS=shards):
+                    for shard in range(shards):
+                        get_platform_wallet(shard)
+                    with timed(results, 'elapsed'):
+                        self._run(fixtures, options['orders_per_worker'])
+                orders = options['workers'] * options['orders_per_worker']
+                self.stdout.write(
+                    f'shards={shards:<3} orders={orders:<6} '
+                    f'elapsed={results["elapsed"]:.2f}s throughput={orders / results["elapsed"]:.1f} orders/s'
+                )
+
+    def _seed(self, workers, orders_per_worker):
+        org = Organization.objects.create(name='Bench Org', commission_rate=Decimal('10.00'))
+        event = Event.objects.create(name='Bench Event', organization=org)
+        fixtures = []
+        for i in range(workers):
+            stand = Stand.objects.create(name=f'Bench Stand {i}', event=event)
+            User.objects.create_user(username=f'bench_admin_{i}', role=UserRole.STAND_ADMIN, stand=stand)
+            product = Product.objects.create(
+                stand=stand,
+                name=f'Bench Product {i}',
+                price=Decimal('10.00'),
+                stock_quantity=10 ** 6,
+            )
+            buyer = User.objects.create_user(username=f'bench_buyer_{i}', role=UserRole.USER)
+            Wallet.objects.get(user=buyer).credit(Decimal('10.00') * orders_per_worker * 100, description='Bench seed')
+            fixtures.append((buyer, stand, product))
+        return fixtures
+
+    def _run(self, fixtures, orders_per_worker):
+        def worker(buyer, stand, product):
+            try:
+                for _ in range(orders_per_worker):
+                    create_order_with_payment(
+                        user=buyer,
+                        stand=stand,
+                        items=[{'product': product.pk, 'quantity': 1}],
+                    )
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=fixture) for fixture in fixtures]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
@@ -0,0 +1,42 @@
+# Add LedgerTotals (maintained running totals) and backfill it from the existing ledger
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_ledger_totals(apps, schema_editor):
+    Wallet = apps.get_model('wallet', 'Wallet')
+    Transaction = apps.get_model('wallet', 'Transaction')
+    LedgerTotals = apps.get_model('wallet', 'LedgerTotals')
+    zero = Decimal('0.00')
+    LedgerTotals.objects.create(
+        credits_total=Transaction.objects.filter(transaction_type='CREDIT').aggregate(s=Sum('amount'))['s'] or zero,
+        debits_total=Transaction.objects.filter(transaction_type='DEBIT').aggregate(s=Sum('amount'))['s'] or zero,
+        balance_total=Wallet.objects.aggregate(s=Sum('balance'))['s'] or zero,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0003_transaction_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LedgerTotals',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('credits_total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=20)),
+                ('debits_total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=20)),
+                ('balance_total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=20)),
+            ],
+            options={
+                'verbose_name': 'Ledger Totals',
+                'verbose_name_plural': 'Ledger Totals',
+                'db_table': 'wallet_ledgertotals',
+            },
+        ),
+        migrations.RunPython(backfill_ledger_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Add composite (wallet, created_at DESC, id DESC) index for keyset pagination of wallet transactions
+# without blocking writes (CREATE INDEX CONCURRENTLY)
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('wallet', '0004_ledger_totals'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='transaction',
+            index=models.Index(fields=['wallet', '-created_at', '-id'], name='wallet_tx_wallet_created_idx'),
+        ),
+    ]
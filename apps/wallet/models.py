@@ -2,14 +2,21 @@
 Wallet and Transaction models.
 Transactions are immutable: only creation allowed; use compensating transactions for reversals.
 Wallet balance operations (debit/credit) are concurrency-safe via select_for_update().
+Callers that already hold the row lock (see lock_wallets) use debit_locked/credit_locked instead.
+Every balance change also updates LedgerTotals in the same DB transaction (record_ledger_delta).
 """
 from decimal import Decimal
-from django.db import models, transaction as db_transaction
+from django.conf import settings
+from django.db import models, connection, transaction as db_transaction
+from django.db.transaction import TransactionManagementError
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from apps.core.models import TimeStampedModel
 
 # System user for platform commission wallet (get_or_create in get_platform_wallet).
 PLATFORM_USERNAME = '__komodo_platform__'
+# Commission sub-wallets (PLATFORM_COMMISSION_SHARDS > 1) use '__komodo_platform_<n>__'.
+PLATFORM_USERNAME_PREFIX = '__komodo_platform'
 
 
 class TransactionType(models.TextChoices):
@@ -58,6 +65,7 @@ class Wallet(TimeStampedModel):
                 order=order,
                 description=description or 'Debit',
             )
+            record_ledger_delta(debit=amount)
 
     def credit(self, amount, order=None, description=''):
         """
@@ -77,6 +85,58 @@ class Wallet(TimeStampedModel):
                 order=order,
                 description=description or 'Credit',
             )
+            record_ledger_delta(credit=amount)
+
+    def _apply_locked(self, amount, transaction_type, order=None, description=''):
+        """
+        Apply a balance change to a wallet row the caller has already locked, in two statements:
+        UPDATE ... SET balance = balance +/- amount WHERE id = ... [AND balance >= amount] RETURNING balance,
+        then INSERT of the Transaction. self.balance is refreshed from RETURNING.
+        """
+        if not db_transaction.get_connection().in_atomic_block:
+            raise TransactionManagementError('Locked wallet operations must run inside transaction.atomic.')
+        table = connection.ops.quote_name(Wallet._meta.db_table)
+        if transaction_type == TransactionType.DEBIT:
+            sql = (
+                f'UPDATE {table} SET balance = balance - %s, updated_at = %s '
+                f'WHERE id = %s AND balance >= %s RETURNING balance'
+            )
+            params = [amount, timezone.now(), self.pk, amount]
+        else:
+            sql = f'UPDATE {table} SET balance = balance + %s, updated_at = %s WHERE id = %s RETURNING balance'
+            params = [amount, timezone.now(), self.pk]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+        if row is None:
+            raise ValidationError('Insufficient balance')
+        self.balance = row[0]
+        Transaction.objects.create(
+            wallet=self,
+            amount=amount,
+            transaction_type=transaction_type,
+            order=order,
+            description=description or transaction_type.label,
+        )
+        if transaction_type == TransactionType.DEBIT:
+            record_ledger_delta(debit=amount)
+        else:
+            record_ledger_delta(credit=amount)
+
+    def debit_locked(self, amount, order=None, description=''):
+        """
+        Debit for callers that already hold this wallet's row lock (e.g. via lock_wallets).
+        Skips the re-fetch; balance is checked in the UPDATE itself. amount must be positive.
+        """
+        if amount <= 0:
+            raise ValidationError('Debit amount must be positive.')
+        self._apply_locked(amount, TransactionType.DEBIT, order=order, description=description)
+
+    def credit_locked(self, amount, order=None, description=''):
+        """Credit for callers that already hold this wallet's row lock. amount must be positive."""
+        if amount <= 0:
+            raise ValidationError('Credit amount must be positive.')
+        self._apply_locked(amount, TransactionType.CREDIT, order=order, description=description)
 
     def add_balance(self, amount, transaction_type, order=None, description=''):
         """Atomically update balance and create a transaction. amount must be positive. Uses debit/credit for safety."""
@@ -117,6 +177,8 @@ class Transaction(TimeStampedModel):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['wallet', 'order'], name='wallet_tx_wallet_order'),
+            # Keyset pagination of a wallet's history (apps.core.pagination.KeysetPagination).
+            models.Index(fields=['wallet', '-created_at', '-id'], name='wallet_tx_wallet_created_idx'),
         ]
 
     def save(self, *args, **kwargs):
@@ -128,13 +190,94 @@ class Transaction(TimeStampedModel):
         raise ValidationError('Transaction records are immutable; deletions are not allowed. Use compensating transactions for reversals.')
 
 
-def get_platform_wallet():
-    """Return the platform wallet (commission bucket). Creates platform user and wallet if needed."""
+class LedgerTotals(models.Model):
+    """
+    Running ledger totals, maintained in the same DB transaction as every Wallet balance change.
+    Spread over several rows so concurrent writers never queue behind one hot row: a writer updates
+    the first row it can lock without waiting and inserts a new row when all are busy.
+    The totals are the SUM over all rows (see get_ledger_totals).
+    """
+    credits_total = models.DecimalField(max_digits=20, decimal_places=2, default=Decimal('0.00'))
+    debits_total = models.DecimalField(max_digits=20, decimal_places=2, default=Decimal('0.00'))
+    balance_total = models.DecimalField(max_digits=20, decimal_places=2, default=Decimal('0.00'))
+
+    class Meta:
+        db_table = 'wallet_ledgertotals'
+        verbose_name = 'Ledger Totals'
+        verbose_name_plural = 'Ledger Totals'
+
+
+def record_ledger_delta(credit=Decimal('0.00'), debit=Decimal('0.00'), balance=None):
+    """
+    Add credit/debit amounts to LedgerTotals; balance defaults to credit - debit.
+    Must run in the transaction that changes the balances. Never waits on another writer's
+    totals row (FOR UPDATE SKIP LOCKED), so it adds no lock ordering between wallets.
+    """
+    if balance is None:
+        balance = credit - debit
+    table = connection.ops.quote_name(LedgerTotals._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'WITH pick AS (SELECT id FROM {table} ORDER BY id LIMIT 1 FOR UPDATE SKIP LOCKED) '
+            f'UPDATE {table} AS t SET credits_total = t.credits_total + %s, '
+            f'debits_total = t.debits_total + %s, balance_total = t.balance_total + %s '
+            f'FROM pick WHERE t.id = pick.id',
+            [credit, debit, balance],
+        )
+        if cursor.rowcount == 0:
+            cursor.execute(
+                f'INSERT INTO {table} (credits_total, debits_total, balance_total) VALUES (%s, %s, %s)',
+                [credit, debit, balance],
+            )
+
+
+def get_ledger_totals():
+    """Maintained totals: {'credits', 'debits', 'balance'} summed over the LedgerTotals rows."""
+    totals = LedgerTotals.objects.aggregate(
+        credits=models.Sum('credits_total'),
+        debits=models.Sum('debits_total'),
+        balance=models.Sum('balance_total'),
+    )
+    return {key: value or Decimal('0.00') for key, value in totals.items()}
+
+
+def reset_ledger_totals():
+    """Drop the maintained totals (all balances and transactions were wiped)."""
+    LedgerTotals.objects.all().delete()
+
+
+def get_platform_shard_count():
+    """Number of platform commission sub-wallets (settings.PLATFORM_COMMISSION_SHARDS, 1 = unsharded)."""
+    return max(1, int(getattr(settings, 'PLATFORM_COMMISSION_SHARDS', 1) or 1))
+
+
+def platform_shard_username(shard):
+    """System username for a platform shard; shard 0 is the original platform wallet."""
+    return PLATFORM_USERNAME if shard == 0 else f'{PLATFORM_USERNAME_PREFIX}_{shard}__'
+
+
+# Process-level memo of platform wallet ids: {shard: wallet_id} plus ALL_PLATFORM_SHARDS -> [ids].
+# Cleared by clear_platform_wallet_cache() (post_migrate/flush, setting changes, platform wallet deletion).
+_platform_wallet_ids = {}
+ALL_PLATFORM_SHARDS = 'all'
+
+
+def clear_platform_wallet_cache():
+    """Forget memoized platform wallet ids; the next lookup resolves them from the database again."""
+    _platform_wallet_ids.clear()
+
+
+def get_platform_wallet(shard=0):
+    """
+    Return a platform wallet (commission bucket). Creates platform user and wallet if needed.
+    shard selects a commission sub-wallet; shard 0 is the main platform wallet.
+    Always hits the database; callers that only need the id should use get_platform_wallet_id().
+    """
     from apps.users.models import User
     from apps.users.models import UserRole
 
     user, created = User.objects.get_or_create(
-        username=PLATFORM_USERNAME,
+        username=platform_shard_username(shard),
         defaults={
             'role': UserRole.SUPERADMIN,
             'is_active': True,
@@ -148,4 +291,77 @@ def get_platform_wallet():
         user=user,
         defaults={'balance': Decimal('0.00')},
     )
+    if _platform_wallet_ids.get(shard) != wallet.pk:
+        _platform_wallet_ids[shard] = wallet.pk
+        _platform_wallet_ids.pop(ALL_PLATFORM_SHARDS, None)
     return wallet
+
+
+def get_platform_wallet_id(shard=0):
+    """Memoized id of a platform wallet; resolved (and created if needed) once per process."""
+    wallet_id = _platform_wallet_ids.get(shard)
+    if wallet_id is None:
+        wallet_id = get_platform_wallet(shard).pk
+    return wallet_id
+
+
+def get_commission_wallet(order_id):
+    """Platform wallet that receives the commission of an order: shard order_id % PLATFORM_COMMISSION_SHARDS."""
+    return get_platform_wallet(order_id % get_platform_shard_count())
+
+
+def get_commission_wallet_id(order_id):
+    """Memoized id of the platform sub-wallet that receives an order's commission."""
+    return get_platform_wallet_id(order_id % get_platform_shard_count())
+
+
+def get_platform_wallet_ids():
+    """
+    Ids of every platform wallet (main wallet plus all commission sub-wallets), including shards
+    left over from a higher PLATFORM_COMMISSION_SHARDS setting. Memoized; use for commission filters.
+    """
+    wallet_ids = _platform_wallet_ids.get(ALL_PLATFORM_SHARDS)
+    if wallet_ids is None:
+        configured = {get_platform_wallet_id(shard) for shard in range(get_platform_shard_count())}
+        leftover = Wallet.objects.filter(
+            user__username__startswith=PLATFORM_USERNAME_PREFIX,
+        ).values_list('pk', flat=True)
+        wallet_ids = sorted(configured.union(leftover))
+        _platform_wallet_ids[ALL_PLATFORM_SHARDS] = wallet_ids
+    return wallet_ids
+
+
+def get_platform_balance():
+    """
+    Rollup of the platform commission sub-wallets as one logical platform balance.
+    Returns: {'balance': Decimal, 'shards': [{'wallet_id', 'username', 'balance'}, ...]}.
+    """
+    shards = list(
+        Wallet.objects.filter(pk__in=get_platform_wallet_ids()).order_by('pk').values(
+            'pk', 'user__username', 'balance',
+        )
+    )
+    return {
+        'balance': sum((row['balance'] for row in shards), Decimal('0.00')),
+        'shards': [
+            {'wallet_id': row['pk'], 'username': row['user__username'], 'balance': row['balance']}
+            for row in shards
+        ],
+    }
+
+
+def lock_wallets(wallet_ids):
+    """
+    Lock every wallet a financial operation touches in one query, always in pk order:
+    SELECT ... FOR UPDATE WHERE id IN (...) ORDER BY id. Using this for every multi-wallet
+    operation gives all of them the same lock order, so they cannot deadlock each other.
+    Must be called inside transaction.atomic. None ids are ignored.
+    Returns: dict {wallet_id: Wallet} with the locked (freshly read) rows.
+    """
+    ids = sorted({wallet_id for wallet_id in wallet_ids if wallet_id is not None})
+    if not ids:
+        return {}
+    return {
+        wallet.pk: wallet
+        for wallet in Wallet.objects.select_for_update().filter(pk__in=ids).order_by('pk')
+    }
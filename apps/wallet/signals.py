@@ -1,13 +1,57 @@
 """
 Create Wallet when User is created.
+Clear the memoized platform wallet ids when they may have gone stale.
+Take a deleted wallet's balance and transactions out of the maintained LedgerTotals.
 """
-from django.db.models.signals import post_save
+from decimal import Decimal
+
+from django.db.models import Q, Sum
+from django.db.models.signals import post_save, post_delete, post_migrate, pre_delete
 from django.dispatch import receiver
 from django.conf import settings
-from .models import Wallet
+from django.test.signals import setting_changed
+from .models import (
+    PLATFORM_USERNAME_PREFIX,
+    TransactionType,
+    Wallet,
+    clear_platform_wallet_cache,
+    record_ledger_delta,
+)
 
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_wallet_for_user(sender, instance, created, **kwargs):
     if created and not kwargs.get('raw', False):
         Wallet.objects.get_or_create(user=instance)
+
+
+@receiver(post_migrate)
+def clear_platform_wallet_cache_on_migrate(sender, **kwargs):
+    # Also fired by flush (e.g. between TransactionTestCase tests).
+    clear_platform_wallet_cache()
+
+
+@receiver(setting_changed)
+def clear_platform_wallet_cache_on_setting_changed(sender, setting, **kwargs):
+    if setting == 'PLATFORM_COMMISSION_SHARDS':
+        clear_platform_wallet_cache()
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def clear_platform_wallet_cache_on_platform_user_delete(sender, instance, **kwargs):
+    if instance.username.startswith(PLATFORM_USERNAME_PREFIX):
+        clear_platform_wallet_cache()
+
+
+@receiver(pre_delete, sender=Wallet)
+def remove_deleted_wallet_from_ledger_totals(sender, instance, **kwargs):
+    # pre_delete runs inside the delete's transaction, while the cascaded transactions still exist.
+    balance = Wallet.objects.filter(pk=instance.pk).values_list('balance', flat=True).first() or Decimal('0.00')
+    sums = instance.transactions.aggregate(
+        credits=Sum('amount', filter=Q(transaction_type=TransactionType.CREDIT)),
+        debits=Sum('amount', filter=Q(transaction_type=TransactionType.DEBIT)),
+    )
+    credits = sums['credits'] or Decimal('0.00')
+    debits = sums['debits'] or Decimal('0.00')
+    if credits or debits or balance:
+        record_ledger_delta(credit=-credits, debit=-debits, balance=-balance)
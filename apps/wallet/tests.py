@@ -0,0 +1,62 @@
+"""
+Wallet tests: keyset-paginated transaction history.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.users.models import User, UserRole, UserStatus
+from apps.wallet.models import Transaction, TransactionType, Wallet
+
+
+class WalletTransactionsPaginationTests(TestCase):
+    """Test /api/wallet/transactions/ pages through the whole history by (created_at, id)."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='tx_pager', role=UserRole.USER, status=UserStatus.ACTIVE)
+        self.wallet = Wallet.objects.get(user=self.user)
+        other = Wallet.objects.get(user=User.objects.create_user(username='tx_other', role=UserRole.USER))
+        Transaction.objects.bulk_create(
+            [Transaction(wallet=self.wallet, amount=Decimal(i + 1), transaction_type=TransactionType.CREDIT)
+             for i in range(7)]
+            + [Transaction(wallet=other, amount=Decimal('1.00'), transaction_type=TransactionType.CREDIT)]
+        )
+        # Three rows share a timestamp: ties are broken by id.
+        now = timezone.now()
+        for i, tx in enumerate(Transaction.objects.filter(wallet=self.wallet).order_by('id')):
+            Transaction.objects.filter(pk=tx.pk).update(created_at=now - timedelta(minutes=min(i, 3)))
+        self.expected = list(
+            Transaction.objects.filter(wallet=self.wallet).order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_pages_cover_history_in_order(self):
+        seen = []
+        url = '/api/wallet/transactions/?page_size=3'
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+            pages += 1
+        self.assertEqual(seen, self.expected)
+        self.assertEqual(pages, 3)
+
+    def test_no_count_query_and_invalid_cursor(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/wallet/transactions/')
+        self.assertEqual([row['id'] for row in response.data['results']], self.expected)
+        self.assertIsNone(response.data['next'])
+        self.assertFalse(any('COUNT(' in q['sql'].upper() for q in ctx.captured_queries))
+
+        for params in ('cursor=not-a-cursor', 'page_size=0'):
+            response = self.client.get(f'/api/wallet/transactions/?{params}')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('detail', response.data)
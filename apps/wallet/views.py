@@ -9,6 +9,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 
+from apps.core.pagination import KeysetPagination
 from apps.core.permissions import IsActiveUser, IsEventAdminOrSuperAdmin
 from apps.users.models import User
 from .models import Wallet, Transaction, TransactionType
@@ -34,11 +35,14 @@ class WalletViewSet(viewsets.ReadOnlyModelViewSet):
 
     @action(detail=False, methods=['get'], url_path='transactions')
     def transactions(self, request):
-        """List transactions for current user's wallet."""
+        """
+        List transactions for current user's wallet, newest first, keyset-paginated:
+        {'next': url or null, 'results': [...]}; follow `next` (opaque ?cursor=) for older rows.
+        """
         wallet = get_object_or_404(Wallet, user=request.user)
-        qs = Transaction.objects.filter(wallet=wallet).order_by('-created_at')[:100]
-        serializer = TransactionSerializer(qs, many=True)
-        return Response(serializer.data)
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(Transaction.objects.filter(wallet=wallet), request, view=self)
+        return paginator.get_paginated_response(TransactionSerializer(page, many=True).data)
 
     @action(
         detail=False,
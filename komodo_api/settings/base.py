@@ -86,6 +86,32 @@ DATABASES = {
     }
 }
 
+# Cache - locmem by default (single process only). Multi-worker deployments must use a shared backend
+# (database, file, redis) so version bumps (e.g. price snapshot invalidation) are seen by every process;
+# the Docker image sets DatabaseCache and runs createcachetable. Checkout never prices from a locmem snapshot.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', ''),
+    }
+}
+
+# Seconds a per-stand price snapshot stays cached (also bounds staleness of bypassed updates)
+PRICE_SNAPSHOT_TIMEOUT = int(os.environ.get('PRICE_SNAPSHOT_TIMEOUT', '300'))
+
+# Dashboard response cache: seconds an entry is fresh, then seconds it may still be served stale
+# while one request recomputes it. Sales in a scope invalidate its entries immediately.
+DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', '30'))
+DASHBOARD_CACHE_STALE_TTL = int(os.environ.get('DASHBOARD_CACHE_STALE_TTL', '300'))
+
+# Public catalog cache (events, stands, products): seconds an entry lives. Admin edits invalidate it
+# immediately; this bounds how long stock sold through checkout may show the previous count.
+PUBLIC_CATALOG_CACHE_TTL = int(os.environ.get('PUBLIC_CATALOG_CACHE_TTL', '30'))
+
+# Platform commission sub-wallets. 1 = single platform wallet; N > 1 credits each order's commission
+# to sub-wallet (order_id % N) to spread row-lock contention on busy nights.
+PLATFORM_COMMISSION_SHARDS = int(os.environ.get('PLATFORM_COMMISSION_SHARDS', '1'))
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
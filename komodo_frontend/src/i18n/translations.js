@@ -265,6 +265,7 @@ export const translations = {
       amountPlaceholder: 'Cantidad',
       descriptionOptional: 'Descripción (opcional)',
       addFundsButton: 'Añadir fondos',
+      loadMore: 'Cargar más',
     },
     orders: {
       title: 'Orders',
@@ -781,6 +782,7 @@ export const translations = {
       amountPlaceholder: 'Amount',
       descriptionOptional: 'Description (optional)',
       addFundsButton: 'Add funds',
+      loadMore: 'Load more',
     },
     orders: {
       title: 'Orders',
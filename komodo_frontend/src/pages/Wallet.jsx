@@ -18,6 +18,8 @@ export default function Wallet() {
 
   const [wallet, setWallet] = useState(null)
   const [transactions, setTransactions] = useState([])
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
   const [activeTab, setActiveTab] = useState(TAB_TRANSACTIONS)
@@ -40,7 +42,8 @@ export default function Wallet() {
         ])
         if (!cancelled) {
           setWallet(walletData)
-          setTransactions(txData)
+          setTransactions(txData.results)
+          setNextCursor(txData.nextCursor)
         }
       } catch (e) {
         if (!cancelled) setError(e.response?.data?.detail || e.message || t('wallet.failedLoad'))
@@ -76,7 +79,8 @@ export default function Wallet() {
       setAddFundsDesc('')
       const [walletData, txData] = await Promise.all([getMyWallet(), getMyTransactions()])
       setWallet(walletData)
-      setTransactions(txData)
+      setTransactions(txData.results)
+      setNextCursor(txData.nextCursor)
       showSuccess(t('wallet.addFundsSuccess'))
     } catch (err) {
       const msg = err.response?.data?.detail || err.message || t('wallet.failedAdd')
@@ -87,6 +91,20 @@ export default function Wallet() {
     }
   }
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) return
+    setLoadingMore(true)
+    try {
+      const txData = await getMyTransactions(nextCursor)
+      setTransactions((prev) => [...prev, ...txData.results])
+      setNextCursor(txData.nextCursor)
+    } catch (err) {
+      showError(err.response?.data?.detail || err.message || t('wallet.failedLoad'))
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const formatDate = (dateStr) => {
     if (!dateStr) return '—'
     return new Date(dateStr).toLocaleString(undefined, {
@@ -241,6 +259,11 @@ export default function Wallet() {
                 ))}
               </ul>
             )}
+            {nextCursor && (
+              <Button type="button" variant="secondary" loading={loadingMore} onClick={handleLoadMore}>
+                {t('wallet.loadMore')}
+              </Button>
+            )}
           </section>
         )}
       </div>
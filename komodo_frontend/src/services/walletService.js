@@ -12,12 +12,14 @@ export async function getMyWallet() {
 }
 
 /**
- * GET /api/wallet/transactions/ — current user's transactions
- * @returns {Promise<Array>}
+ * GET /api/wallet/transactions/ — current user's transactions, newest first (keyset-paginated)
+ * @param {string|null} [cursor] — opaque cursor from a previous page's `nextCursor`
+ * @returns {Promise<{ results: Array, nextCursor: string|null }>}
  */
-export async function getMyTransactions() {
-  const { data } = await api.get(`${BASE}/transactions/`)
-  return Array.isArray(data) ? data : []
+export async function getMyTransactions(cursor = null) {
+  const { data } = await api.get(`${BASE}/transactions/`, { params: cursor ? { cursor } : undefined })
+  const next = data?.next ? new URL(data.next).searchParams.get('cursor') : null
+  return { results: Array.isArray(data?.results) ? data.results : [], nextCursor: next }
 }
 
 /**